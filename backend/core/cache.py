@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Mapping, Protocol
+
+import orjson
+from fastapi import Request, Response
+
+from backend.core import metrics
+from backend.core.config import Settings, settings
+from backend.core.responses import json_body_response, render_json
+from backend.db.async_session import AsyncDB
+from backend.models.data_versions import load_data_versions
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    name: str
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class MemoryCacheBackend:
+    """Process-local cache bounded by entry count (LRU) and per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by several API workers. Redis enforces the TTL; size is
+    bounded by the server's `maxmemory` / eviction policy.
+
+    Redis errors are logged and treated as misses, so an unavailable cache
+    degrades to querying the database.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "aiscope:cache:") -> None:
+        # Imported lazily: redis is only needed when api_cache_backend is "redis".
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self._prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._client.get(self._prefix + key)
+        except self._errors as exc:
+            logger.warning("Response cache read failed: %s", exc)
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        try:
+            self._client.set(self._prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+        except self._errors as exc:
+            logger.warning("Response cache write failed: %s", exc)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=f"{self._prefix}*", count=1000))
+            if keys:
+                self._client.delete(*keys)
+        except self._errors as exc:
+            logger.warning("Response cache clear failed: %s", exc)
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+
+def make_cache_backend(config: Settings = settings) -> CacheBackend:
+    if config.api_cache_backend == "redis":
+        return RedisCacheBackend(config.redis_url)
+    return MemoryCacheBackend(config.api_cache_max_entries)
+
+
+class CacheStats:
+    """Thread-safe hit / miss counters per cached route."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = defaultdict(int)
+        self._misses: dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, hit: bool) -> None:
+        metrics.cache_requests.inc(route=route, result="hit" if hit else "miss")
+        with self._lock:
+            if hit:
+                self._hits[route] += 1
+            else:
+                self._misses[route] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        def summary(hits: int, misses: int) -> dict[str, float]:
+            total = hits + misses
+            return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+        with self._lock:
+            routes = sorted(set(self._hits) | set(self._misses))
+            return {
+                **summary(sum(self._hits.values()), sum(self._misses.values())),
+                "routes": {r: summary(self._hits[r], self._misses[r]) for r in routes},
+            }
+
+
+def _encode_entry(body: bytes, headers: Mapping[str, str]) -> bytes:
+    # orjson output has no raw newlines, so the header object ends at the first one.
+    return orjson.dumps(dict(headers)) + b"\n" + body
+
+
+def _decode_entry(value: bytes) -> tuple[bytes, dict[str, str]]:
+    headers, body = value.split(b"\n", 1)
+    return body, orjson.loads(headers)
+
+
+class ResponseCache:
+    """
+    Rendered JSON responses for read-mostly routes.
+
+    Keys combine the route, path and query parameters with the current data
+    version of each scope the route depends on, so a committed write makes
+    dependent entries unreachable (they age out through TTL / LRU). Data
+    versions are re-read from the database at most every
+    `version_check_seconds`; `invalidate()` forces the next request to re-read
+    them, for writes made by this process.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        *,
+        enabled: bool,
+        ttl_seconds: float,
+        version_check_seconds: float,
+    ) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.stats = CacheStats()
+        self._versions: dict[str, int] = {}
+        self._versions_checked_at: float | None = None
+
+    def invalidate(self) -> None:
+        self._versions_checked_at = None
+
+    def _refresh_versions(self, session) -> dict[str, int]:
+        # No lock: this may run on the event loop thread (`run_sync`), and a
+        # concurrent refresh only repeats the same small query.
+        versions = load_data_versions(session)
+        self._versions = versions
+        self._versions_checked_at = time.monotonic()
+        return versions
+
+    async def data_versions(self, db: AsyncDB) -> dict[str, int]:
+        checked_at = self._versions_checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.version_check_seconds:
+            return self._versions
+        return await db.run(self._refresh_versions)
+
+    def _key(
+        self, route: str, request: Request, scopes: tuple[str, ...], versions: Mapping[str, int]
+    ) -> str:
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        stamp = ",".join(f"{scope}={versions.get(scope, 0)}" for scope in scopes)
+        digest = hashlib.blake2b(
+            f"{request.url.path}?{params}|{stamp}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return f"{route}:{digest}"
+
+    async def respond(
+        self,
+        request: Request,
+        db: AsyncDB,
+        *,
+        route: str,
+        scopes: tuple[str, ...],
+        build: Callable[[], Awaitable[tuple[Any, Mapping[str, str] | None]]],
+    ) -> Response:
+        """
+        Answer from the cache, or `await build()` for `(content, headers)`,
+        render it and store it. Exceptions from `build` (404s, bad cursors)
+        propagate and are not cached. Responses carry an ETag either way.
+        """
+        if not self.enabled:
+            content, headers = await build()
+            return json_body_response(request, render_json(content), headers)
+
+        key = self._key(route, request, scopes, await self.data_versions(db))
+        cached = self.backend.get(key)
+        self.stats.record(route, hit=cached is not None)
+        if cached is not None:
+            body, headers = _decode_entry(cached)
+            return json_body_response(request, body, headers)
+
+        content, headers = await build()
+        body = render_json(content)
+        self.backend.set(key, _encode_entry(body, headers or {}), self.ttl_seconds)
+        return json_body_response(request, body, headers)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl_seconds,
+            **self.backend.stats(),
+            **self.stats.snapshot(),
+            "data_versions": dict(self._versions),
+        }
+
+
+response_cache = ResponseCache(
+    make_cache_backend(settings),
+    enabled=settings.api_cache_enabled,
+    ttl_seconds=settings.api_cache_ttl_seconds,
+    version_check_seconds=settings.api_cache_version_check_seconds,
+)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,13 +12,106 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./aiscope.db"
+    # SQLite PRAGMAs, applied to every new connection. The defaults are SQLite's
+    # own: backend/scripts/bench_db_concurrency.py showed no gain from WAL with
+    # NORMAL sync and a larger cache/mmap for readers against a writer here, so
+    # they stay opt-in (e.g. AISCOPE_SQLITE_JOURNAL_MODE=wal).
+    sqlite_journal_mode: str = "delete"
+    sqlite_synchronous: str = "full"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 2000
+    sqlite_mmap_size_bytes: int = 0
+    # Connection pool (server databases such as Postgres).
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Serve read endpoints through an async engine (aiosqlite / asyncpg) instead
+    # of the threadpool. The async URL is derived from database_url unless set.
+    api_async_db: bool = False
+    async_database_url: str | None = None
 
     # AWS / Bedrock
     aws_region: str | None = None
     bedrock_model_id: str | None = None
+    # Upper bound on Bedrock request rate across all extraction workers.
+    bedrock_requests_per_second: float = 2.0
+    bedrock_burst: int = 4
+
+    # Extraction
+    extraction_workers: int = 4
+    extraction_max_attempts: int = 3
+    # Documents claimed longer ago than this are assumed abandoned by a crashed run.
+    extraction_claim_lease_minutes: int = 30
+    extraction_cache_enabled: bool = True
+    extraction_cache_max_entries: int = 50_000
+    extraction_cache_max_age_days: int = 90
+
+    # Daily briefing: the highest-ranked events (at most briefing_max_events) are
+    # summarized once each into stored one-sentence fragments (prompts of
+    # ~briefing_chunk_tokens, run concurrently), and a briefing is composed from
+    # the window's fragments in one call of at most briefing_compose_tokens; the
+    # call is skipped, and the latest briefing reused, if the fragments are unchanged.
+    briefing_max_events: int = 300
+    briefing_chunk_tokens: int = 3000
+    briefing_fragment_max_tokens: int = 60
+    briefing_compose_tokens: int = 6000
+    briefing_max_tokens: int = 1024
+    # Stored fragments older than this are pruned; keep it longer than any briefing window.
+    briefing_fragment_retention_days: int = 7
+    briefing_workers: int = 4
+
+    # Pipeline scheduler (backend/scripts/run_scheduler.py). Each stage also runs
+    # as soon as upstream stages produce output; these are the fallback periods.
+    scheduler_feeds_interval_seconds: float = 900.0
+    scheduler_extraction_interval_seconds: float = 300.0
+    scheduler_extraction_batch: int = 20
+    scheduler_deduplication_interval_seconds: float = 3600.0
+    scheduler_novelty_interval_seconds: float = 900.0
+    scheduler_novelty_batch: int = 500
+    scheduler_briefing_interval_seconds: float = 3600.0
+    # Upstream output triggers a new briefing at most this often.
+    scheduler_briefing_min_interval_seconds: float = 900.0
+    # Failed stages are retried after base * 2^(failures - 1) seconds (capped), with jitter.
+    scheduler_backoff_base_seconds: float = 30.0
+    scheduler_backoff_max_seconds: float = 1800.0
+    # GET /status on this port reports per-stage durations and backlogs; 0 disables it.
+    scheduler_status_host: str = "127.0.0.1"
+    scheduler_status_port: int = 9108
+
+    # Observability. Metrics are kept in process and served in the Prometheus
+    # format at /metrics (API) and on the scheduler status port; when disabled,
+    # recording is a flag check. Trace spans are logged as JSON on `backend.trace`.
+    metrics_enabled: bool = True
+    tracing_enabled: bool = False
+    # Per-request SQL profiling: a Server-Timing header with the statement count
+    # and time, warnings for statements repeated sql_profiler_repeat_threshold
+    # times in one request (N+1 patterns), and slow statements logged with EXPLAIN.
+    sql_profiler_enabled: bool = False
+    sql_profiler_repeat_threshold: int = 5
+    sql_profiler_slow_query_ms: float = 100.0
+    sql_profiler_explain: bool = True
+
+    # API
+    # How often the in-process entity search index checks the entities table for changes.
+    entity_index_refresh_seconds: float = 30.0
+    # Response cache for /briefings/latest, /companies and /events. Entries are
+    # keyed by the data versions writers bump, so a pipeline run invalidates
+    # them; the TTL bounds staleness for writes made outside those paths.
+    api_cache_enabled: bool = True
+    api_cache_backend: Literal["memory", "redis"] = "memory"
+    api_cache_ttl_seconds: float = 300.0
+    api_cache_max_entries: int = 1024
+    # How often each API process re-reads the data versions.
+    api_cache_version_check_seconds: float = 2.0
+    redis_url: str = "redis://localhost:6379/0"
 
     # Ingestion
     user_agent: str = "AIscopeBot/0.1"
+    ingestion_max_workers: int = 8
+    ingestion_per_host_limit: int = 2
+    ingestion_feed_timeout_seconds: float = 15.0
 
 
 settings = Settings()
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+from backend.core.config import settings
+
+
+trace_logger = logging.getLogger("backend.trace")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Latency buckets in seconds, from a cached API read to a slow pipeline stage.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not settings.metrics_enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        if not settings.metrics_enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative) + overflow, sum, count]
+        self._values: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not settings.metrics_enabled:
+            return
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, [list(e[0]), e[1], e[2]]) for key, e in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of this process, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+# Pipeline
+stage_seconds = registry.histogram(
+    "aiscope_pipeline_stage_duration_seconds", "Pipeline stage run time.", ["stage"]
+)
+stage_runs = registry.counter(
+    "aiscope_pipeline_stage_runs_total", "Pipeline stage runs by outcome.", ["stage", "outcome"]
+)
+stage_items = registry.counter(
+    "aiscope_pipeline_stage_items_total",
+    "Items produced by pipeline stages (documents, events, labels, briefings).",
+    ["stage"],
+)
+pipeline_backlog = registry.gauge(
+    "aiscope_pipeline_backlog", "Work waiting per pipeline stage, as last measured.", ["stage"]
+)
+
+# Ingestion
+feed_conditional_gets = registry.counter(
+    "aiscope_feed_conditional_gets_total",
+    "Feed GETs by result: not_modified (304 hit) or fetched (full body, miss).",
+    ["result"],
+)
+
+# Bedrock
+bedrock_call_seconds = registry.histogram(
+    "aiscope_bedrock_call_duration_seconds", "Bedrock InvokeModel latency per attempt.", ["outcome"]
+)
+bedrock_tokens = registry.counter(
+    "aiscope_bedrock_tokens_total", "Bedrock tokens reported by the model.", ["direction"]
+)
+bedrock_retries = registry.counter("aiscope_bedrock_retries_total", "Bedrock calls retried.")
+
+# Database
+db_queries = registry.counter("aiscope_db_queries_total", "SQL statements executed.")
+db_query_seconds = registry.histogram(
+    "aiscope_db_query_duration_seconds", "SQL statement execution time."
+)
+
+# HTTP
+http_request_seconds = registry.histogram(
+    "aiscope_http_request_duration_seconds",
+    "API request latency.",
+    ["method", "route", "status"],
+)
+http_request_queries = registry.histogram(
+    "aiscope_http_request_db_queries",
+    "SQL statements executed per API request.",
+    ["route"],
+    buckets=COUNT_BUCKETS,
+)
+cache_requests = registry.counter(
+    "aiscope_response_cache_requests_total", "Response cache lookups.", ["route", "result"]
+)
+
+
+# Tracing: spans are logged as JSON lines on the `backend.trace` logger.
+_current_span: ContextVar[tuple[str, str] | None] = ContextVar("aiscope_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    Trace span around a block, when `tracing_enabled` is on. Nested spans
+    share the trace id of the outermost one and record their parent.
+    """
+    if not settings.tracing_enabled:
+        yield
+        return
+    parent = _current_span.get()
+    trace_id = parent[0] if parent else os.urandom(16).hex()
+    span_id = os.urandom(8).hex()
+    token = _current_span.set((trace_id, span_id))
+    started_at = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current_span.reset(token)
+        record = {
+            "trace_id": trace_id,
+            "span_id": span_id,
+            "parent_id": parent[1] if parent else None,
+            "name": name,
+            "start": started_at,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "attributes": attributes,
+            "error": error,
+        }
+        trace_logger.info(json.dumps(record, default=str))
+
+
+def instrument_stage(stage: str) -> Callable[[F], F]:
+    """
+    Record a pipeline stage function's run time, outcome and (when it returns
+    an int) items produced, inside a trace span named `pipeline.<stage>`.
+    """
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not settings.metrics_enabled and not settings.tracing_enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with span(f"pipeline.{stage}"):
+                    result = fn(*args, **kwargs)
+                outcome = "ok"
+            finally:
+                stage_seconds.observe(time.perf_counter() - started, stage=stage)
+                stage_runs.inc(stage=stage, outcome=outcome)
+            if isinstance(result, int) and not isinstance(result, bool):
+                stage_items.inc(result, stage=stage)
+            elif result is not None:
+                stage_items.inc(stage=stage)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+
+from backend.core import metrics
+from backend.core.config import settings
+from backend.db.base import engine
+from backend.db.instrumentation import QueryStats, explain, track_queries
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency and the number of SQL statements of every API request,
+    labelled by route template (`/companies/{company_id}/events`, not the
+    concrete path), and wraps the request in an `http.request` trace span.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not (settings.metrics_enabled or settings.tracing_enabled):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        with track_queries() as queries, metrics.span(
+            "http.request", method=scope["method"], path=scope["path"]
+        ):
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router records the matched route on the scope.
+                route = getattr(scope.get("route"), "path", "unmatched")
+                metrics.http_request_seconds.observe(
+                    time.perf_counter() - started,
+                    method=scope["method"],
+                    route=route,
+                    status=status,
+                )
+                metrics.http_request_queries.observe(queries.count, route=route)
+
+
+class SQLProfilerMiddleware:
+    """
+    Per-request SQL profile, when `sql_profiler_enabled` is on.
+
+    The statement count and time go out in a `Server-Timing` header (`db`,
+    next to `app` for the whole request up to the response start). After the
+    response, statements run `sql_profiler_repeat_threshold` times or more are
+    logged as likely N+1 queries, and statements slower than
+    `sql_profiler_slow_query_ms` are logged with their EXPLAIN plan.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.sql_profiler_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries(record_statements=True) as queries:
+
+            async def send_with_timing(message) -> None:
+                if message["type"] == "http.response.start":
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} queries", '
+                        f"app;dur={elapsed_ms:.1f}",
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        await run_in_threadpool(_report_queries, f"{scope['method']} {route}", queries)
+
+
+def _report_queries(request: str, queries: QueryStats) -> None:
+    for statement, stats in queries.repeated(settings.sql_profiler_repeat_threshold).items():
+        logger.warning(
+            "Possible N+1 in %s: %d executions (%.1f ms) of %s",
+            request,
+            stats.count,
+            stats.seconds * 1000,
+            _shorten(statement),
+        )
+    slow_seconds = settings.sql_profiler_slow_query_ms / 1000
+    for statement, stats in (queries.statements or {}).items():
+        if stats.max_seconds < slow_seconds:
+            continue
+        plan = ""
+        if settings.sql_profiler_explain and not stats.executemany:
+            try:
+                plan = "\n" + explain(engine, statement, stats.slowest_parameters)
+            except Exception as exc:  # e.g. a statement from the async driver's paramstyle
+                plan = f"\n(EXPLAIN failed: {exc})"
+        logger.warning(
+            "Slow query in %s: %.1f ms: %s%s",
+            request,
+            stats.max_seconds * 1000,
+            _shorten(statement),
+            plan,
+        )
+
+
+def _shorten(statement: str, limit: int = 500) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
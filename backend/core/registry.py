@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+
+REGISTRY_PATH = Path(__file__).resolve().parents[2] / "data" / "companies.yaml"
+
+
+def normalize_name(s: str) -> str:
+    return " ".join(s.strip().lower().split())
+
+
+def match_key(s: str) -> str:
+    """
+    Spelling-insensitive key for entity matching: normalized and stripped of
+    whitespace and punctuation, so "Open AI", "OpenAI" and "open-ai" collide.
+    """
+    return re.sub(r"[\W_]+", "", normalize_name(s))
+
+
+def decode_aliases(raw: str | None) -> list[str]:
+    """Decode the JSON-encoded `Entity.aliases` column, tolerating bad data."""
+    if not raw:
+        return []
+    try:
+        aliases = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return [a for a in aliases if isinstance(a, str)] if isinstance(aliases, list) else []
+
+
+@lru_cache(maxsize=1)
+def load_company_records() -> tuple[dict, ...]:
+    """Load the curated company records from `data/companies.yaml`."""
+    if not REGISTRY_PATH.exists():
+        return ()
+    with REGISTRY_PATH.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    return tuple(rec for rec in raw.get("companies", []) or [] if rec.get("name"))
+
+
+@lru_cache(maxsize=1)
+def load_company_lookup() -> dict[str, dict]:
+    """Build a lookup map from normalized names/aliases -> registry record."""
+    lookup: dict[str, dict] = {}
+    for rec in load_company_records():
+        lookup[normalize_name(rec["name"])] = rec
+        for alias in rec.get("aliases", []) or []:
+            if alias:
+                lookup[normalize_name(alias)] = rec
+    return lookup
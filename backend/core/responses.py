@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Mapping
+
+import orjson
+from fastapi import Request, Response
+
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    Skips FastAPI's `jsonable_encoder` walk when returned directly from a
+    handler, and formats datetimes natively (naive values as ISO 8601 without
+    offset, matching `datetime.isoformat()`).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+def _etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip() for tag in header.split(",")}
+    # Weak comparison: W/"x" and "x" name the same representation.
+    return etag in candidates or etag[2:] in candidates
+
+
+def render_json(content: Any) -> bytes:
+    return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def json_body_response(
+    request: Request,
+    body: bytes,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    Answer with an already rendered JSON `body`, or 304 Not Modified when the
+    client already holds it (`If-None-Match` against a body-hash ETag).
+    """
+    response_headers = {"ETag": _etag(body), **(headers or {})}
+    if _etag_matches(request, response_headers["ETag"]):
+        return Response(status_code=304, headers=response_headers)
+    return Response(content=body, media_type="application/json", headers=response_headers)
+
+
+def json_response(
+    request: Request,
+    content: Any,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Serialize `content` once and answer it through `json_body_response`."""
+    return json_body_response(request, render_json(content), headers)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, Callable, TypeVar
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.core.config import Settings, settings
+from backend.db.base import SessionLocal, install_sqlite_pragmas
+from backend.db.instrumentation import install_query_metrics
+
+
+T = TypeVar("T")
+
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a sync URL onto the async driver for the same backend."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def make_async_engine(config: Settings = settings):
+    # Imported lazily: the async drivers are only needed when api_async_db is on.
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(config.async_database_url or async_database_url(config.database_url))
+    if url.get_backend_name() == "sqlite":
+        engine = create_async_engine(
+            url, connect_args={"timeout": config.sqlite_busy_timeout_ms / 1000}
+        )
+        install_sqlite_pragmas(engine.sync_engine, config)
+    else:
+        engine = create_async_engine(
+            url,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout_seconds,
+            pool_recycle=config.db_pool_recycle_seconds,
+            pool_pre_ping=config.db_pool_pre_ping,
+        )
+    if config.metrics_enabled or config.sql_profiler_enabled:
+        install_query_metrics(engine.sync_engine)
+    return engine
+
+
+_async_sessionmaker = None
+
+
+def _get_async_sessionmaker():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_sessionmaker = async_sessionmaker(
+            make_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    global _async_sessionmaker
+    if _async_sessionmaker is not None:
+        await _async_sessionmaker.kw["bind"].dispose()
+        _async_sessionmaker = None
+
+
+class AsyncDB:
+    """
+    Database handle for `async def` routes.
+
+    `run(fn, ...)` calls `fn(session, ...)` with a regular `Session`, so the sync
+    query helpers in `backend.queries` are shared by both paths. With
+    `api_async_db` on, the session is the sync facade of an `AsyncSession`
+    (`run_sync`) and the event loop is never blocked on I/O; otherwise `fn` runs
+    on the threadpool against a `SessionLocal` session, as sync routes do.
+
+    Functions passed to `run` must not hold thread locks across queries: under
+    `run_sync` they share the event loop thread with other requests.
+    """
+
+    def __init__(self, session) -> None:
+        self._session = session
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        if isinstance(self._session, Session):
+            return await run_in_threadpool(fn, self._session, *args, **kwargs)
+        return await self._session.run_sync(fn, *args, **kwargs)
+
+
+async def get_async_db() -> AsyncIterator[AsyncDB]:
+    """Async counterpart of `get_db`."""
+    if settings.api_async_db:
+        async with _get_async_sessionmaker()() as session:
+            yield AsyncDB(session)
+        return
+    session = SessionLocal()
+    try:
+        yield AsyncDB(session)
+    finally:
+        session.close()
@@ -1,20 +1,108 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
-from backend.core.config import settings
+from backend.core.config import Settings, settings
+from backend.db.instrumentation import install_query_metrics
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, future=True)
+_SQLITE_JOURNAL_MODES = {"delete", "truncate", "persist", "memory", "wal", "off"}
+_SQLITE_SYNCHRONOUS = {"off", "normal", "full", "extra"}
+
+
+def _sqlite_pragmas(config: Settings) -> list[str]:
+    journal_mode = config.sqlite_journal_mode.lower()
+    synchronous = config.sqlite_synchronous.lower()
+    if journal_mode not in _SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unsupported sqlite_journal_mode: {config.sqlite_journal_mode!r}")
+    if synchronous not in _SQLITE_SYNCHRONOUS:
+        raise ValueError(f"Unsupported sqlite_synchronous: {config.sqlite_synchronous!r}")
+    return [
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}",
+        # Negative cache_size is in KiB rather than pages.
+        f"PRAGMA cache_size=-{int(config.sqlite_cache_size_kib)}",
+        f"PRAGMA mmap_size={int(config.sqlite_mmap_size_bytes)}",
+    ]
+
+
+def make_engine(database_url: str, config: Settings = settings) -> Engine:
+    """
+    Create an engine tuned for the backend in `database_url`.
+
+    SQLite connections get the `sqlite_*` PRAGMAs on connect (journal mode,
+    synchronous, busy timeout, page cache, mmap). Server databases get an explicitly sized
+    connection pool from the `db_pool_*` settings.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        engine = create_engine(
+            url,
+            future=True,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout_seconds,
+            pool_recycle=config.db_pool_recycle_seconds,
+            pool_pre_ping=config.db_pool_pre_ping,
+        )
+        _install_instrumentation(engine, config)
+        return engine
+
+    engine = create_engine(
+        url,
+        future=True,
+        connect_args={
+            # Connections are shared by the API threadpool and pipeline workers.
+            "check_same_thread": False,
+            "timeout": config.sqlite_busy_timeout_ms / 1000,
+        },
+    )
+    install_sqlite_pragmas(engine, config)
+    _install_instrumentation(engine, config)
+    return engine
+
+
+def _install_instrumentation(engine: Engine, config: Settings = settings) -> None:
+    if config.metrics_enabled or config.sql_profiler_enabled:
+        install_query_metrics(engine)
+
+
+def install_sqlite_pragmas(engine: Engine, config: Settings = settings) -> None:
+    """Apply the `sqlite_*` PRAGMAs to every new DBAPI connection of `engine`."""
+    pragmas = _sqlite_pragmas(config)
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                if in_memory and pragma.startswith("PRAGMA journal_mode"):
+                    continue
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+engine = make_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
 def init_db() -> None:
     # Import models so that they are registered with Base.metadata
-    from backend.models import briefings, documents, entities, events  # noqa: F401
+    from backend.models import briefings, data_versions, documents, entities, events, extraction_cache, graph, pipeline_state  # noqa: F401
+    from backend.db.migrations import upgrade_schema
 
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
 
+    # create_all only emits indexes together with new tables; add any indexes
+    # declared since an existing table was created.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.core import metrics
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Parameters of the slowest execution, for EXPLAIN.
+    slowest_parameters: Any = None
+    executemany: bool = False
+
+
+@dataclass
+class QueryStats:
+    """Statements executed, and their total time, within a `track_queries` block."""
+
+    count: int = 0
+    seconds: float = 0.0
+    # Per statement text, when recording statements.
+    statements: dict[str, StatementStats] | None = None
+    parent: QueryStats | None = field(default=None, repr=False)
+
+    def record(self, statement: str, parameters: Any, elapsed: float, executemany: bool) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        if self.statements is None:
+            return
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats(executemany=executemany)
+        stats.count += 1
+        stats.seconds += elapsed
+        if elapsed >= stats.max_seconds:
+            stats.max_seconds = elapsed
+            stats.slowest_parameters = parameters
+
+    def repeated(self, threshold: int) -> dict[str, StatementStats]:
+        """Statements run `threshold` times or more one by one: likely N+1 queries."""
+        return {
+            statement: stats
+            for statement, stats in (self.statements or {}).items()
+            if stats.count >= threshold and not stats.executemany
+        }
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("aiscope_query_stats", default=None)
+# Trackers that see every statement in the process, whatever thread or task runs it.
+_process_trackers: tuple[QueryStats, ...] = ()
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """
+    Count the statements executed in this context (and in threadpool calls
+    made from it) on engines with `install_query_metrics`. Trackers nest: an
+    outer tracker also counts the statements of inner ones.
+    """
+    stats = QueryStats(statements={} if record_statements else None, parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def track_process_queries() -> Iterator[QueryStats]:
+    """Like `track_queries`, but counts statements from every thread of the process."""
+    global _process_trackers
+    stats = QueryStats(statements={})
+    _process_trackers = _process_trackers + (stats,)
+    try:
+        yield stats
+    finally:
+        _process_trackers = tuple(t for t in _process_trackers if t is not stats)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail with an AssertionError listing the statements when the block runs
+    more than `max_queries` of them. Meant for tests, so that a query count
+    regression on an endpoint fails the suite:
+
+        with assert_max_queries(4):
+            client.get("/events")
+
+    Statements from every thread count (the test client runs the app on its
+    own), on engines with `install_query_metrics` - the pipeline engine always
+    has it once this is called, the async engine when metrics or the SQL
+    profiler are enabled.
+    """
+    # Imported here: backend.db.base imports this module.
+    from backend.db.base import engine
+
+    install_query_metrics(engine)
+    with track_process_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        lines = [
+            f"  {s.count} x {' '.join(statement.split())[:200]}"
+            for statement, s in sorted(
+                (stats.statements or {}).items(), key=lambda item: -item[1].count
+            )
+        ]
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, ran {stats.count}:\n" + "\n".join(lines)
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("aiscope_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["aiscope_query_started"].pop()
+    elapsed = time.perf_counter() - started
+    metrics.db_queries.inc()
+    metrics.db_query_seconds.observe(elapsed)
+    stats = _current_stats.get()
+    while stats is not None:
+        stats.record(statement, parameters, elapsed, executemany)
+        stats = stats.parent
+    for tracker in _process_trackers:
+        tracker.record(statement, parameters, elapsed, executemany)
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("aiscope_query_started"):
+        conn.info["aiscope_query_started"].pop()
+
+
+def install_query_metrics(engine: Engine) -> None:
+    """Feed every statement executed on `engine` into the query metrics and trackers."""
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> str:
+    """The query plan of `statement` (SELECTs only) as text, one row per line."""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return "(not a SELECT)"
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
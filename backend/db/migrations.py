@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import ast
+import json
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from backend.db.base import Base
+
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(conn: Connection) -> dict[str, set[str]]:
+    """
+    Add nullable columns declared on models but missing from existing tables.
+
+    `create_all` never alters existing tables; this covers the additive changes
+    the models have made since. Returns the added columns per table.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    added: dict[str, set[str]] = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            conn.execute(
+                text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} "
+                    f"{column.type.compile(dialect=conn.dialect)}"
+                )
+            )
+            added.setdefault(table.name, set()).add(column.name)
+    return added
+
+
+def _parse_legacy_attributes(raw: str) -> dict:
+    # Older writers stored json.dumps output, some rows hold a Python dict repr.
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            return {"raw": raw}
+    return value if isinstance(value, dict) else {"raw": value}
+
+
+def _migrate_event_attributes(conn: Connection) -> None:
+    """Rewrite text `events.attributes` as valid JSON and fill the promoted columns."""
+    from backend.models.events import promoted_attributes
+
+    rows = conn.execute(
+        text("SELECT id, attributes FROM events WHERE attributes IS NOT NULL")
+    ).all()
+    updates = []
+    for event_id, raw in rows:
+        attrs = raw if isinstance(raw, dict) else _parse_legacy_attributes(raw)
+        updates.append({"id": event_id, "attributes": json.dumps(attrs), **promoted_attributes(attrs)})
+    if updates:
+        conn.execute(
+            text(
+                "UPDATE events SET attributes = :attributes, amount_usd = :amount_usd, "
+                "round = :round, summary = :summary WHERE id = :id"
+            ),
+            updates,
+        )
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text("ALTER TABLE events ALTER COLUMN attributes TYPE JSONB USING attributes::jsonb")
+        )
+    logger.info("Migrated attributes of %d events to JSON", len(updates))
+
+
+def upgrade_schema(engine: Engine) -> None:
+    with engine.begin() as conn:
+        added = _add_missing_columns(conn)
+        if "amount_usd" in added.get("events", ()):
+            _migrate_event_attributes(conn)
@@ -1,84 +1,334 @@
 from __future__ import annotations
 
 import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable
+from typing import Any, Iterable
+from urllib.parse import urlsplit
 
 import feedparser
 import requests
 import yaml
 from requests import Response
+from requests.adapters import HTTPAdapter
 
 from backend.core.config import settings
+from backend.core import metrics
+from backend.core.metrics import instrument_stage
 from backend.db.base import SessionLocal
-from backend.models.documents import Document
+from backend.models.data_versions import DOCUMENTS, bump_data_version
+from backend.models.documents import Document, FetchValidator
+
+
+logger = logging.getLogger(__name__)
 
 
 def _hash_content(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def _request(url: str) -> Response:
-    headers = {"User-Agent": settings.user_agent}
-    resp = requests.get(url, headers=headers, timeout=15)
+_HTTP_SESSION: requests.Session | None = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def _http_session() -> requests.Session:
+    """Process-wide pooled HTTP session shared by feed and article fetches."""
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = settings.user_agent
+            adapter = HTTPAdapter(
+                pool_connections=settings.ingestion_max_workers,
+                pool_maxsize=settings.ingestion_max_workers,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
+def _request(
+    url: str, timeout: float | None = None, headers: dict[str, str] | None = None
+) -> Response:
+    resp = _http_session().get(
+        url, timeout=timeout or settings.ingestion_feed_timeout_seconds, headers=headers
+    )
     resp.raise_for_status()
     return resp
 
 
+class ConditionalGetStats:
+    """Thread-safe counters for conditional GETs: 304 hits vs. full-body misses."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, not_modified: bool) -> None:
+        with self._lock:
+            if not_modified:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.feed_conditional_gets.inc(result="not_modified" if not_modified else "fetched")
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+conditional_get_stats = ConditionalGetStats()
+
+
+@dataclass
+class ValidatorState:
+    etag: str | None = None
+    last_modified: str | None = None
+    status: int | None = None
+
+
+def _conditional_request(
+    url: str, validator: ValidatorState | None
+) -> tuple[Response, ValidatorState]:
+    """
+    GET `url`, sending If-None-Match / If-Modified-Since from the stored validator.
+
+    Returns the response and the validator to persist; on a 304 the previous
+    validators are kept.
+    """
+    headers: dict[str, str] = {}
+    if validator is not None:
+        if validator.etag:
+            headers["If-None-Match"] = validator.etag
+        if validator.last_modified:
+            headers["If-Modified-Since"] = validator.last_modified
+
+    resp = _request(url, headers=headers)
+    not_modified = resp.status_code == 304
+    conditional_get_stats.record(not_modified)
+
+    if not_modified and validator is not None:
+        return resp, ValidatorState(validator.etag, validator.last_modified, resp.status_code)
+    return resp, ValidatorState(
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        status=resp.status_code,
+    )
+
+
+def _load_validators(session, urls: Iterable[str]) -> dict[str, ValidatorState]:
+    rows = session.query(FetchValidator).filter(FetchValidator.url.in_(list(urls))).all()
+    return {
+        row.url: ValidatorState(row.etag, row.last_modified, row.last_status) for row in rows
+    }
+
+
+def _save_validators(session, validators: dict[str, ValidatorState]) -> None:
+    if not validators:
+        return
+    existing = {
+        row.url: row
+        for row in session.query(FetchValidator).filter(FetchValidator.url.in_(list(validators)))
+    }
+    now = datetime.utcnow()
+    for url, state in validators.items():
+        row = existing.get(url)
+        if row is None:
+            row = FetchValidator(url=url)
+            session.add(row)
+        row.etag = state.etag
+        row.last_modified = state.last_modified
+        row.last_status = state.status
+        row.last_fetched_at = now
+
+
+class _HostLimiter:
+    """Caps the number of in-flight requests per host."""
+
+    def __init__(self, per_host: int) -> None:
+        self._per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+
+    def for_url(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = self._semaphores[host] = threading.BoundedSemaphore(self._per_host)
+            return sem
+
+
+@dataclass
+class FeedFetchResult:
+    feed_cfg: dict
+    entries: list[Any]
+    validator: ValidatorState | None = None
+    not_modified: bool = False
+    error: Exception | None = None
+
+
 def load_sources(config_path: str = "backend/ingestion/sources.yaml") -> dict:
     with open(config_path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 
-def fetch_rss_documents() -> int:
-    """Fetch RSS feeds and store new documents. Returns count of new documents."""
-    sources = load_sources()
-    rss_feeds: Iterable[dict] = sources.get("rss_feeds", [])
+def _fetch_and_parse_feed(
+    feed_cfg: dict, limiter: _HostLimiter, validator: ValidatorState | None
+) -> FeedFetchResult:
+    """Fetch stage + parse stage for a single feed; runs on a worker thread."""
+    url = feed_cfg["url"]
+    try:
+        with limiter.for_url(url):
+            resp, new_validator = _conditional_request(url, validator)
+        if resp.status_code == 304:
+            return FeedFetchResult(
+                feed_cfg=feed_cfg, entries=[], validator=new_validator, not_modified=True
+            )
+        parsed = feedparser.parse(resp.content)
+        return FeedFetchResult(
+            feed_cfg=feed_cfg, entries=list(parsed.entries), validator=new_validator
+        )
+    except Exception as exc:  # one broken feed must not sink the whole run
+        logger.warning("Failed to fetch feed %s: %s", url, exc)
+        return FeedFetchResult(feed_cfg=feed_cfg, entries=[], error=exc)
+
+
+# Keep IN lists well below SQLite's bound-parameter limit.
+_IN_CHUNK_SIZE = 500
+
+
+def _existing_values(session, column, values: list[str]) -> set[str]:
+    found: set[str] = set()
+    for i in range(0, len(values), _IN_CHUNK_SIZE):
+        chunk = values[i : i + _IN_CHUNK_SIZE]
+        found.update(v for (v,) in session.query(column).filter(column.in_(chunk)))
+    return found
+
+
+@dataclass
+class _SeenKeys:
+    """URLs and content hashes already claimed earlier in the same run."""
+
+    urls: set[str] = field(default_factory=set)
+    hashes: set[str] = field(default_factory=set)
+
+
+def _store_feed_entries(
+    session, feed_cfg: dict, entries: Iterable[Any], seen: _SeenKeys | None = None
+) -> int:
+    """
+    Dedup stage: add documents for entries not already stored. Returns count added.
+
+    A feed's candidate URLs and content hashes are checked against the database
+    with bulk IN queries and against `seen` (entries earlier in this feed or run),
+    then the survivors are inserted together.
+    """
+    if seen is None:
+        seen = _SeenKeys()
+
+    candidates = []
+    for entry in entries:
+        link = entry.get("link")
+        if not link:
+            continue
+        title = entry.get("title", "")
+        summary = entry.get("summary", "")
+        content = f"{title}\n\n{summary}"
+        candidates.append((entry, link, title, content, _hash_content(content)))
+    if not candidates:
+        return 0
+
+    known_urls = _existing_values(session, Document.url, list({c[1] for c in candidates}))
+    known_hashes = _existing_values(
+        session, Document.content_hash, list({c[4] for c in candidates})
+    )
+
+    now = datetime.utcnow()
+    docs = []
+    for entry, link, title, content, content_hash in candidates:
+        if link in known_urls or link in seen.urls:
+            continue
+        if content_hash in known_hashes or content_hash in seen.hashes:
+            continue
+        seen.urls.add(link)
+        seen.hashes.add(content_hash)
+
+        published_parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        published_at = datetime(*published_parsed[:6]) if published_parsed else None
+        docs.append(
+            Document(
+                url=link,
+                title=title,
+                source_name=feed_cfg.get("name"),
+                published_at=published_at,
+                fetched_at=now,
+                content=content,
+                content_hash=content_hash,
+            )
+        )
+
+    session.add_all(docs)
+    return len(docs)
+
+
+@instrument_stage("feeds")
+def fetch_rss_documents(feeds: Iterable[dict] | None = None) -> int:
+    """
+    Fetch RSS feeds and store new documents. Returns count of new documents.
+
+    Feeds are fetched and parsed concurrently on a bounded thread pool (with a
+    per-host cap and per-feed timeout); results are deduplicated and written on
+    the calling thread as each feed completes, so a run takes roughly as long as
+    the slowest feed rather than the sum of all of them.
+
+    Feeds are requested conditionally (ETag / Last-Modified from the previous
+    run); a 304 skips parsing entirely.
+    """
+    if feeds is None:
+        feeds = load_sources().get("rss_feeds", [])
+    feeds = list(feeds)
+    if not feeds:
+        return 0
+
+    limiter = _HostLimiter(settings.ingestion_per_host_limit)
     session = SessionLocal()
     new_count = 0
 
     try:
-        for feed_cfg in rss_feeds:
-            parsed = feedparser.parse(feed_cfg["url"])
-            for entry in parsed.entries:
-                link = entry.get("link")
-                if not link:
-                    continue
-                if session.query(Document).filter_by(url=link).first():
-                    continue
+        validators = _load_validators(session, (cfg["url"] for cfg in feeds))
+        updated_validators: dict[str, ValidatorState] = {}
+        seen = _SeenKeys()
 
-                title = entry.get("title", "")
-                summary = entry.get("summary", "")
-                published_parsed = entry.get("published_parsed") or entry.get(
-                    "updated_parsed"
-                )
-                published_at = (
-                    datetime(*published_parsed[:6]) if published_parsed else None
-                )
-
-                content = f"{title}\n\n{summary}"
-                content_hash = _hash_content(content)
-
-                if (
-                    session.query(Document)
-                    .filter_by(content_hash=content_hash)
-                    .first()
-                    is not None
-                ):
+        workers = min(settings.ingestion_max_workers, len(feeds))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as pool:
+            futures = [
+                pool.submit(_fetch_and_parse_feed, cfg, limiter, validators.get(cfg["url"]))
+                for cfg in feeds
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                if result.error is not None:
                     continue
+                updated_validators[result.feed_cfg["url"]] = result.validator
+                if not result.not_modified:
+                    new_count += _store_feed_entries(
+                        session, result.feed_cfg, result.entries, seen
+                    )
 
-                doc = Document(
-                    url=link,
-                    title=title,
-                    source_name=feed_cfg.get("name"),
-                    published_at=published_at,
-                    fetched_at=datetime.utcnow(),
-                    content=content,
-                    content_hash=content_hash,
-                )
-                session.add(doc)
-                new_count += 1
-
+        _save_validators(session, updated_validators)
+        if new_count:
+            bump_data_version(session, DOCUMENTS)
         session.commit()
         return new_count
     finally:
@@ -92,12 +342,18 @@ def fetch_full_article(document_id: int) -> None:
         doc = session.get(Document, document_id)
         if not doc:
             return
-        resp = _request(doc.url)
+        resp, validator = _conditional_request(
+            doc.url, _load_validators(session, [doc.url]).get(doc.url)
+        )
+        _save_validators(session, {doc.url: validator})
+        if resp.status_code == 304:
+            session.commit()
+            return
         text = resp.text
         doc.content = text
         doc.content_hash = _hash_content(text)
         doc.fetched_at = datetime.utcnow()
+        bump_data_version(session, DOCUMENTS)
         session.commit()
     finally:
         session.close()
-
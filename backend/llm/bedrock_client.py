@@ -1,13 +1,31 @@
 from __future__ import annotations
 
 import json
+import time
 from typing import Any, Dict
 
 import boto3
 from botocore.config import Config
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from backend.core import metrics
 from backend.core.config import settings
+from backend.llm.rate_limit import bedrock_limiter
+
+
+def _record_token_usage(response: Dict[str, Any], resp_body: Dict[str, Any]) -> None:
+    """Count tokens from the Bedrock usage headers, or the model's own body fields."""
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    input_tokens = headers.get("x-amzn-bedrock-input-token-count")
+    output_tokens = headers.get("x-amzn-bedrock-output-token-count")
+    if input_tokens is None:
+        input_tokens = resp_body.get("inputTextTokenCount")
+    if output_tokens is None:
+        output_tokens = sum(r.get("tokenCount") or 0 for r in resp_body.get("results") or [])
+    if input_tokens:
+        metrics.bedrock_tokens.inc(int(input_tokens), direction="input")
+    if output_tokens:
+        metrics.bedrock_tokens.inc(int(output_tokens), direction="output")
 
 
 class BedrockClient:
@@ -19,11 +37,19 @@ class BedrockClient:
         self.client = boto3.client(
             "bedrock-runtime",
             region_name=settings.aws_region,
-            config=Config(retries={"max_attempts": 3}),
+            # Retries are left to `invoke_json`, so that each attempt takes a
+            # token from the shared limiter instead of botocore resending on its own.
+            config=Config(retries={"total_max_attempts": 1}),
         )
 
-    @retry(wait=wait_exponential(min=1, max=20), stop=stop_after_attempt(3))
+    @retry(
+        wait=wait_exponential(min=1, max=20),
+        stop=stop_after_attempt(3),
+        before_sleep=lambda retry_state: metrics.bedrock_retries.inc(),
+    )
     def invoke_json(self, prompt: str, max_tokens: int = 2048) -> Dict[str, Any]:
+        # Every attempt, retries included, waits for the process-wide token bucket.
+        bedrock_limiter().acquire()
         body = json.dumps(
             {
                 "inputText": prompt,
@@ -35,14 +61,22 @@ class BedrockClient:
             }
         )
 
-        response = self.client.invoke_model(
-            modelId=self.model_id,
-            body=body,
-            contentType="application/json",
-            accept="application/json",
-        )
+        started = time.perf_counter()
+        try:
+            with metrics.span("bedrock.invoke_model", model_id=self.model_id, max_tokens=max_tokens):
+                response = self.client.invoke_model(
+                    modelId=self.model_id,
+                    body=body,
+                    contentType="application/json",
+                    accept="application/json",
+                )
+        except Exception:
+            metrics.bedrock_call_seconds.observe(time.perf_counter() - started, outcome="error")
+            raise
+        metrics.bedrock_call_seconds.observe(time.perf_counter() - started, outcome="ok")
 
         resp_body = json.loads(response["body"].read())
+        _record_token_usage(response, resp_body)
         # Different Bedrock models shape outputs slightly differently; expect at least 'outputText'
         text = resp_body.get("outputText") or resp_body.get("results", [{}])[0].get(
             "outputText", {}
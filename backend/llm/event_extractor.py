@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from textwrap import dedent
 from typing import List
@@ -45,10 +46,34 @@ EXTRACTION_SYSTEM_PROMPT = dedent(
     """
 )
 
+# Identifies the prompt in cached extraction results; editing the prompt changes it,
+# which makes every previously cached result a miss.
+EXTRACTION_PROMPT_VERSION = hashlib.sha256(
+    EXTRACTION_SYSTEM_PROMPT.encode("utf-8")
+).hexdigest()[:16]
+
+
+def attach_source_url(result: ExtractionResult, url: str | None) -> ExtractionResult:
+    """Ensure every event of an already-validated result lists `url` among its source URLs."""
+    if url:
+        for ev in result.events:
+            if url not in ev.source_urls:
+                ev.source_urls.append(url)
+    return result
+
+
+def strip_source_url(result: ExtractionResult, url: str | None) -> ExtractionResult:
+    """Copy of `result` whose events no longer list `url`, the document it was extracted from."""
+    result = result.model_copy(deep=True)
+    if url:
+        for ev in result.events:
+            ev.source_urls = [u for u in ev.source_urls if u != url]
+    return result
+
 
 class EventExtractor:
-    def __init__(self) -> None:
-        self.client = BedrockClient()
+    def __init__(self, client: BedrockClient | None = None) -> None:
+        self.client = client or BedrockClient()
 
     def extract(self, content: str, url: str | None = None) -> ExtractionResult:
         prompt = f"{EXTRACTION_SYSTEM_PROMPT}\n\nARTICLE:\n{content}\n"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import select
+
+from backend.llm.event_extractor import EXTRACTION_PROMPT_VERSION, strip_source_url
+from backend.models.extraction_cache import ExtractionCacheEntry
+from backend.schemas.events import ExtractionResult
+
+
+# Keep IN lists well below SQLite's bound-parameter limit.
+_IN_CHUNK_SIZE = 500
+
+
+def lookup_many(
+    session, content_hashes: Iterable[str], model_id: str
+) -> dict[str, ExtractionResult]:
+    """
+    Return cached results for the given content hashes under the current prompt
+    and model. They carry no document URL: attach the reading document's own
+    with `attach_source_url`.
+    """
+    hashes = list(set(content_hashes))
+    now = datetime.utcnow()
+    found: dict[str, ExtractionResult] = {}
+    for i in range(0, len(hashes), _IN_CHUNK_SIZE):
+        rows = (
+            session.query(ExtractionCacheEntry)
+            .filter(ExtractionCacheEntry.content_hash.in_(hashes[i : i + _IN_CHUNK_SIZE]))
+            .filter(ExtractionCacheEntry.prompt_version == EXTRACTION_PROMPT_VERSION)
+            .filter(ExtractionCacheEntry.model_id == model_id)
+            .all()
+        )
+        for row in rows:
+            found[row.content_hash] = ExtractionResult.model_validate_json(row.result_json)
+            row.hits += 1
+            row.last_used_at = now
+    return found
+
+
+def store(
+    session, content_hash: str, model_id: str, result: ExtractionResult, source_url: str | None
+) -> None:
+    """
+    Record a fresh model result; an existing entry for the same key is overwritten.
+
+    `source_url` (the document the result was extracted from) is stripped from
+    the events first, so a later document with the same content is not credited
+    to it.
+    """
+    entry = (
+        session.query(ExtractionCacheEntry)
+        .filter_by(
+            content_hash=content_hash,
+            prompt_version=EXTRACTION_PROMPT_VERSION,
+            model_id=model_id,
+        )
+        .first()
+    )
+    if entry is None:
+        entry = ExtractionCacheEntry(
+            content_hash=content_hash, prompt_version=EXTRACTION_PROMPT_VERSION, model_id=model_id
+        )
+        session.add(entry)
+    entry.result_json = strip_source_url(result, source_url).model_dump_json()
+    entry.last_used_at = datetime.utcnow()
+
+
+def invalidate_stale_prompts(session) -> int:
+    """Delete entries produced by any prompt other than the current `EXTRACTION_SYSTEM_PROMPT`."""
+    return (
+        session.query(ExtractionCacheEntry)
+        .filter(ExtractionCacheEntry.prompt_version != EXTRACTION_PROMPT_VERSION)
+        .delete(synchronize_session=False)
+    )
+
+
+def prune(session, max_entries: int, max_age_days: int) -> int:
+    """
+    Evict entries unused for `max_age_days`, then the least recently used ones
+    beyond `max_entries`. Returns the number of entries removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    removed = (
+        session.query(ExtractionCacheEntry)
+        .filter(ExtractionCacheEntry.last_used_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+
+    keep = (
+        select(ExtractionCacheEntry.id)
+        .order_by(ExtractionCacheEntry.last_used_at.desc(), ExtractionCacheEntry.id.desc())
+        .limit(max_entries)
+    )
+    removed += (
+        session.query(ExtractionCacheEntry)
+        .filter(ExtractionCacheEntry.id.notin_(keep))
+        .delete(synchronize_session=False)
+    )
+    return removed
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from backend.core.config import settings
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    `rate` tokens are added per second up to `burst`; `acquire` blocks until a
+    token is available. Used to keep concurrent model calls under the Bedrock
+    request quota instead of relying on throttling errors and retries.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_bedrock_limiter: TokenBucket | None = None
+_bedrock_limiter_lock = threading.Lock()
+
+
+def bedrock_limiter() -> TokenBucket:
+    """
+    The process-wide token bucket for Bedrock calls, built from
+    `bedrock_requests_per_second` / `bedrock_burst` on first use. Every
+    pipeline run shares it, so a scheduler tick does not start with a fresh
+    burst while the previous run's calls still count against the quota.
+    """
+    global _bedrock_limiter
+    with _bedrock_limiter_lock:
+        if _bedrock_limiter is None:
+            _bedrock_limiter = TokenBucket(settings.bedrock_requests_per_second, settings.bedrock_burst)
+        return _bedrock_limiter
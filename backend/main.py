@@ -1,18 +1,39 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
+from datetime import datetime
+from typing import Literal
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-import yaml
 from sqlalchemy.orm import Session
 
+from backend.core import metrics
+from backend.core.cache import response_cache
+from backend.core.config import settings
+from backend.core.middleware import RequestMetricsMiddleware, SQLProfilerMiddleware
+from backend.core.registry import load_company_lookup, normalize_name
+from backend.core.responses import FastJSONResponse
+from backend.db.async_session import AsyncDB, dispose_async_engine, get_async_db
 from backend.db.base import SessionLocal, init_db
 from backend.models.briefings import Briefing
+from backend.models.data_versions import BRIEFINGS, DOCUMENTS, ENTITIES, EVENTS, bump_data_version
 from backend.models.entities import Entity
 from backend.models.events import Event, EventEntityRole
+from backend.pipeline.graph_edges import ensure_graph_edges
+from backend.queries.entities import build_entity_profile
+from backend.queries.events import (
+    EVENT_COLUMNS,
+    IS_CANONICAL_EVENT,
+    InvalidCursor,
+    load_event_payloads,
+    query_event_page,
+)
+from backend.queries.export import csv_lines, iter_event_export, ndjson_lines
+from backend.queries.graph import query_graph
+from backend.search.entity_index import get_entity_index, invalidate_entity_index
 
 
 def get_db():
@@ -23,7 +44,7 @@ def get_db():
         db.close()
 
 
-app = FastAPI(title="AIscope API", version="0.1.0")
+app = FastAPI(title="AIscope API", version="0.1.0", default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,12 +52,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(SQLProfilerMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    with SessionLocal() as db:
+        if ensure_graph_edges(db):
+            db.commit()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await dispose_async_engine()
 
 
 @app.get("/health")
@@ -44,129 +76,220 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit rates per cached route, backend size and the data versions last seen."""
+    return response_cache.snapshot()
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Process metrics in the Prometheus text exposition format."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.registry.render(), media_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/briefings/latest")
-def get_latest_briefing(db: Session = Depends(get_db)):
-    briefing = db.query(Briefing).order_by(Briefing.generated_at.desc()).first()
-    if not briefing:
-        raise HTTPException(status_code=404, detail="No briefing available")
-    return {
-        "id": briefing.id,
-        "generated_at": briefing.generated_at,
-        "content_markdown": briefing.content_markdown,
-    }
+async def get_latest_briefing(request: Request, db: AsyncDB = Depends(get_async_db)):
+    async def build():
+        briefing = await db.run(
+            lambda s: s.query(Briefing).order_by(Briefing.generated_at.desc()).first()
+        )
+        if not briefing:
+            raise HTTPException(status_code=404, detail="No briefing available")
+        content = {
+            "id": briefing.id,
+            "generated_at": briefing.generated_at,
+            "content_markdown": briefing.content_markdown,
+        }
+        return content, None
+
+    return await response_cache.respond(
+        request, db, route="briefings_latest", scopes=(BRIEFINGS,), build=build
+    )
 
 
 @app.get("/companies")
-def list_companies(db: Session = Depends(get_db)):
-    entities = db.query(Entity).filter(Entity.type == "company").order_by(Entity.name).all()
-    return [
-        {
-            "id": e.id,
-            "name": e.name,
-        }
-        for e in entities
-    ]
+async def list_companies(request: Request, db: AsyncDB = Depends(get_async_db)):
+    async def build():
+        rows = await db.run(
+            lambda s: s.query(Entity.id, Entity.name)
+            .filter(Entity.type == "company")
+            .order_by(Entity.name)
+            .all()
+        )
+        return [{"id": row.id, "name": row.name} for row in rows], None
+
+    return await response_cache.respond(
+        request, db, route="companies", scopes=(ENTITIES,), build=build
+    )
 
 
 @app.get("/companies/{company_id}/events")
-def company_events(company_id: int, db: Session = Depends(get_db)):
-    company = db.query(Entity).filter(Entity.id == company_id).first()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
-    events = (
-        db.query(Event)
-        .join(EventEntityRole, EventEntityRole.event_id == Event.id)
-        .filter(EventEntityRole.entity_id == company_id)
-        .order_by(Event.occurred_at.desc().nullslast())
-        .limit(100)
-        .all()
+async def company_events(company_id: int, request: Request, db: AsyncDB = Depends(get_async_db)):
+    def load(s: Session):
+        if not s.query(Entity.id).filter(Entity.id == company_id).first():
+            return None
+        return (
+            s.query(*EVENT_COLUMNS)
+            .join(EventEntityRole, EventEntityRole.event_id == Event.id)
+            .filter(EventEntityRole.entity_id == company_id)
+            .filter(IS_CANONICAL_EVENT)
+            .order_by(Event.occurred_at.desc().nullslast())
+            .limit(100)
+            .all()
+        )
+
+    async def build():
+        rows = await db.run(load)
+        if rows is None:
+            raise HTTPException(status_code=404, detail="Company not found")
+        return [row._asdict() for row in rows], None
+
+    return await response_cache.respond(
+        request, db, route="company_events", scopes=(EVENTS, ENTITIES), build=build
     )
-    return [
-        {
-            "id": ev.id,
-            "type": ev.type,
-            "occurred_at": ev.occurred_at,
-            "recorded_at": ev.recorded_at,
-            "attributes": ev.attributes,
-            "confidence": ev.confidence,
-        }
-        for ev in events
-    ]
 
 
 @app.get("/events")
-def list_events(db: Session = Depends(get_db)):
-    from backend.models.events import EventEntityRole
-    from backend.models.entities import Entity
-    
-    events = (
-        db.query(Event)
-        .order_by(Event.occurred_at.desc().nullslast())
-        .limit(200)
-        .all()
-    )
-    
-    result = []
-    for ev in events:
-        # Get entities involved in this event
-        entity_roles = (
-            db.query(EventEntityRole, Entity)
-            .join(Entity, EventEntityRole.entity_id == Entity.id)
-            .filter(EventEntityRole.event_id == ev.id)
-            .all()
+async def list_events(
+    request: Request,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: str | None = None,
+    type: list[str] | None = Query(None),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    entity_id: int | None = None,
+    min_confidence: float | None = Query(None, ge=0, le=1),
+    min_amount_usd: float | None = Query(None, ge=0),
+    db: AsyncDB = Depends(get_async_db),
+):
+    """
+    Page through the event ledger, newest first.
+
+    The body stays a plain list; the cursor for the following page (if any) is
+    returned in the `X-Next-Cursor` header. Responses carry an ETag, and a
+    matching `If-None-Match` gets 304 Not Modified. Pages are served from the
+    response cache until the pipeline writes new data.
+    """
+
+    def load(s: Session):
+        events, next_cursor = query_event_page(
+            s,
+            limit=limit,
+            cursor=cursor,
+            types=type,
+            start=start,
+            end=end,
+            entity_id=entity_id,
+            min_confidence=min_confidence,
+            min_amount_usd=min_amount_usd,
         )
-        
-        entities = [
-            {
-                "name": entity.name,
-                "type": entity.type,
-                "role": role.role,
-            }
-            for role, entity in entity_roles
-        ]
-        
-        # Get source document URL: from Mention->Document first, else from event attributes
-        from backend.models.events import Mention
-        from backend.models.documents import Document
-        mention = (
-            db.query(Mention)
-            .filter(Mention.event_id == ev.id)
-            .first()
+        return load_event_payloads(s, events), next_cursor
+
+    async def build():
+        try:
+            result, next_cursor = await db.run(load)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return result, headers
+
+    return await response_cache.respond(
+        request, db, route="events", scopes=(EVENTS, ENTITIES, DOCUMENTS), build=build
+    )
+
+
+@app.get("/events/export")
+def export_events(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: datetime | None = None,
+    after_id: int | None = None,
+):
+    """
+    Stream the full event ledger (roles, mentions, source URLs) ordered by
+    `(recorded_at, id)`. Resume an incremental sync by passing the last
+    record's `recorded_at` as `since` and its `id` as `after_id`.
+    """
+    if after_id is not None and since is None:
+        raise HTTPException(status_code=422, detail="after_id requires since")
+
+    def body():
+        # The stream outlives the request-scoped session, so it owns its own.
+        with SessionLocal() as db:
+            records = iter_event_export(db, since=since, after_id=after_id)
+            if format == "csv":
+                yield from csv_lines(records)
+            else:
+                yield from ndjson_lines(records)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"events.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/graph")
+async def get_graph(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    type: list[str] | None = Query(None),
+    entity_id: int | None = None,
+    hops: int = Query(1, ge=1, le=3),
+    max_edges: int = Query(2000, ge=1, le=20000),
+    events: bool = False,
+    db: AsyncDB = Depends(get_async_db),
+):
+    """
+    Entity graph aggregated from co-participation in events and recorded
+    relationships. Pass `entity_id` (with `hops`) for a neighbourhood view,
+    and `events=true` to link entities through event nodes instead
+    (entity↔event↔entity).
+    """
+    def load(s: Session):
+        if entity_id is not None and s.get(Entity, entity_id) is None:
+            return None
+        return query_graph(
+            s,
+            start=start,
+            end=end,
+            types=type,
+            entity_id=entity_id,
+            hops=hops,
+            max_edges=max_edges,
+            include_events=events,
         )
-        source_url = None
-        if mention:
-            doc = db.query(Document).filter(Document.id == mention.document_id).first()
-            if doc:
-                source_url = doc.url
-        if not source_url and ev.attributes:
-            try:
-                attrs = json.loads(ev.attributes)
-                source_url = attrs.get("source_url") or attrs.get("url")
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        item = {
-            "id": ev.id,
-            "type": ev.type,
-            "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
-            "recorded_at": ev.recorded_at.isoformat() if ev.recorded_at else None,
-            "attributes": ev.attributes,
-            "confidence": ev.confidence,
-            "entities": entities,
-            "source_url": source_url,
-        }
-        result.append(item)
-        # #region agent log (first event only)
-        if len(result) == 1:
-            try:
-                with open(Path("/home/xiongta/projects/AIscope/.cursor/debug.log"), "a") as f:
-                    import json as _j
-                    f.write(_j.dumps({"location": "main.py:list_events", "message": "first event payload", "data": {"id": item["id"], "keys": list(item.keys()), "has_attributes": item.get("attributes") is not None, "source_url": item.get("source_url")}, "timestamp": __import__("time").time() * 1000, "sessionId": "debug-session"}) + "\n")
-            except Exception:
-                pass
-        # #endregion
 
-    return result
+    graph = await db.run(load)
+    if graph is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return FastJSONResponse(graph)
+
+
+@app.get("/entities/typeahead")
+def entity_typeahead(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Ranked entity suggestions by name or alias (prefix first, then fuzzy)."""
+    index = get_entity_index(db, settings.entity_index_refresh_seconds)
+    return [
+        {
+            "id": hit.id,
+            "name": hit.name,
+            "type": hit.type,
+            "external_id": hit.external_id,
+            "matched": hit.matched,
+            "score": hit.score,
+        }
+        for hit in index.search(q, limit=limit)
+    ]
 
 
 class EntitySearchRequest(BaseModel):
@@ -184,60 +307,21 @@ class EntitySearchResponse(BaseModel):
     related_events: list[dict] | None = None  # Recent events involving this entity
 
 
-def _normalize(s: str) -> str:
-    return " ".join(s.strip().lower().split())
-
-
-_COMPANY_REGISTRY_CACHE: dict[str, dict] | None = None
-
-
-def _load_company_registry() -> dict[str, dict]:
-    """
-    Load `data/companies.yaml` and build a lookup map from normalized names/aliases -> record.
-    """
-    global _COMPANY_REGISTRY_CACHE
-    if _COMPANY_REGISTRY_CACHE is not None:
-        return _COMPANY_REGISTRY_CACHE
-
-    repo_root = Path(__file__).resolve().parents[1]
-    registry_path = repo_root / "data" / "companies.yaml"
-    if not registry_path.exists():
-        _COMPANY_REGISTRY_CACHE = {}
-        return _COMPANY_REGISTRY_CACHE
-
-    with registry_path.open("r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f) or {}
-
-    companies = raw.get("companies", []) or []
-    lookup: dict[str, dict] = {}
-    for rec in companies:
-        name = rec.get("name")
-        if not name:
-            continue
-        lookup[_normalize(name)] = rec
-        for alias in rec.get("aliases", []) or []:
-            if alias:
-                lookup[_normalize(alias)] = rec
-
-    _COMPANY_REGISTRY_CACHE = lookup
-    return lookup
-
-
 # Minimal curated people allowlist for search-add (extend as needed).
 _PEOPLE_ALLOWLIST: dict[str, dict] = {
-    _normalize("Sam Altman"): {
+    normalize_name("Sam Altman"): {
         "id": "sam_altman",
         "name": "Sam Altman",
         "type": "person",
         "aliases": ["Samuel Altman"],
     },
-    _normalize("Dario Amodei"): {"id": "dario_amodei", "name": "Dario Amodei", "type": "person", "aliases": []},
-    _normalize("Elon Musk"): {"id": "elon_musk", "name": "Elon Musk", "type": "person", "aliases": []},
-    _normalize("Demis Hassabis"): {"id": "demis_hassabis", "name": "Demis Hassabis", "type": "person", "aliases": []},
-    _normalize("Yann LeCun"): {"id": "yann_lecun", "name": "Yann LeCun", "type": "person", "aliases": ["Yann Lecun"]},
-    _normalize("Geoffrey Hinton"): {"id": "geoffrey_hinton", "name": "Geoffrey Hinton", "type": "person", "aliases": []},
-    _normalize("Ilya Sutskever"): {"id": "ilya_sutskever", "name": "Ilya Sutskever", "type": "person", "aliases": []},
-    _normalize("Andrew Ng"): {"id": "andrew_ng", "name": "Andrew Ng", "type": "person", "aliases": []},
+    normalize_name("Dario Amodei"): {"id": "dario_amodei", "name": "Dario Amodei", "type": "person", "aliases": []},
+    normalize_name("Elon Musk"): {"id": "elon_musk", "name": "Elon Musk", "type": "person", "aliases": []},
+    normalize_name("Demis Hassabis"): {"id": "demis_hassabis", "name": "Demis Hassabis", "type": "person", "aliases": []},
+    normalize_name("Yann LeCun"): {"id": "yann_lecun", "name": "Yann LeCun", "type": "person", "aliases": ["Yann Lecun"]},
+    normalize_name("Geoffrey Hinton"): {"id": "geoffrey_hinton", "name": "Geoffrey Hinton", "type": "person", "aliases": []},
+    normalize_name("Ilya Sutskever"): {"id": "ilya_sutskever", "name": "Ilya Sutskever", "type": "person", "aliases": []},
+    normalize_name("Andrew Ng"): {"id": "andrew_ng", "name": "Andrew Ng", "type": "person", "aliases": []},
 }
 
 
@@ -250,12 +334,12 @@ def search_and_add_entity(request: EntitySearchRequest, db: Session = Depends(ge
     This prevents polluting the graph with arbitrary user input.
     """
     query_raw = request.query.strip()
-    query = _normalize(query_raw)
+    query = normalize_name(query_raw)
     if not query:
         raise HTTPException(status_code=400, detail="Query must not be empty")
 
     # Check if entity already exists (by name or external_id)
-    company_registry = _load_company_registry()
+    company_registry = load_company_lookup()
     rec = company_registry.get(query)
     external_id = rec.get("id") if rec else None
     
@@ -265,200 +349,33 @@ def search_and_add_entity(request: EntitySearchRequest, db: Session = Depends(ge
         existing = db.query(Entity).filter(Entity.external_id == external_id).first()
     
     if not existing:
-        # Fallback to name search
-        existing = (
-            db.query(Entity)
-            .filter(Entity.name.ilike(f"%{query_raw.strip()}%"))
-            .first()
-        )
+        # Fallback to the ranked name/alias index; only accept name or word-prefix matches.
+        hits = get_entity_index(db, settings.entity_index_refresh_seconds).search(query_raw, limit=1)
+        if hits and hits[0].score >= 0.6:
+            existing = db.get(Entity, hits[0].id)
 
     if existing:
-        # Map database entity type to frontend type based on external_id
-        frontend_type = "ai_product_company"  # default
-        ext_id = existing.external_id or ""
-        if ext_id in ["aws", "azure", "databricks", "snowflake", "huggingface", "scale", "coreweave", "deepinfra"]:
-            frontend_type = "ai_infra_company"
-        elif ext_id in ["nvidia", "amd", "intel"]:
-            frontend_type = "chip_company"
-        elif existing.type == "person":
-            frontend_type = "individual"
-
-        # Query acquisition events (where this entity was acquired)
-        from backend.models.events import EventEntityRole, Mention
-        from backend.models.documents import Document
-        
-        acquisition_events = (
-            db.query(Event, EventEntityRole)
-            .join(EventEntityRole, EventEntityRole.event_id == Event.id)
-            .filter(EventEntityRole.entity_id == existing.id)
-            .filter(Event.type == "acquisition")
-            .filter(EventEntityRole.role.in_(["target", "acquired"]))
-            .order_by(Event.occurred_at.desc().nullslast())
-            .limit(5)
-            .all()
-        )
-        
-        acquisitions = []
-        for ev, role in acquisition_events:
-            # Find who acquired this entity
-            acquirer_roles = (
-                db.query(EventEntityRole, Entity)
-                .join(Entity, EventEntityRole.entity_id == Entity.id)
-                .filter(EventEntityRole.event_id == ev.id)
-                .filter(EventEntityRole.role.in_(["acquirer", "acquired_by"]))
-                .all()
-            )
-            
-            attrs = {}
-            if ev.attributes:
-                try:
-                    attrs = json.loads(ev.attributes)
-                except:
-                    pass
-            
-            for acq_role, acquirer_entity in acquirer_roles:
-                acquisitions.append({
-                    "acquired_by": acquirer_entity.name,
-                    "date": ev.occurred_at.isoformat() if ev.occurred_at else None,
-                    "amount_usd": attrs.get("amount_usd"),
-                })
-        
-        # Get recent events involving this entity
-        recent_events = (
-            db.query(Event, EventEntityRole)
-            .join(EventEntityRole, EventEntityRole.event_id == Event.id)
-            .filter(EventEntityRole.entity_id == existing.id)
-            .order_by(Event.occurred_at.desc().nullslast())
-            .limit(5)
-            .all()
-        )
-        
-        related_events = []
-        for ev, role in recent_events:
-            attrs = {}
-            if ev.attributes:
-                try:
-                    attrs = json.loads(ev.attributes)
-                except:
-                    pass
-            
-            related_events.append({
-                "type": ev.type,
-                "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
-                "summary": attrs.get("summary"),
-                "amount_usd": attrs.get("amount_usd"),
-            })
-
-        return EntitySearchResponse(
-            id=existing.external_id or f"db_{existing.id}",
-            name=existing.name,
-            type=frontend_type,
-            description=None,
-            founded=None,
-            founders=None,
-            acquisitions=acquisitions if acquisitions else None,
-            related_events=related_events if related_events else None,
-        )
+        return EntitySearchResponse(**build_entity_profile(db, existing))
 
     # Only allow adding if the entity matches a known registry entry.
     # (company_registry already loaded above)
-    rec = company_registry.get(query)
     if rec is not None:
-        entity_type = rec.get("type") or "company"
-        name = rec.get("name") or query_raw
-        external_id = rec.get("id")
         aliases = rec.get("aliases") or []
-
         new_entity = Entity(
-            name=name,
-            type=entity_type,
-            external_id=external_id,
+            name=rec.get("name") or query_raw,
+            type=rec.get("type") or "company",
+            external_id=rec.get("id"),
             aliases=json.dumps(aliases) if aliases else None,
         )
         db.add(new_entity)
+        bump_data_version(db, ENTITIES)
         db.commit()
         db.refresh(new_entity)
+        invalidate_entity_index()
+        response_cache.invalidate()
 
-        # Map entity type to frontend type based on ID patterns
-        frontend_type = "ai_product_company"  # default
-        if external_id in ["aws", "azure", "databricks", "snowflake", "huggingface", "scale", "coreweave", "deepinfra"]:
-            frontend_type = "ai_infra_company"
-        elif external_id in ["nvidia", "amd", "intel"]:
-            frontend_type = "chip_company"
-        elif entity_type == "person":
-            frontend_type = "individual"
-        
-        # Query for any existing events involving this new entity
-        acquisition_events = (
-            db.query(Event, EventEntityRole)
-            .join(EventEntityRole, EventEntityRole.event_id == Event.id)
-            .filter(EventEntityRole.entity_id == new_entity.id)
-            .filter(Event.type == "acquisition")
-            .filter(EventEntityRole.role.in_(["target", "acquired"]))
-            .order_by(Event.occurred_at.desc().nullslast())
-            .limit(5)
-            .all()
-        )
-        
-        acquisitions = []
-        for ev, role in acquisition_events:
-            acquirer_roles = (
-                db.query(EventEntityRole, Entity)
-                .join(Entity, EventEntityRole.entity_id == Entity.id)
-                .filter(EventEntityRole.event_id == ev.id)
-                .filter(EventEntityRole.role.in_(["acquirer", "acquired_by"]))
-                .all()
-            )
-            
-            attrs = {}
-            if ev.attributes:
-                try:
-                    attrs = json.loads(ev.attributes)
-                except:
-                    pass
-            
-            for acq_role, acquirer_entity in acquirer_roles:
-                acquisitions.append({
-                    "acquired_by": acquirer_entity.name,
-                    "date": ev.occurred_at.isoformat() if ev.occurred_at else None,
-                    "amount_usd": attrs.get("amount_usd"),
-                })
-        
-        recent_events = (
-            db.query(Event, EventEntityRole)
-            .join(EventEntityRole, EventEntityRole.event_id == Event.id)
-            .filter(EventEntityRole.entity_id == new_entity.id)
-            .order_by(Event.occurred_at.desc().nullslast())
-            .limit(5)
-            .all()
-        )
-        
-        related_events = []
-        for ev, role in recent_events:
-            attrs = {}
-            if ev.attributes:
-                try:
-                    attrs = json.loads(ev.attributes)
-                except:
-                    pass
-            
-            related_events.append({
-                "type": ev.type,
-                "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
-                "summary": attrs.get("summary"),
-                "amount_usd": attrs.get("amount_usd"),
-            })
-        
-        return EntitySearchResponse(
-            id=external_id or f"db_{new_entity.id}",
-            name=new_entity.name,
-            type=frontend_type,
-            description=None,
-            founded=None,
-            founders=None,
-            acquisitions=acquisitions if acquisitions else None,
-            related_events=related_events if related_events else None,
-        )
+        # Events extracted before the entity was added may already reference it.
+        return EntitySearchResponse(**build_entity_profile(db, new_entity))
 
     person_rec = _PEOPLE_ALLOWLIST.get(query)
     if person_rec is not None:
@@ -469,20 +386,30 @@ def search_and_add_entity(request: EntitySearchRequest, db: Session = Depends(ge
             aliases=json.dumps(person_rec.get("aliases") or []) if person_rec.get("aliases") else None,
         )
         db.add(new_entity)
+        bump_data_version(db, ENTITIES)
         db.commit()
         db.refresh(new_entity)
+        invalidate_entity_index()
+        response_cache.invalidate()
 
-        return EntitySearchResponse(
-            id=person_rec.get("id") or f"db_{new_entity.id}",
-            name=new_entity.name,
-            type="individual",
-            description=None,
-            founded=None,
-            founders=None,
-        )
+        return EntitySearchResponse(**build_entity_profile(db, new_entity))
 
     raise HTTPException(
         status_code=404,
         detail="Unknown entity. Add it to data/companies.yaml (or extend the people allowlist) to allow it.",
     )
 
+
+@app.get("/entities/{entity_id}/profile", response_model=EntitySearchResponse)
+async def entity_profile(entity_id: int, db: AsyncDB = Depends(get_async_db)):
+    """Acquisitions and recent events for an entity, as returned by `/entities/search`."""
+
+    def load(s: Session):
+        entity = s.get(Entity, entity_id)
+        return build_entity_profile(s, entity) if entity is not None else None
+
+    profile = await db.run(load)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return profile
+
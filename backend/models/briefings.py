@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, Text
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
@@ -17,4 +17,28 @@ class Briefing(Base):
     time_window_end: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     content_markdown: Mapped[str] = mapped_column(Text)
     raw_model_output: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Identifies the fragments the content was composed from; see daily_briefing.
+    compose_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
+
+
+class BriefingFragment(Base):
+    """
+    One-sentence summary of an event, reused by every briefing whose window
+    contains the event. Keyed by what determines the model output: event,
+    fragment prompt version and model id.
+    """
+
+    __tablename__ = "briefing_fragments"
+    __table_args__ = (
+        UniqueConstraint(
+            "event_id", "prompt_version", "model_id", name="uq_briefing_fragment_key"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
+    prompt_version: Mapped[str] = mapped_column(String(32))
+    model_id: Mapped[str] = mapped_column(String(256))
+    summary: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
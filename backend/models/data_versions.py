@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+# Scopes writers bump; cached API responses declare which ones they depend on.
+EVENTS = "events"
+ENTITIES = "entities"
+DOCUMENTS = "documents"
+BRIEFINGS = "briefings"
+
+
+class DataVersion(Base):
+    """
+    Monotonic change counter per data scope.
+
+    Writers increment the counter for what they touched in the same transaction
+    as the write, so every API process (and a shared cache) sees the change as
+    soon as it is committed.
+    """
+
+    __tablename__ = "data_versions"
+
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+def _increment(session, scope: str, now: datetime) -> bool:
+    result = session.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == scope)
+        .values(version=DataVersion.version + 1, updated_at=now)
+    )
+    return result.rowcount > 0
+
+
+def bump_data_version(session, *scopes: str) -> None:
+    """
+    Increment the data version of `scopes` in the caller's transaction.
+
+    Cached responses depending on a scope become unreachable once the write
+    commits; call this from every code path that changes the underlying rows.
+    """
+    now = datetime.utcnow()
+    for scope in scopes:
+        if _increment(session, scope, now):
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(insert(DataVersion).values(scope=scope, version=1, updated_at=now))
+        except IntegrityError:
+            # Another writer created the row first.
+            _increment(session, scope, now)
+
+
+def load_data_versions(session) -> dict[str, int]:
+    return dict(session.query(DataVersion.scope, DataVersion.version).all())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
@@ -20,3 +20,45 @@ class Document(Base):
     content: Mapped[str] = mapped_column(Text)
     content_hash: Mapped[str] = mapped_column(String(64), index=True)
 
+
+
+class FetchValidator(Base):
+    """
+    HTTP cache validators from the last fetch of a URL (feed or article), used to
+    issue conditional GETs so unchanged bodies are neither downloaded nor parsed.
+    """
+
+    __tablename__ = "fetch_validators"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    url: Mapped[str] = mapped_column(String(1024), unique=True, index=True)
+    etag: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    last_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_fetched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class DocumentProcessingState(Base):
+    """
+    Extraction work-queue entry for a document.
+
+    Status moves queued -> in_progress -> done, or back to queued on a retryable
+    failure and to failed once `attempts` reaches the configured maximum.
+    """
+
+    __tablename__ = "document_processing_states"
+    __table_args__ = (
+        # Claiming scans one status range in document order, or stale leases by claim time.
+        Index("ix_document_processing_status_document", "status", "document_id"),
+        Index("ix_document_processing_status_claimed", "status", "claimed_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), unique=True)
+    status: Mapped[str] = mapped_column(String(16))  # queued | in_progress | done | failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
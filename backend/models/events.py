@@ -1,24 +1,83 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String, Text, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableDict
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from backend.db.base import Base
 
 
+# Native JSON: JSONB on Postgres, JSON1 text on SQLite. SQL NULL rather than 'null'.
+JSONType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def promoted_attributes(attrs: Any) -> dict[str, Any]:
+    """
+    Hot attribute fields copied onto their own (indexed) `events` columns.
+
+    The ORM keeps them in sync on every flush. Core `insert()` / `update()`
+    statements that write `attributes` bypass the ORM and must set these
+    columns themselves from this function, as `_migrate_event_attributes` does.
+    """
+    if not isinstance(attrs, dict):
+        attrs = {}
+    amount = attrs.get("amount_usd")
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        amount = None
+    round_ = attrs.get("round")
+    summary = attrs.get("summary")
+    return {
+        "amount_usd": float(amount) if amount is not None else None,
+        "round": str(round_)[:64] if round_ is not None else None,
+        "summary": str(summary) if summary is not None else None,
+    }
+
+
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination for GET /events seeks on (occurred_at, id), optionally by type.
+        Index("ix_events_occurred_at_id", "occurred_at", "id"),
+        Index("ix_events_type_occurred_at_id", "type", "occurred_at", "id"),
+        Index("ix_events_type_amount_usd", "type", "amount_usd"),
+        # Ledger export streams and resumes on (recorded_at, id).
+        Index("ix_events_recorded_at_id", "recorded_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     type: Mapped[str] = mapped_column(String(64), index=True)
     occurred_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
-    attributes: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+    # Mutable so that in-place edits (`event.attributes["amount_usd"] = ...`) mark
+    # the event dirty and re-promote on flush.
+    attributes: Mapped[dict[str, Any] | None] = mapped_column(
+        MutableDict.as_mutable(JSONType), nullable=True
+    )
+    # Promoted from `attributes` on assignment and on flush; see `promoted_attributes`.
+    amount_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    round: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     confidence: Mapped[float | None] = mapped_column(nullable=True)
     # When AIscope first recorded this fact (append-only ledger timestamp)
     recorded_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
+    @validates("attributes")
+    def _promote_attributes(self, key: str, value: dict[str, Any] | None) -> dict[str, Any] | None:
+        for column, promoted in promoted_attributes(value).items():
+            setattr(self, column, promoted)
+        return value
+
+
+@event.listens_for(Event, "before_insert")
+@event.listens_for(Event, "before_update")
+def _promote_attributes_on_flush(mapper, connection, target: Event) -> None:
+    # In-place edits of `attributes` do not go through the validator above.
+    for column, promoted in promoted_attributes(target.attributes).items():
+        setattr(target, column, promoted)
+
 
 class Relationship(Base):
     __tablename__ = "relationships"
@@ -53,6 +112,7 @@ class EventEntityRole(Base):
     """
 
     __tablename__ = "event_entity_roles"
+    __table_args__ = (Index("ix_event_entity_roles_entity_event", "entity_id", "event_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
@@ -66,6 +126,11 @@ class EventNoveltyLabel(Base):
 
     This models a *fact about our interpretation* of an event at a given time,
     not mutable state on the event itself.
+
+    Older rows are kept when an event is relabelled, so an event can hold
+    several. The current label is the one whose `method` equals
+    `change_detection.NOVELTY_METHOD`; readers must filter on it. Rows with a
+    NULL method come from the original per-event heuristic and are history only.
     """
 
     __tablename__ = "event_novelty_labels"
@@ -73,5 +138,26 @@ class EventNoveltyLabel(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
     label: Mapped[str] = mapped_column(String(32), index=True)  # e.g. "new", "repeat", "update"
+    # Labelling method that produced the row; rows from an older method (or NULL,
+    # the original per-event heuristic) are recomputed.
+    method: Mapped[str | None] = mapped_column(String(32), nullable=True)
     computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
+
+
+class EventDuplicate(Base):
+    """
+    Maps an event onto the canonical event of the same story.
+
+    Deduplication never deletes ledger rows: a duplicate keeps its row and
+    roles, its mentions are re-pointed to the canonical event, and read paths
+    skip events listed here.
+    """
+
+    __tablename__ = "event_duplicates"
+
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), primary_key=True)
+    canonical_event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
+    similarity: Mapped[float] = mapped_column(Float)
+    method: Mapped[str] = mapped_column(String(32))
+    detected_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+class ExtractionCacheEntry(Base):
+    """
+    Validated `ExtractionResult` JSON for a piece of content, keyed by what
+    determines the model output: content hash, extraction prompt version and model id.
+    """
+
+    __tablename__ = "extraction_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "content_hash", "prompt_version", "model_id", name="uq_extraction_cache_key"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    content_hash: Mapped[str] = mapped_column(String(64), index=True)
+    prompt_version: Mapped[str] = mapped_column(String(32), index=True)
+    model_id: Mapped[str] = mapped_column(String(256))
+    result_json: Mapped[str] = mapped_column(Text)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+class GraphEdge(Base):
+    """
+    Materialized entity–entity adjacency derived from the event ledger.
+
+    One row per entity pair per event they co-participate in (via
+    `event_entity_roles`), plus one row per `relationships` record. The event
+    type and date are copied onto the row so `/graph` can filter by window and
+    type and aggregate weights/counts without touching `events`.
+
+    Pairs are stored once with `source_entity_id < target_entity_id`. The
+    entity–event half of the graph is `GraphEventEdge`.
+    """
+
+    __tablename__ = "graph_edges"
+    __table_args__ = (
+        Index("ix_graph_edges_source_occurred_at", "source_entity_id", "occurred_at"),
+        Index("ix_graph_edges_target_occurred_at", "target_entity_id", "occurred_at"),
+        Index("ix_graph_edges_type_occurred_at", "edge_type", "occurred_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source_entity_id: Mapped[int] = mapped_column(ForeignKey("entities.id"))
+    target_entity_id: Mapped[int] = mapped_column(ForeignKey("entities.id"))
+    event_id: Mapped[int | None] = mapped_column(ForeignKey("events.id"), nullable=True, index=True)
+    relationship_id: Mapped[int | None] = mapped_column(
+        ForeignKey("relationships.id"), nullable=True, index=True
+    )
+    edge_type: Mapped[str] = mapped_column(String(64))
+    occurred_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    weight: Mapped[float] = mapped_column(Float, default=1.0)
+
+
+class GraphEventEdge(Base):
+    """
+    Materialized entity–event incidence: one row per entity participating in a
+    canonical event (via `event_entity_roles`), with the role and the event's
+    type, date and confidence copied on, so `/graph?events=true` can draw
+    entity↔event↔entity paths filtered by window and type without touching
+    `events`.
+    """
+
+    __tablename__ = "graph_event_edges"
+    __table_args__ = (
+        Index("ix_graph_event_edges_entity_occurred_at", "entity_id", "occurred_at"),
+        Index("ix_graph_event_edges_type_occurred_at", "edge_type", "occurred_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity_id: Mapped[int] = mapped_column(ForeignKey("entities.id"))
+    event_id: Mapped[int] = mapped_column(ForeignKey("events.id"), index=True)
+    role: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    edge_type: Mapped[str] = mapped_column(String(64))
+    occurred_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    weight: Mapped[float] = mapped_column(Float, default=1.0)
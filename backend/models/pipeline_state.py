@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, insert, select, update
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+# Stages that resume from a watermark.
+DEDUPLICATION = "deduplication"
+
+
+class PipelineWatermark(Base):
+    """
+    How far a pipeline stage has processed the event ledger.
+
+    Saved in the same transaction as the stage's writes, so a restarted
+    scheduler resumes where the last committed run left off instead of
+    reprocessing the whole ledger.
+    """
+
+    __tablename__ = "pipeline_watermarks"
+
+    stage: Mapped[str] = mapped_column(String(32), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+def load_watermark(session, stage: str) -> datetime | None:
+    return session.scalar(
+        select(PipelineWatermark.watermark).where(PipelineWatermark.stage == stage)
+    )
+
+
+def save_watermark(session, stage: str, watermark: datetime) -> None:
+    """Record `watermark` for `stage` in the caller's transaction."""
+    now = datetime.utcnow()
+    result = session.execute(
+        update(PipelineWatermark)
+        .where(PipelineWatermark.stage == stage)
+        .values(watermark=watermark, updated_at=now)
+    )
+    if not result.rowcount:
+        session.execute(
+            insert(PipelineWatermark).values(stage=stage, watermark=watermark, updated_at=now)
+        )
@@ -1,80 +1,200 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
 from typing import Iterable
 
-from sqlalchemy import and_
+from sqlalchemy import and_, exists, func, insert
 
+from backend.core.metrics import instrument_stage
 from backend.db.base import SessionLocal
-from backend.models.events import Event, EventNoveltyLabel
+from backend.models.events import Event, EventEntityRole, EventNoveltyLabel
+from backend.queries.events import IS_CANONICAL_EVENT
 
 
-def _similar_events(session, event: Event, window_days: int = 7) -> Iterable[Event]:
+# Bump when the labelling rules change; events labelled by another method are relabelled.
+NOVELTY_METHOD = "sweep-v1"
+
+# Entity-set Jaccard similarity at which a same-type event counts as the same story.
+REPEAT_MIN_OVERLAP = 0.5
+
+
+@dataclass(frozen=True)
+class NoveltyItem:
+    id: int
+    type: str
+    occurred_at: datetime
+    recorded_at: datetime
+    entity_ids: frozenset[int]
+
+
+def _overlap(a: frozenset[int], b: frozenset[int]) -> float:
+    return len(a & b) / len(a | b)
+
+
+def compute_novelty_labels(
+    items: Iterable[NoveltyItem], target_ids: set[int], window: timedelta
+) -> dict[int, str]:
     """
-    Find events of the same type that occurred in a time window around the given event.
-    This is a pure query over the event ledger; it does not mutate any state.
+    Label each event in `target_ids` against the events recorded before it:
+
+    - "repeat": an earlier event of the same type within `window` (by
+      `occurred_at`) shares at least `REPEAT_MIN_OVERLAP` of its entities --
+      the same story reported again;
+    - "update": such an event shares some entities, but less -- a development
+      in a story we already have;
+    - "new": otherwise, including events without resolved entities.
+
+    Only earlier-recorded events count, so a label does not change when later
+    reports arrive. `items` must cover `window` on both sides of every target.
+
+    Items are sorted by `(type, occurred_at)` and swept with two pointers per
+    type, keeping an entity -> events index of the current window, so each
+    target only compares against events it shares an entity with: O(N log N)
+    plus the number of overlapping pairs.
     """
-    if not event.occurred_at:
-        return []
-    start = event.occurred_at - timedelta(days=window_days)
-    end = event.occurred_at + timedelta(days=window_days)
-    return (
-        session.query(Event)
-        .filter(Event.id != event.id)
-        .filter(Event.type == event.type)
+    labels: dict[int, str] = {}
+    ordered = sorted(items, key=lambda it: (it.type, it.occurred_at, it.id))
+    for _, group_iter in groupby(ordered, key=attrgetter("type")):
+        group = list(group_iter)
+        in_window: dict[int, set[int]] = defaultdict(set)
+        lo = hi = 0
+        for i, item in enumerate(group):
+            while hi < len(group) and group[hi].occurred_at <= item.occurred_at + window:
+                for entity_id in group[hi].entity_ids:
+                    in_window[entity_id].add(hi)
+                hi += 1
+            while group[lo].occurred_at < item.occurred_at - window:
+                for entity_id in group[lo].entity_ids:
+                    positions = in_window[entity_id]
+                    positions.discard(lo)
+                    if not positions:
+                        del in_window[entity_id]
+                lo += 1
+            if item.id not in target_ids:
+                continue
+
+            candidates: set[int] = set()
+            for entity_id in item.entity_ids:
+                candidates |= in_window.get(entity_id, set())
+            best = 0.0
+            for j in candidates:
+                other = group[j]
+                if (other.recorded_at, other.id) < (item.recorded_at, item.id):
+                    best = max(best, _overlap(item.entity_ids, other.entity_ids))
+            if best >= REPEAT_MIN_OVERLAP:
+                labels[item.id] = "repeat"
+            elif best > 0:
+                labels[item.id] = "update"
+            else:
+                labels[item.id] = "new"
+    return labels
+
+
+def _load_items(session, types: set[str], start: datetime, end: datetime) -> list[NoveltyItem]:
+    """
+    Canonical events of `types` occurring in [start, end], with their entity
+    ids, in one query. Merged duplicates are left out so that they do not count
+    as earlier reports of their own canonical event.
+    """
+    rows = (
+        session.query(
+            Event.id, Event.type, Event.occurred_at, Event.recorded_at, EventEntityRole.entity_id
+        )
+        .outerjoin(EventEntityRole, EventEntityRole.event_id == Event.id)
+        .filter(Event.type.in_(types))
+        .filter(IS_CANONICAL_EVENT)
         .filter(Event.occurred_at >= start)
         .filter(Event.occurred_at <= end)
         .all()
     )
+    fields: dict[int, tuple[str, datetime, datetime]] = {}
+    entities: dict[int, set[int]] = defaultdict(set)
+    for event_id, event_type, occurred_at, recorded_at, entity_id in rows:
+        fields[event_id] = (event_type, occurred_at, recorded_at)
+        if entity_id is not None:
+            entities[event_id].add(entity_id)
+    return [
+        NoveltyItem(event_id, event_type, occurred_at, recorded_at, frozenset(entities[event_id]))
+        for event_id, (event_type, occurred_at, recorded_at) in fields.items()
+    ]
+
+
+def _unlabelled():
+    return ~exists().where(
+        and_(
+            EventNoveltyLabel.event_id == Event.id,
+            EventNoveltyLabel.method == NOVELTY_METHOD,
+        )
+    )
+
+
+def unlabelled_event_count(session) -> int:
+    """Canonical events that do not have a `NOVELTY_METHOD` label yet."""
+    return (
+        session.query(func.count(Event.id)).filter(IS_CANONICAL_EVENT).filter(_unlabelled()).scalar()
+        or 0
+    )
 
 
-def _compute_novelty_label(session, event: Event) -> str:
+def label_novelty(session, limit: int = 100, window_days: int = 7) -> int:
     """
-    Basic novelty heuristic:
+    Add `NOVELTY_METHOD` labels for the `limit` most recently recorded
+    canonical events that do not have one yet (merged duplicates are not
+    labelled). Returns the number of labels added; the caller commits.
 
-    - If there are no similar events in the window -> \"new\"
-    - If there is an earlier event of the same type in the window -> \"repeat\"
-    - Otherwise -> \"update\"
+    The time span around the selected events is loaded once and labelled by
+    `compute_novelty_labels`, instead of one window query per event.
     """
-    similars = _similar_events(session, event)
-    if not similars:
-        return "new"
+    window = timedelta(days=window_days)
+    targets = (
+        session.query(Event.id, Event.type, Event.occurred_at)
+        .filter(IS_CANONICAL_EVENT)
+        .filter(_unlabelled())
+        .order_by(Event.recorded_at.desc())
+        .limit(limit)
+        .all()
+    )
+    dated = [t for t in targets if t.occurred_at is not None]
+    labels = {t.id: "new" for t in targets if t.occurred_at is None}
+    if dated:
+        items = _load_items(
+            session,
+            {t.type for t in dated},
+            min(t.occurred_at for t in dated) - window,
+            max(t.occurred_at for t in dated) + window,
+        )
+        labels.update(compute_novelty_labels(items, {t.id for t in dated}, window))
 
-    earlier = [s for s in similars if s.recorded_at < event.recorded_at]
-    return "repeat" if earlier else "update"
+    if labels:
+        now = datetime.utcnow()
+        session.execute(
+            insert(EventNoveltyLabel),
+            [
+                {"event_id": event_id, "label": label, "method": NOVELTY_METHOD, "computed_at": now}
+                for event_id, label in labels.items()
+            ],
+        )
+    return len(labels)
 
 
+@instrument_stage("novelty")
 def label_novelty_for_recent_events(limit: int = 100) -> int:
     """
     Append novelty labels for recent events.
 
     This does NOT mutate the Event rows themselves. Instead, it records
     our interpretation as separate, time-stamped facts in EventNoveltyLabel.
+    Events that already carry a current label are skipped, so repeated runs
+    do not append duplicates.
     """
     session = SessionLocal()
-    created_labels = 0
     try:
-        events = (
-            session.query(Event)
-            .order_by(Event.recorded_at.desc())
-            .limit(limit)
-            .all()
-        )
-
-        now = datetime.utcnow()
-
-        for ev in events:
-            label = _compute_novelty_label(session, ev)
-            novelty = EventNoveltyLabel(
-                event_id=ev.id,
-                label=label,
-                computed_at=now,
-            )
-            session.add(novelty)
-            created_labels += 1
-
+        created_labels = label_novelty(session, limit)
         session.commit()
         return created_labels
     finally:
         session.close()
-
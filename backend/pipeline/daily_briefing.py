@@ -1,33 +1,420 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import math
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from textwrap import dedent
+from typing import Any, Callable, Sequence
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func, insert
 
+from backend.core.config import settings
+from backend.core.metrics import instrument_stage
 from backend.db.base import SessionLocal
 from backend.llm.bedrock_client import BedrockClient
-from backend.models.briefings import Briefing
-from backend.models.events import Event
+from backend.models.briefings import Briefing, BriefingFragment
+from backend.models.data_versions import BRIEFINGS, bump_data_version
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole, Mention
+from backend.queries.events import IS_CANONICAL_EVENT
 
 
-SUMMARY_PROMPT_TEMPLATE = dedent(
+logger = logging.getLogger(__name__)
+
+
+# Summarizes events that have no fragment yet, one sentence per event. Editing
+# the prompt changes FRAGMENT_PROMPT_VERSION, which retires every stored fragment.
+FRAGMENT_PROMPT_TEMPLATE = dedent(
+    """
+    You are summarizing events for a daily briefing about the AI startup ecosystem.
+
+    For each event below, write one sentence saying what happened, which
+    companies were involved and why it matters.
+
+    Events are grouped under "## company / type" headings, one per line:
+    [id] date | entities (role) | amount round | summary | sources
+
+    EVENTS:
+    {events}
+
+    Respond with JSON mapping every event id to its sentence:
+    {{"fragments": {{"<id>": "<sentence>", ...}}}}
+    """
+)
+
+FRAGMENT_PROMPT_VERSION = hashlib.sha256(FRAGMENT_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:16]
+
+# Composes the briefing from the stored fragments of the window's events.
+COMPOSE_PROMPT_TEMPLATE = dedent(
     """
     You are generating a concise daily briefing about developments in the AI startup ecosystem.
 
-    Given the following structured events, write 5-10 bullet points in Markdown.
-    Each bullet should:
-      - Describe what happened.
+    Below are one-sentence summaries of the day's events, grouped under
+    "## company / type" headings, most significant first. Write 5-10 bullet
+    points in Markdown. Each bullet should:
+      - Describe what happened, combining events about the same story.
       - Explain briefly why it matters in system-level terms (trajectory, strategy, ecosystem impact).
       - Mention the companies involved.
+    {omitted_note}
+    EVENT SUMMARIES:
+    {fragments}
 
-    EVENTS (JSON):
-    {events_json}
+    Respond with JSON: {{"briefing_markdown": "<markdown>"}}
     """
 )
 
+COMPOSE_PROMPT_VERSION = hashlib.sha256(COMPOSE_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:16]
+
+# Relative weight of event types when ranking what makes the briefing.
+_TYPE_WEIGHTS = {"acquisition": 1.5, "funding": 1.2, "ipo": 1.5, "partnership": 1.0}
+_PRIMARY_ROLES = ("company", "acquirer", "target")
+_SUMMARY_CHARS = 280
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for budgeting prompts."""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class BriefingEvent:
+    id: int
+    type: str
+    occurred_at: datetime | None
+    confidence: float | None
+    amount_usd: float | None
+    round: str | None
+    summary: str | None
+    sources: int = 0
+    entities: list[tuple[str, str | None]] = field(default_factory=list)
+
+    @property
+    def score(self) -> float:
+        amount = math.log10(1 + (self.amount_usd or 0) / 1e6)
+        return (
+            (self.confidence if self.confidence is not None else 0.5)
+            * _TYPE_WEIGHTS.get(self.type, 1.0)
+            * (1 + amount)
+            * (1 + math.log2(max(self.sources, 1)))
+        )
+
+    @property
+    def group(self) -> tuple[str, str]:
+        primary = next((name for name, role in self.entities if role in _PRIMARY_ROLES), None)
+        if primary is None and self.entities:
+            primary = self.entities[0][0]
+        return primary or "Other", self.type
+
+    def line(self) -> str:
+        date = self.occurred_at.date().isoformat() if self.occurred_at else "undated"
+        entities = ", ".join(f"{name} ({role})" if role else name for name, role in self.entities)
+        money = ""
+        if self.amount_usd:
+            money = _format_amount(self.amount_usd)
+        if self.round:
+            money = f"{money} {self.round}".strip()
+        summary = (self.summary or "").replace("\n", " ")
+        if len(summary) > _SUMMARY_CHARS:
+            summary = summary[: _SUMMARY_CHARS - 1] + "…"
+        return f"[{self.id}] {date} | {entities} | {money} | {summary} | {self.sources}"
+
+
+def _format_amount(amount: float) -> str:
+    for scale, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if amount >= scale:
+            return f"${amount / scale:.3g}{suffix}"
+    return f"${amount:.0f}"
+
+
+def load_briefing_events(
+    session, window_start: datetime, window_end: datetime
+) -> list[BriefingEvent]:
+    """
+    Canonical events recorded in the window with entity names and source
+    counts, in three set-based queries.
+    """
+    in_window = and_(Event.recorded_at >= window_start, Event.recorded_at <= window_end)
+    events = {
+        row.id: BriefingEvent(
+            id=row.id,
+            type=row.type,
+            occurred_at=row.occurred_at,
+            confidence=row.confidence,
+            amount_usd=row.amount_usd,
+            round=row.round,
+            summary=row.summary,
+        )
+        for row in session.query(
+            Event.id,
+            Event.type,
+            Event.occurred_at,
+            Event.confidence,
+            Event.amount_usd,
+            Event.round,
+            Event.summary,
+        )
+        .filter(in_window)
+        .filter(IS_CANONICAL_EVENT)
+    }
+    if not events:
+        return []
+
+    roles = (
+        session.query(EventEntityRole.event_id, Entity.name, EventEntityRole.role)
+        .join(Entity, Entity.id == EventEntityRole.entity_id)
+        .join(Event, Event.id == EventEntityRole.event_id)
+        .filter(in_window)
+        .order_by(EventEntityRole.id)
+    )
+    for event_id, name, role in roles:
+        if event_id in events:
+            events[event_id].entities.append((name, role))
+
+    sources = (
+        session.query(Mention.event_id, func.count(func.distinct(Mention.document_id)))
+        .join(Event, Event.id == Mention.event_id)
+        .filter(in_window)
+        .group_by(Mention.event_id)
+    )
+    for event_id, count in sources:
+        if event_id in events:
+            events[event_id].sources = count
+    return list(events.values())
+
+
+def rank_events(events: Sequence[BriefingEvent], max_events: int) -> list[BriefingEvent]:
+    """The `max_events` highest-ranked events, best first."""
+    return sorted(events, key=lambda ev: (-ev.score, ev.id))[:max_events]
+
+
+def group_lines(
+    ranked: Sequence[BriefingEvent], line: Callable[[BriefingEvent], str | None]
+) -> list[list[str]]:
+    """
+    Group ranked events by (company, type). Each group is a heading followed
+    by `line(event)` for its events; groups come in order of their best
+    event, events within a group by rank. Events whose line is None are left out.
+    """
+    groups: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for ev in ranked:
+        text = line(ev)
+        if text is not None:
+            groups[ev.group].append(text)
+    return [
+        [f"## {company} / {event_type}"] + lines
+        for (company, event_type), lines in groups.items()
+    ]
+
+
+def pack_chunks(groups: Sequence[Sequence[str]], token_budget: int) -> list[str]:
+    """
+    Greedily pack groups of lines into chunks of at most `token_budget`
+    estimated tokens, keeping a group together when it fits. A group larger
+    than the budget is split across chunks, repeating its heading.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    used = 0
+
+    def flush() -> None:
+        nonlocal current, used
+        if current:
+            chunks.append("\n".join(current))
+        current, used = [], 0
+
+    for group in groups:
+        heading, lines = group[0], list(group[1:])
+        group_tokens = sum(estimate_tokens(line) for line in group)
+        if used and used + group_tokens > token_budget:
+            flush()
+        current.append(heading)
+        used += estimate_tokens(heading)
+        for line in lines:
+            tokens = estimate_tokens(line)
+            if used + tokens > token_budget and len(current) > 1:
+                flush()
+                current.append(heading)
+                used += estimate_tokens(heading)
+            current.append(line)
+            used += tokens
+    flush()
+    return chunks
+
+
+def _markdown(raw: dict[str, Any]) -> str:
+    content = raw.get("briefing_markdown")
+    if not content and "text" in raw:
+        content = raw["text"]
+    if not content:
+        # As a fallback, treat the entire JSON as a string
+        content = json.dumps(raw, indent=2)
+    return content
 
-def generate_daily_briefing(hours: int = 24) -> Briefing | None:
+
+def _fragments(raw: dict[str, Any], event_ids: set[int]) -> dict[int, str]:
+    """Sentences from a fragment response, for the requested events only."""
+    parsed = raw.get("fragments")
+    if not isinstance(parsed, dict):
+        return {}
+    fragments: dict[int, str] = {}
+    for key, sentence in parsed.items():
+        try:
+            event_id = int(str(key).strip("[] "))
+        except ValueError:
+            continue
+        if event_id in event_ids and isinstance(sentence, str) and sentence.strip():
+            fragments[event_id] = " ".join(sentence.split())
+    return fragments
+
+
+def _fallback_fragment(ev: BriefingEvent) -> str:
+    """Stand-in for an event the model left out of its response: its own summary."""
+    names = ", ".join(name for name, _ in ev.entities) or "Unknown"
+    summary = " ".join((ev.summary or ev.type).split())
+    return f"{names}: {summary}"
+
+
+def _omitted_note(omitted: int) -> str:
+    return f"\n({omitted} lower-ranked events were left out to bound the briefing.)\n" if omitted else ""
+
+
+class _Summarizer:
+    """Model calls, fanned out on a bounded thread pool; the client applies the rate limit."""
+
+    def __init__(self, client, workers: int) -> None:
+        self.client = client
+        self.workers = max(1, workers)
+        self.calls: list[dict[str, Any]] = []
+
+    def _call(self, prompt: str, max_tokens: int) -> dict[str, Any]:
+        raw = self.client.invoke_json(prompt, max_tokens=max_tokens)
+        self.calls.append({"prompt_tokens": estimate_tokens(prompt), "output": raw})
+        return raw
+
+    def map(self, requests: Sequence[tuple[str, int]]) -> list[dict[str, Any] | None]:
+        """Responses to (prompt, max_tokens) requests in order; failed calls are logged as None."""
+
+        def run(request: tuple[str, int]) -> dict[str, Any] | None:
+            try:
+                return self._call(*request)
+            except Exception as exc:  # one bad chunk should not sink the briefing
+                logger.warning("Briefing chunk failed: %s", exc)
+                return None
+
+        if not requests:
+            return []
+        with ThreadPoolExecutor(
+            max_workers=min(self.workers, len(requests)), thread_name_prefix="briefing"
+        ) as pool:
+            return list(pool.map(run, requests))
+
+    def one(self, prompt: str, max_tokens: int) -> dict[str, Any]:
+        return self._call(prompt, max_tokens)
+
+
+def summarize_fragments(
+    events: Sequence[BriefingEvent], summarizer: _Summarizer
+) -> dict[int, str]:
+    """
+    One sentence per event. Events are grouped and packed into prompts of
+    `briefing_chunk_tokens`, summarized concurrently. Events of a failed
+    chunk are absent from the result (and retried by the next run); events a
+    response leaves out get `_fallback_fragment`, so they are not asked for
+    again on every run.
+    """
+    by_id = {ev.id: ev for ev in events}
+    requests = []
+    chunk_ids = []
+    for chunk in pack_chunks(group_lines(events, BriefingEvent.line), settings.briefing_chunk_tokens):
+        ids = {int(line[1 : line.index("]")]) for line in chunk.splitlines() if line.startswith("[")}
+        chunk_ids.append(ids)
+        requests.append(
+            (
+                FRAGMENT_PROMPT_TEMPLATE.format(events=chunk),
+                settings.briefing_fragment_max_tokens * len(ids),
+            )
+        )
+    fragments: dict[int, str] = {}
+    for ids, raw in zip(chunk_ids, summarizer.map(requests)):
+        if raw is None:
+            continue
+        answered = _fragments(raw, ids)
+        for event_id in ids:
+            fragments[event_id] = answered.get(event_id) or _fallback_fragment(by_id[event_id])
+    return fragments
+
+
+def compose_prompt(
+    ranked: Sequence[BriefingEvent], fragments: dict[int, str], omitted: int
+) -> tuple[str, list[int]]:
+    """
+    The compose prompt - fragments of the ranked events, grouped, truncated to
+    `briefing_compose_tokens` - and the ids of the events it includes.
+    """
+    groups = group_lines(
+        ranked, lambda ev: f"[{ev.id}] {fragments[ev.id]}" if ev.id in fragments else None
+    )
+    chunk = pack_chunks(groups, settings.briefing_compose_tokens)[0]
+    included = [
+        int(line[1 : line.index("]")]) for line in chunk.splitlines() if line.startswith("[")
+    ]
+    omitted += sum(1 for ev in ranked if ev.id in fragments) - len(included)
+    prompt = COMPOSE_PROMPT_TEMPLATE.format(fragments=chunk, omitted_note=_omitted_note(omitted))
+    return prompt, included
+
+
+def _load_fragments(session, event_ids: Sequence[int], model_id: str) -> dict[int, str]:
+    if not event_ids:
+        return {}
+    rows = session.query(BriefingFragment.event_id, BriefingFragment.summary).filter(
+        BriefingFragment.event_id.in_(event_ids),
+        BriefingFragment.prompt_version == FRAGMENT_PROMPT_VERSION,
+        BriefingFragment.model_id == model_id,
+    )
+    return dict(rows.all())
+
+
+def compose_key(event_ids: Sequence[int], model_id: str) -> str:
+    """
+    Identifies a composed briefing by the set of fragments it was composed
+    from (event ids under this model and the fragment and compose prompt
+    versions). A briefing with the same key can be reused as is.
+    """
+    fragment_keys = ",".join(str(event_id) for event_id in sorted(event_ids))
+    key = f"{model_id}\n{FRAGMENT_PROMPT_VERSION}\n{COMPOSE_PROMPT_VERSION}\n{fragment_keys}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def pending_event_count(session) -> int:
+    """Canonical events recorded since the latest briefing's window ended."""
+    since = session.query(func.max(Briefing.time_window_end)).scalar()
+    query = session.query(func.count(Event.id)).filter(IS_CANONICAL_EVENT)
+    if since is not None:
+        query = query.filter(Event.recorded_at > since)
+    return query.scalar() or 0
+
+
+@instrument_stage("briefing")
+def generate_daily_briefing(hours: int = 24, client=None) -> Briefing | None:
+    """
+    Generate a briefing over the last `hours`, incrementally.
+
+    Every briefing is composed from per-event fragments (one sentence each)
+    stored in `briefing_fragments`. A run only asks the model for fragments
+    of ranked events that have none yet for this model and prompt version -
+    on a regular schedule, the events recorded since the previous briefing's
+    `time_window_end` - so a run with no new events makes no fragment calls.
+    The compose call is made only when the set of fragments to compose
+    (`compose_key`) differs from the latest briefing's; otherwise that
+    briefing's content is reused.
+    """
+    client = client or BedrockClient()
+    model_id = getattr(client, "model_id", "unknown")
     session = SessionLocal()
     try:
         window_end = datetime.utcnow()
@@ -36,57 +423,72 @@ def generate_daily_briefing(hours: int = 24) -> Briefing | None:
         # Select events recorded in the given time window.
         # We do not rely on any mutable status field; the briefing is a
         # derived view over the immutable event ledger.
-        events = (
-            session.query(Event)
-            .filter(
-                and_(
-                    Event.recorded_at >= window_start,
-                    Event.recorded_at <= window_end,
-                )
-            )
-            .all()
-        )
+        events = load_briefing_events(session, window_start, window_end)
         if not events:
             return None
 
-        serializable_events = [
-            {
-                "id": ev.id,
-                "type": ev.type,
-                "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
-                "attributes": ev.attributes,
-                "confidence": ev.confidence,
-            }
-            for ev in events
-        ]
-
-        import json
-
-        prompt = SUMMARY_PROMPT_TEMPLATE.format(
-            events_json=json.dumps(serializable_events, indent=2)
-        )
+        ranked = rank_events(events, settings.briefing_max_events)
+        omitted = len(events) - len(ranked)
+        fragments = _load_fragments(session, [ev.id for ev in ranked], model_id)
+        summarizer = _Summarizer(client, settings.briefing_workers)
 
-        client = BedrockClient()
-        raw_json = client.invoke_json(prompt, max_tokens=1024)
+        missing = [ev for ev in ranked if ev.id not in fragments]
+        created: dict[int, str] = {}
+        if missing:
+            created = summarize_fragments(missing, summarizer)
+            if created:
+                # Committed on their own so that a failed compose call does
+                # not cost the next run these fragments.
+                session.execute(
+                    insert(BriefingFragment),
+                    [
+                        {
+                            "event_id": event_id,
+                            "prompt_version": FRAGMENT_PROMPT_VERSION,
+                            "model_id": model_id,
+                            "summary": summary,
+                            "created_at": window_end,
+                        }
+                        for event_id, summary in created.items()
+                    ],
+                )
+                session.commit()
+                fragments.update(created)
+        if not fragments:
+            raise RuntimeError("No briefing fragments could be generated")
 
-        content_markdown = raw_json.get("briefing_markdown")
-        if not content_markdown and "text" in raw_json:
-            content_markdown = raw_json["text"]
-        if not content_markdown:
-            # As a fallback, treat the entire JSON as a string
-            content_markdown = json.dumps(raw_json, indent=2)
+        prompt, included = compose_prompt(ranked, fragments, omitted)
+        key = compose_key(included, model_id)
+        latest = session.query(Briefing).order_by(Briefing.generated_at.desc()).first()
+        if latest is not None and latest.compose_key == key:
+            content_markdown, raw_model_output = latest.content_markdown, latest.raw_model_output
+        else:
+            raw = summarizer.one(prompt, settings.briefing_max_tokens)
+            content_markdown, raw_model_output = _markdown(raw), json.dumps(raw)
+        logger.info(
+            "Briefing over %d events: %d new fragments, %d model calls (%d prompt tokens)",
+            len(ranked),
+            len(created),
+            len(summarizer.calls),
+            sum(call["prompt_tokens"] for call in summarizer.calls),
+        )
 
         briefing = Briefing(
             generated_at=window_end,
             time_window_start=window_start,
             time_window_end=window_end,
             content_markdown=content_markdown,
-            raw_model_output=json.dumps(raw_json),
+            raw_model_output=raw_model_output,
+            compose_key=key,
         )
         session.add(briefing)
+        retention = timedelta(days=settings.briefing_fragment_retention_days)
+        session.query(BriefingFragment).filter(
+            BriefingFragment.created_at < window_end - retention
+        ).delete(synchronize_session=False)
+        bump_data_version(session, BRIEFINGS)
         session.commit()
         session.refresh(briefing)
         return briefing
     finally:
         session.close()
-
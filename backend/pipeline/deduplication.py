@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, exists, insert, or_
+
+from backend.core.metrics import instrument_stage
+from backend.models.data_versions import EVENTS, bump_data_version
+from backend.models.events import Event, EventDuplicate, EventEntityRole, Mention
+from backend.pipeline.graph_edges import refresh_event_edges
+
+
+DEDUP_METHOD = "minhash-v1"
+
+# 64 MinHash values in 32 bands of 2 rows: pairs with Jaccard similarity 0.4
+# share a bucket with probability ~0.99, at 0.3 ~0.95.
+NUM_PERM = 64
+BANDS = 32
+# Estimated feature-set similarity at which two events of the same type are the
+# same story; outlets reword summaries, so entities and amounts carry most of it.
+MIN_SIMILARITY = 0.4
+# Reports of one story are dated within this window of each other.
+WINDOW = timedelta(days=14)
+# Relative difference allowed between reported amounts ($100M vs $105M).
+AMOUNT_TOLERANCE = 0.1
+# Buckets larger than this (boilerplate summaries) only pair up neighbours in id order.
+MAX_BUCKET_SIZE = 64
+
+_MERSENNE_PRIME = (1 << 31) - 1
+# Keep IN lists well below SQLite's bound-parameter limit.
+_EDGE_REFRESH_CHUNK = 500
+# Candidate pairs compared per numpy batch.
+_VERIFY_CHUNK = 1 << 16
+_STOPWORDS = frozenset(
+    "the and for with from that this its has have was were will into over after new "
+    "said says announced announces company startup round".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class DedupItem:
+    id: int
+    type: str
+    occurred_at: datetime | None
+    recorded_at: datetime
+    amount_usd: float | None
+    round: str | None
+    summary: str | None
+    entity_ids: tuple[int, ...]
+
+
+def event_features(item: DedupItem) -> set[str]:
+    """
+    Shingles MinHash compares: summary words, entities and amount bucket.
+
+    Entities and the amount are added twice, so they weigh more than any one
+    word of a summary that each outlet phrases differently.
+    """
+    features = {f"t:{item.type}"}
+    if item.summary:
+        features.update(
+            f"w:{token}"
+            for token in _TOKEN_RE.findall(item.summary.lower())
+            if len(token) > 2 and token not in _STOPWORDS
+        )
+    for entity_id in item.entity_ids:
+        features.update((f"e:{entity_id}", f"e:{entity_id}#2"))
+    if item.amount_usd:
+        bucket = round(math.log(item.amount_usd, 1 + AMOUNT_TOLERANCE))
+        features.update((f"a:{bucket}", f"a:{bucket}#2"))
+    if item.round:
+        features.add(f"r:{item.round.strip().lower()}")
+    return features
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with banded locality-sensitive hashing, on numpy.
+
+    Candidate pairs come from sharing all rows of at least one band, so the
+    cost is linear in the number of events (plus candidates), not quadratic.
+    """
+
+    def __init__(
+        self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1, chunk_size: int = 4096
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.chunk_size = chunk_size
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._band_weights = rng.integers(1, 1 << 61, size=self.rows, dtype=np.uint64)
+        self._feature_hashes: dict[str, int] = {}
+
+    def _hash(self, feature: str) -> int:
+        value = self._feature_hashes.get(feature)
+        if value is None:
+            value = zlib.crc32(feature.encode("utf-8")) & _MERSENNE_PRIME
+            self._feature_hashes[feature] = value
+        return value
+
+    def signatures(self, feature_sets: Sequence[Iterable[str]]) -> np.ndarray:
+        """One row of `num_perm` MinHash values (uint32) per non-empty feature set."""
+        out = np.empty((len(feature_sets), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(feature_sets), self.chunk_size):
+            chunk = feature_sets[start : start + self.chunk_size]
+            hashes = [[self._hash(f) for f in features] for features in chunk]
+            offsets = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+            flat = np.fromiter((v for h in hashes for v in h), dtype=np.uint64)
+            # (a * x + b) mod p stays below 2**63 for x, a, b < 2**31.
+            permuted = (self._a * flat + self._b) % _MERSENNE_PRIME
+            out[start : start + len(chunk)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return out
+
+    def candidate_pairs(
+        self, signatures: np.ndarray, blocks: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Index arrays `(i, j)`, `i < j`, of rows that share a band bucket and a
+        block (event type code), without repeats. Buckets larger than
+        `MAX_BUCKET_SIZE` only pair each row with its neighbour.
+        """
+        block_keys = blocks.astype(np.uint64) << np.uint64(56)
+        found = []
+        for band in range(self.bands):
+            rows = signatures[:, band * self.rows : (band + 1) * self.rows].astype(np.uint64)
+            keys = (rows * self._band_weights).sum(axis=1, dtype=np.uint64) ^ block_keys
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            run_ids = np.cumsum(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            run_sizes = np.bincount(run_ids)
+            # Pair positions k apart in sorted order that fall in the same bucket.
+            for k in range(1, MAX_BUCKET_SIZE):
+                same = run_ids[:-k] == run_ids[k:]
+                if k > 1:
+                    same &= run_sizes[run_ids[:-k]] <= MAX_BUCKET_SIZE
+                if not same.any():
+                    break
+                left, right = order[:-k][same], order[k:][same]
+                found.append(np.minimum(left, right) * len(keys) + np.maximum(left, right))
+        if not found:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        pairs = np.unique(np.concatenate(found))
+        return pairs // len(signatures), pairs % len(signatures)
+
+
+def _compatible(a: DedupItem, b: DedupItem, window: timedelta) -> bool:
+    if a.occurred_at is not None and b.occurred_at is not None:
+        if abs(a.occurred_at - b.occurred_at) > window:
+            return False
+    if a.amount_usd and b.amount_usd:
+        if abs(a.amount_usd - b.amount_usd) > AMOUNT_TOLERANCE * max(a.amount_usd, b.amount_usd):
+            return False
+    if a.entity_ids and b.entity_ids and not set(a.entity_ids) & set(b.entity_ids):
+        return False
+    return True
+
+
+def find_duplicate_clusters(
+    items: Sequence[DedupItem],
+    *,
+    lsh: MinHashLSH | None = None,
+    min_similarity: float = MIN_SIMILARITY,
+    window: timedelta = WINDOW,
+    new_ids: set[int] | None = None,
+) -> list[list[tuple[int, float]]]:
+    """
+    Group near-duplicate events of the same type.
+
+    Candidates come from `lsh` buckets; a pair is kept when the estimated
+    similarity of its signatures reaches `min_similarity` and dates, amounts
+    and entities do not contradict each other. Pairs are joined transitively.
+    With `new_ids`, only pairs involving one of them are considered.
+
+    Each cluster is a list of `(event_id, similarity)`, canonical (first
+    recorded) event first; the similarity is the best match that put the
+    event in the cluster.
+    """
+    lsh = lsh or MinHashLSH()
+    if len(items) < 2:
+        return []
+    type_codes = {t: code for code, t in enumerate(sorted({it.type for it in items}))}
+    blocks = np.array([type_codes[it.type] for it in items], dtype=np.uint64)
+    signatures = lsh.signatures([event_features(it) for it in items])
+
+    parent = list(range(len(items)))
+    best = [0.0] * len(items)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    left, right = lsh.candidate_pairs(signatures, blocks)
+    if new_ids is not None:
+        is_new = np.fromiter((it.id in new_ids for it in items), dtype=bool, count=len(items))
+        keep = is_new[left] | is_new[right]
+        left, right = left[keep], right[keep]
+    similarities = np.empty(len(left), dtype=np.float64)
+    for start in range(0, len(left), _VERIFY_CHUNK):
+        chunk = slice(start, start + _VERIFY_CHUNK)
+        similarities[chunk] = (
+            signatures[left[chunk]] == signatures[right[chunk]]
+        ).sum(axis=1) / lsh.num_perm
+    keep = similarities >= min_similarity
+
+    for i, j, similarity in zip(
+        left[keep].tolist(), right[keep].tolist(), similarities[keep].tolist()
+    ):
+        if not _compatible(items[i], items[j], window):
+            continue
+        best[i] = max(best[i], similarity)
+        best[j] = max(best[j], similarity)
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[rj] = ri
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i in range(len(items)):
+        groups[find(i)].append(i)
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda i: (items[i].recorded_at, items[i].id))
+        clusters.append([(items[i].id, round(best[i], 4)) for i in members])
+    return clusters
+
+
+def _load_items(
+    session, since: datetime | None, window: timedelta
+) -> tuple[list[DedupItem], set[int] | None]:
+    """
+    Canonical (not yet merged) events to compare, plus the ids recorded after
+    `since`. Without `since`, the whole ledger is loaded and compared.
+    """
+    is_canonical = ~exists().where(EventDuplicate.event_id == Event.id)
+    query = session.query(
+        Event.id,
+        Event.type,
+        Event.occurred_at,
+        Event.recorded_at,
+        Event.amount_usd,
+        Event.round,
+        Event.summary,
+        EventEntityRole.entity_id,
+    ).outerjoin(EventEntityRole, EventEntityRole.event_id == Event.id).filter(is_canonical)
+
+    new_ids = None
+    if since is not None:
+        new = (
+            session.query(Event.id, Event.occurred_at)
+            .filter(is_canonical)
+            .filter(Event.recorded_at > since)
+            .all()
+        )
+        if not new:
+            return [], set()
+        new_ids = {row.id for row in new}
+        dates = [row.occurred_at for row in new if row.occurred_at is not None]
+        if dates:
+            query = query.filter(
+                or_(
+                    Event.occurred_at.between(min(dates) - window, max(dates) + window),
+                    Event.occurred_at.is_(None),
+                    Event.recorded_at > since,
+                )
+            )
+        else:
+            query = query.filter(or_(Event.occurred_at.is_(None), Event.recorded_at > since))
+
+    fields: dict[int, tuple] = {}
+    entities: dict[int, list[int]] = defaultdict(list)
+    for row in query.order_by(Event.id).yield_per(5000):
+        fields[row.id] = tuple(row[:7])
+        if row.entity_id is not None:
+            entities[row.id].append(row.entity_id)
+    items = [
+        DedupItem(*values, entity_ids=tuple(sorted(entities[event_id])))
+        for event_id, values in fields.items()
+    ]
+    return items, new_ids
+
+
+@instrument_stage("deduplication")
+def deduplicate_events(
+    session, since: datetime | None = None, window: timedelta = WINDOW
+) -> int:
+    """
+    Merge near-duplicate events into canonical ones. Returns the number of
+    events marked as duplicates; the caller commits.
+
+    Each duplicate gets an `event_duplicates` row pointing at the earliest
+    recorded event of its cluster, its mentions move to that event (so the
+    canonical event lists every outlet's document), and its graph edges are
+    dropped. Duplicates of an event that is itself merged now follow it to the
+    new canonical event. Pass `since` (the previous run's start) to compare only
+    events recorded after it against their surrounding time span.
+    """
+    items, new_ids = _load_items(session, since, window)
+    clusters = find_duplicate_clusters(items, window=window, new_ids=new_ids)
+
+    now = datetime.utcnow()
+    moves = [
+        {"dup_id": event_id, "canonical_id": cluster[0][0], "similarity": similarity}
+        for cluster in clusters
+        for event_id, similarity in cluster[1:]
+    ]
+    if not moves:
+        return 0
+
+    duplicates = EventDuplicate.__table__
+    mentions = Mention.__table__
+    session.execute(
+        duplicates.update()
+        .where(duplicates.c.canonical_event_id == bindparam("dup_id"))
+        .values(canonical_event_id=bindparam("canonical_id")),
+        moves,
+    )
+    session.execute(
+        mentions.update()
+        .where(mentions.c.event_id == bindparam("dup_id"))
+        .values(event_id=bindparam("canonical_id")),
+        moves,
+    )
+    session.execute(
+        insert(EventDuplicate),
+        [
+            {
+                "event_id": move["dup_id"],
+                "canonical_event_id": move["canonical_id"],
+                "similarity": move["similarity"],
+                "method": DEDUP_METHOD,
+                "detected_at": now,
+            }
+            for move in moves
+        ],
+    )
+    merged = [move["dup_id"] for move in moves]
+    for i in range(0, len(merged), _EDGE_REFRESH_CHUNK):
+        refresh_event_edges(session, merged[i : i + _EDGE_REFRESH_CHUNK])
+    bump_data_version(session, EVENTS)
+    return len(merged)
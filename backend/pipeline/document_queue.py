@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, exists, func, insert, literal, or_, select, update
+
+from backend.models.documents import Document, DocumentProcessingState
+from backend.models.events import Mention
+
+
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+
+def enqueue_new_documents(session) -> int:
+    """
+    Create queue entries for documents added since the last enqueue.
+
+    Only documents with ids above the highest queued document id are scanned,
+    so the cost tracks new documents rather than the whole table. Documents
+    that already have mentions (extracted before the queue existed) start as done.
+    """
+    last_id = session.query(func.max(DocumentProcessingState.document_id)).scalar() or 0
+    has_mentions = exists().where(Mention.document_id == Document.id)
+    now = datetime.utcnow()
+    new_rows = select(
+        Document.id,
+        case((has_mentions, DONE), else_=QUEUED),
+        literal(0),
+        literal(now),
+    ).where(Document.id > last_id)
+    result = session.execute(
+        insert(DocumentProcessingState).from_select(
+            ["document_id", "status", "attempts", "updated_at"], new_rows
+        )
+    )
+    return result.rowcount or 0
+
+
+def backlog_size(session) -> int:
+    """Documents waiting for extraction: queued, plus stored but not yet enqueued."""
+    last_id = session.query(func.max(DocumentProcessingState.document_id)).scalar() or 0
+    queued = (
+        session.query(func.count(DocumentProcessingState.id))
+        .filter(DocumentProcessingState.status == QUEUED)
+        .scalar()
+    )
+    not_enqueued = session.query(func.count(Document.id)).filter(Document.id > last_id).scalar()
+    return (queued or 0) + (not_enqueued or 0)
+
+
+def claim_documents(session, limit: int, lease_minutes: int) -> list[Document]:
+    """
+    Claim up to `limit` queued documents (newest first), plus any whose lease expired,
+    marking them in_progress. Commits so that the claim is visible to other workers.
+    """
+    stale_before = datetime.utcnow() - timedelta(minutes=lease_minutes)
+    claimable = or_(
+        DocumentProcessingState.status == QUEUED,
+        (DocumentProcessingState.status == IN_PROGRESS)
+        & (DocumentProcessingState.claimed_at < stale_before),
+    )
+    state_ids = [
+        state_id
+        for (state_id,) in session.query(DocumentProcessingState.id)
+        .filter(claimable)
+        .order_by(DocumentProcessingState.document_id.desc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ]
+    if not state_ids:
+        session.commit()
+        return []
+
+    now = datetime.utcnow()
+    session.execute(
+        update(DocumentProcessingState)
+        .where(DocumentProcessingState.id.in_(state_ids))
+        .where(claimable)
+        .values(
+            status=IN_PROGRESS,
+            claimed_at=now,
+            attempts=DocumentProcessingState.attempts + 1,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+
+    return (
+        session.query(Document)
+        .join(DocumentProcessingState, DocumentProcessingState.document_id == Document.id)
+        .filter(DocumentProcessingState.id.in_(state_ids))
+        .filter(DocumentProcessingState.status == IN_PROGRESS)
+        .filter(DocumentProcessingState.claimed_at == now)
+        .order_by(Document.id.desc())
+        .all()
+    )
+
+
+def mark_done(session, document_id: int) -> None:
+    session.execute(
+        update(DocumentProcessingState)
+        .where(DocumentProcessingState.document_id == document_id)
+        .values(status=DONE, last_error=None, updated_at=datetime.utcnow())
+    )
+
+
+def mark_failed(session, document_id: int, error: str, max_attempts: int) -> None:
+    """Requeue the document for another attempt, or park it as failed once attempts run out."""
+    session.execute(
+        update(DocumentProcessingState)
+        .where(DocumentProcessingState.document_id == document_id)
+        .values(
+            status=case(
+                (DocumentProcessingState.attempts >= max_attempts, FAILED), else_=QUEUED
+            ),
+            last_error=error,
+            updated_at=datetime.utcnow(),
+        )
+    )
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+from typing import Iterable, Sequence
+
+from backend.core.registry import decode_aliases, load_company_records, match_key
+from backend.models.entities import Entity
+
+
+# Extracted entity types that may resolve to a registry company. An investor such
+# as "Microsoft" should land on the same node as the company.
+_REGISTRY_TYPES = {"company", "investor"}
+
+
+class EntityResolver:
+    """
+    In-memory name -> entity id index used while persisting extracted events.
+
+    Built once per run from the `entities` table (names and JSON aliases) and the
+    company registry, then kept current as entities are created, so resolving a
+    reference costs a dict lookup instead of a SELECT + flush. Names are compared
+    by `match_key`, which ignores case, whitespace and punctuation.
+    """
+
+    def __init__(self) -> None:
+        self._by_key: dict[tuple[str, str], int] = {}
+        self._by_registry_id: dict[str, int] = {}
+        self._registry: dict[str, dict] = {}
+        self._pending: list[tuple[str, object]] = []
+
+    @classmethod
+    def from_session(cls, session) -> "EntityResolver":
+        resolver = cls()
+        for rec in load_company_records():
+            for name in [rec["name"], *(rec.get("aliases") or [])]:
+                if name and match_key(name):
+                    resolver._registry[match_key(name)] = rec
+
+        rows = session.query(
+            Entity.id, Entity.name, Entity.type, Entity.external_id, Entity.aliases
+        ).order_by(Entity.id)
+        for entity_id, name, type_, external_id, aliases in rows:
+            resolver._register(entity_id, name, type_, external_id, decode_aliases(aliases))
+        resolver._pending.clear()
+        return resolver
+
+    def _register(
+        self,
+        entity_id: int,
+        name: str,
+        type_: str,
+        external_id: str | None,
+        aliases: Iterable[str] = (),
+    ) -> None:
+        # First registration wins, matching the oldest-row behaviour of the old exact-match query.
+        for candidate in [name, *aliases]:
+            key = (match_key(candidate), type_)
+            if key[0] and key not in self._by_key:
+                self._by_key[key] = entity_id
+                self._pending.append(("key", key))
+        if external_id and external_id not in self._by_registry_id:
+            self._by_registry_id[external_id] = entity_id
+            self._pending.append(("registry", external_id))
+
+    def _registry_record(self, name: str, type_: str) -> dict | None:
+        if type_ not in _REGISTRY_TYPES:
+            return None
+        return self._registry.get(match_key(name))
+
+    def lookup(self, name: str, type_: str) -> int | None:
+        rec = self._registry_record(name, type_)
+        if rec is None:
+            return self._by_key.get((match_key(name), type_))
+        if rec.get("id") in self._by_registry_id:
+            return self._by_registry_id[rec["id"]]
+        # The company may already exist without its external id, under any of its
+        # registry names and as either a company or an investor.
+        keys = [match_key(n) for n in [rec["name"], *(rec.get("aliases") or [])] if n]
+        for t in (type_, *sorted(_REGISTRY_TYPES - {type_})):
+            for key in keys:
+                if (key, t) in self._by_key:
+                    return self._by_key[(key, t)]
+        return None
+
+    def resolve_many(self, session, refs: Sequence[tuple[str, str]]) -> list[int | None]:
+        """
+        Return entity ids for `(name, type)` references, creating any unknown
+        entities with a single flush. Registry matches are created under their
+        canonical name, external id and aliases. Names with an empty `match_key`
+        (punctuation only) cannot be matched later, so they get no entity and
+        resolve to None.
+        """
+        new_entities: dict[tuple[str, str], Entity] = {}
+        for name, type_ in refs:
+            if not match_key(name) or self.lookup(name, type_) is not None:
+                continue
+            rec = self._registry_record(name, type_)
+            if rec is not None:
+                dedup_key = ("registry", rec.get("id") or rec["name"])
+            else:
+                dedup_key = (match_key(name), type_)
+            if dedup_key in new_entities:
+                continue
+            if rec is not None:
+                aliases = rec.get("aliases") or []
+                new_entities[dedup_key] = Entity(
+                    name=rec["name"],
+                    type=type_ if type_ == "investor" else rec.get("type") or type_,
+                    external_id=rec.get("id"),
+                    aliases=json.dumps(aliases) if aliases else None,
+                )
+            else:
+                new_entities[dedup_key] = Entity(name=name, type=type_)
+
+        if new_entities:
+            session.add_all(new_entities.values())
+            session.flush()
+            for ent in new_entities.values():
+                aliases = decode_aliases(ent.aliases)
+                self._register(ent.id, ent.name, ent.type, ent.external_id, aliases)
+
+        return [self.lookup(name, type_) if match_key(name) else None for name, type_ in refs]
+
+    def checkpoint(self) -> None:
+        """Mark entries registered so far as committed."""
+        self._pending.clear()
+
+    def rollback(self) -> None:
+        """Forget entries registered since the last checkpoint (their rows were rolled back)."""
+        for kind, key in self._pending:
+            if kind == "key":
+                self._by_key.pop(key, None)
+            else:
+                self._by_registry_id.pop(key, None)
+        self._pending.clear()
+
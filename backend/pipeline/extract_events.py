@@ -1,85 +1,202 @@
 from __future__ import annotations
 
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from backend.core.config import settings
+from backend.core.metrics import instrument_stage
 from backend.db.base import SessionLocal
-from backend.llm.event_extractor import EventExtractor
+from backend.llm import extraction_cache
+from backend.llm.event_extractor import EventExtractor, attach_source_url, strip_source_url
+from backend.models.data_versions import ENTITIES, EVENTS, bump_data_version
 from backend.models.documents import Document
-from backend.models.entities import Entity
 from backend.models.events import Event, Mention, EventEntityRole
-from backend.schemas.events import ExtractedEvent
+from backend.pipeline import document_queue
+from backend.pipeline.graph_edges import add_event_edges
+from backend.pipeline.entity_resolution import EntityResolver
+from backend.schemas.events import ExtractedEvent, ExtractionResult
 
 
-def _get_or_create_entity(session, name: str, type_: str) -> Entity:
-    existing = (
-        session.query(Entity)
-        .filter(Entity.name == name)
-        .filter(Entity.type == type_)
-        .first()
-    )
-    if existing:
-        return existing
-    ent = Entity(name=name, type=type_)
-    session.add(ent)
-    session.flush()
-    return ent
+logger = logging.getLogger(__name__)
 
 
 def persist_extracted_event(
-    session, doc: Document, extracted: ExtractedEvent
+    session, doc: Document, extracted: ExtractedEvent, resolver: EntityResolver | None = None
 ) -> Event:
+    """
+    Append an extracted event with its mentions, entity roles and graph edges,
+    and bump the events / entities data versions.
+
+    Pass a run-wide `resolver` when persisting many events; without one, an index
+    is built from the entities table for this call.
+    """
+    if resolver is None:
+        resolver = EntityResolver.from_session(session)
+
     event = Event(
         type=extracted.type,
         occurred_at=extracted.occurred_at,
-        attributes=extracted.attributes.model_dump_json(),
+        attributes=extracted.attributes.model_dump(mode="json"),
         confidence=extracted.confidence,
     )
     session.add(event)
     session.flush()
 
     # Mentions and fact-centric event–entity roles
-    for ent_ref in extracted.entities:
-        entity = _get_or_create_entity(session, ent_ref.name, ent_ref.type)
-        mention = Mention(
-            document_id=doc.id,
-            entity_id=entity.id,
-            event_id=event.id,
-            snippet=None,
+    resolved = resolver.resolve_many(
+        session, [(ent_ref.name, ent_ref.type) for ent_ref in extracted.entities]
+    )
+    # References with no usable name (punctuation only) resolve to None and are dropped.
+    refs = [
+        (ent_ref, entity_id)
+        for ent_ref, entity_id in zip(extracted.entities, resolved)
+        if entity_id is not None
+    ]
+    rows = []
+    for ent_ref, entity_id in refs:
+        rows.append(
+            Mention(
+                document_id=doc.id,
+                entity_id=entity_id,
+                event_id=event.id,
+                snippet=None,
+            )
         )
-        session.add(mention)
-
-        event_role = EventEntityRole(
-            event_id=event.id,
-            entity_id=entity.id,
-            role=ent_ref.role,
+        rows.append(
+            EventEntityRole(
+                event_id=event.id,
+                entity_id=entity_id,
+                role=ent_ref.role,
+            )
         )
-        session.add(event_role)
+    session.add_all(rows)
+    add_event_edges(
+        session,
+        event,
+        [entity_id for _, entity_id in refs],
+        [ent_ref.role for ent_ref, _ in refs],
+    )
+    # Resolution may have created entities as well.
+    bump_data_version(session, EVENTS, ENTITIES)
 
     return event
 
 
-def run_extraction_for_unprocessed_documents(limit: int = 20) -> int:
-    """Run event extraction for documents that do not yet have mentions."""
+def _extract_document(
+    extractor: EventExtractor, content_hash: str, content: str, url: str
+) -> tuple[str, ExtractionResult]:
+    return content_hash, extractor.extract(content, url=url)
+
+
+@instrument_stage("extraction")
+def run_extraction_for_unprocessed_documents(
+    limit: int = 20,
+    workers: int | None = None,
+    extractor: EventExtractor | None = None,
+) -> int:
+    """
+    Run event extraction for up to `limit` documents from the processing queue.
+
+    New documents are enqueued, then a batch is claimed from
+    `document_processing_states`. Results are looked up in the extraction cache
+    first (keyed by content hash, prompt version and model id), and documents
+    sharing a content hash are extracted once. Remaining model calls run on a
+    pool of `workers` threads. BedrockClient throttles every attempt, retries
+    included, through the process-wide token bucket
+    (`bedrock_requests_per_second` / `bedrock_burst`).
+
+    Results are persisted on the calling thread only, so the database sees a
+    single writer, and each document is committed (and marked done or failed)
+    on its own: a failed model call costs only that document, which is retried
+    on a later run until `extraction_max_attempts` is reached.
+    """
+    workers = workers or settings.extraction_workers
     session = SessionLocal()
-    extractor = EventExtractor()
+    extractor = extractor or EventExtractor()
+    model_id = extractor.client.model_id
     created_events = 0
 
+    def persist_result(docs_for_hash: list[Document], result: ExtractionResult) -> None:
+        nonlocal created_events
+        for doc in docs_for_hash:
+            doc_result = attach_source_url(result.model_copy(deep=True), doc.url)
+            try:
+                for ev in doc_result.events:
+                    persist_extracted_event(session, doc, ev, resolver)
+                document_queue.mark_done(session, doc.id)
+                session.commit()
+                resolver.checkpoint()
+            except Exception as exc:
+                session.rollback()
+                resolver.rollback()
+                record_failure([doc], exc)
+                continue
+            created_events += len(doc_result.events)
+
+    def record_failure(docs_for_hash: list[Document], exc: BaseException) -> None:
+        logger.warning("Extraction failed for documents %s: %s", [d.id for d in docs_for_hash], exc)
+        for doc in docs_for_hash:
+            document_queue.mark_failed(
+                session, doc.id, f"{type(exc).__name__}: {exc}", settings.extraction_max_attempts
+            )
+        session.commit()
+
     try:
-        subq = session.query(Mention.document_id).distinct().subquery()
-        docs = (
-            session.query(Document)
-            .filter(~Document.id.in_(subq))
-            .order_by(Document.fetched_at.desc())
-            .limit(limit)
-            .all()
+        document_queue.enqueue_new_documents(session)
+        session.commit()
+        docs = document_queue.claim_documents(
+            session, limit, settings.extraction_claim_lease_minutes
         )
+        resolver = EntityResolver.from_session(session)
 
+        docs_by_hash: dict[str, list[Document]] = defaultdict(list)
         for doc in docs:
-            result = extractor.extract(doc.content, url=doc.url)
-            for ev in result.events:
-                persist_extracted_event(session, doc, ev)
-                created_events += 1
+            docs_by_hash[doc.content_hash].append(doc)
 
-        session.commit()
+        cached = {}
+        if settings.extraction_cache_enabled:
+            cached = extraction_cache.lookup_many(session, docs_by_hash, model_id)
+            session.commit()
+        for content_hash, result in cached.items():
+            persist_result(docs_by_hash[content_hash], result)
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+        try:
+            futures = {
+                pool.submit(
+                    _extract_document,
+                    extractor,
+                    content_hash,
+                    group[0].content,
+                    group[0].url,
+                ): content_hash
+                for content_hash, group in docs_by_hash.items()
+                if content_hash not in cached
+            }
+            for future in as_completed(futures):
+                content_hash = futures[future]
+                try:
+                    _, result = future.result()
+                except Exception as exc:
+                    record_failure(docs_by_hash[content_hash], exc)
+                    continue
+                group = docs_by_hash[content_hash]
+                if settings.extraction_cache_enabled:
+                    extraction_cache.store(session, content_hash, model_id, result, group[0].url)
+                # Each document of the group is credited with its own URL only.
+                persist_result(group, strip_source_url(result, group[0].url))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        if settings.extraction_cache_enabled:
+            extraction_cache.invalidate_stale_prompts(session)
+            extraction_cache.prune(
+                session,
+                max_entries=settings.extraction_cache_max_entries,
+                max_age_days=settings.extraction_cache_max_age_days,
+            )
+            session.commit()
         return created_events
     finally:
         session.close()
-
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import combinations, groupby
+from typing import Iterable, Sequence
+
+from sqlalchemy import delete, func, insert
+
+from backend.models.events import Event, EventEntityRole, Relationship
+from backend.models.graph import GraphEdge, GraphEventEdge
+from backend.queries.events import IS_CANONICAL_EVENT
+
+
+_BATCH_SIZE = 1000
+
+
+def _pair_edges(
+    event_id: int,
+    event_type: str,
+    occurred_at: datetime | None,
+    confidence: float | None,
+    entity_ids: Iterable[int],
+) -> list[dict]:
+    weight = confidence if confidence is not None else 1.0
+    return [
+        {
+            "source_entity_id": a,
+            "target_entity_id": b,
+            "event_id": event_id,
+            "relationship_id": None,
+            "edge_type": event_type,
+            "occurred_at": occurred_at,
+            "weight": weight,
+        }
+        for a, b in combinations(sorted(set(entity_ids)), 2)
+    ]
+
+
+def _incidence_edges(
+    event_id: int,
+    event_type: str,
+    occurred_at: datetime | None,
+    confidence: float | None,
+    roles: Iterable[tuple[int, str | None]],
+) -> list[dict]:
+    weight = confidence if confidence is not None else 1.0
+    first_role: dict[int, str | None] = {}
+    for entity_id, role in roles:
+        first_role.setdefault(entity_id, role)
+    return [
+        {
+            "entity_id": entity_id,
+            "event_id": event_id,
+            "role": role,
+            "edge_type": event_type,
+            "occurred_at": occurred_at,
+            "weight": weight,
+        }
+        for entity_id, role in first_role.items()
+    ]
+
+
+def add_event_edges(
+    session, event: Event, entity_ids: Sequence[int], roles: Sequence[str | None] | None = None
+) -> None:
+    """Materialize the co-participation and entity–event edges of a newly persisted event."""
+    fields = (event.id, event.type, event.occurred_at, event.confidence)
+    _insert(session, _pair_edges(*fields, entity_ids))
+    roles = roles if roles is not None else [None] * len(entity_ids)
+    _insert(session, _incidence_edges(*fields, zip(entity_ids, roles)), GraphEventEdge)
+
+
+def _role_edges(
+    session, event_ids: Sequence[int] | None
+) -> Iterable[tuple[list[dict], list[dict]]]:
+    """(entity pair edges, entity–event edges) per canonical event."""
+    query = (
+        session.query(
+            EventEntityRole.event_id,
+            EventEntityRole.entity_id,
+            EventEntityRole.role,
+            Event.type,
+            Event.occurred_at,
+            Event.confidence,
+        )
+        .join(Event, Event.id == EventEntityRole.event_id)
+        # Merged duplicates would count the same story once per outlet.
+        .filter(IS_CANONICAL_EVENT)
+        .order_by(EventEntityRole.event_id)
+    )
+    if event_ids is not None:
+        query = query.filter(EventEntityRole.event_id.in_(event_ids))
+    for event_id, rows in groupby(query.yield_per(_BATCH_SIZE), key=lambda r: r[0]):
+        rows = list(rows)
+        fields = (event_id, *rows[0][3:])
+        yield (
+            _pair_edges(*fields, [r[1] for r in rows]),
+            _incidence_edges(*fields, [(r[1], r[2]) for r in rows]),
+        )
+
+
+def _relationship_edges(session, event_ids: Sequence[int] | None) -> Iterable[dict]:
+    query = session.query(
+        Relationship.id,
+        Relationship.type,
+        Relationship.from_entity_id,
+        Relationship.to_entity_id,
+        Relationship.event_id,
+        Event.occurred_at,
+    ).outerjoin(Event, Event.id == Relationship.event_id)
+    # Relationships recorded on a merged duplicate would double-count the story;
+    # ones with no event pass (there is no duplicate row to find).
+    query = query.filter(IS_CANONICAL_EVENT)
+    if event_ids is not None:
+        query = query.filter(Relationship.event_id.in_(event_ids))
+    for rel_id, rel_type, from_id, to_id, event_id, occurred_at in query.yield_per(_BATCH_SIZE):
+        if from_id == to_id:
+            continue
+        yield {
+            "source_entity_id": min(from_id, to_id),
+            "target_entity_id": max(from_id, to_id),
+            "event_id": event_id,
+            "relationship_id": rel_id,
+            "edge_type": rel_type,
+            "occurred_at": occurred_at,
+            "weight": 1.0,
+        }
+
+
+def _insert(session, edges: list[dict], model=GraphEdge) -> int:
+    for start in range(0, len(edges), _BATCH_SIZE):
+        session.execute(insert(model), edges[start : start + _BATCH_SIZE])
+    return len(edges)
+
+
+def _insert_role_edges(session, event_ids: Sequence[int] | None) -> int:
+    pairs: list[dict] = []
+    incidences: list[dict] = []
+    for event_pairs, event_incidences in _role_edges(session, event_ids):
+        pairs.extend(event_pairs)
+        incidences.extend(event_incidences)
+    # Materialized first so the streaming cursor is closed before inserting.
+    _insert(session, incidences, GraphEventEdge)
+    return _insert(session, pairs)
+
+
+def refresh_event_edges(session, event_ids: Sequence[int]) -> int:
+    """
+    Recompute the edges of the given events (entity pairs and entity–event)
+    from `event_entity_roles` and `relationships`. Use after writing roles
+    outside `persist_extracted_event`.
+    """
+    if not event_ids:
+        return 0
+    event_ids = list(event_ids)
+    session.execute(delete(GraphEdge).where(GraphEdge.event_id.in_(event_ids)))
+    session.execute(delete(GraphEventEdge).where(GraphEventEdge.event_id.in_(event_ids)))
+    count = _insert_role_edges(session, event_ids)
+    return count + _insert(session, list(_relationship_edges(session, event_ids)))
+
+
+def rebuild_graph_edges(session) -> int:
+    """
+    Drop and recompute the adjacency tables. Returns the number of entity pair
+    edges.
+    """
+    session.execute(delete(GraphEdge))
+    session.execute(delete(GraphEventEdge))
+    count = _insert_role_edges(session, None)
+    # Materialize before inserting so the streaming cursor is closed first.
+    return count + _insert(session, list(_relationship_edges(session, None)))
+
+
+def ensure_graph_edges(session) -> bool:
+    """Backfill the adjacency tables once if they are empty but the ledger is not."""
+    if session.query(func.count(GraphEventEdge.id)).scalar():
+        return False
+    if not session.query(func.count(EventEntityRole.id)).scalar():
+        return False
+    rebuild_graph_edges(session)
+    return True
@@ -0,0 +1,450 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import func
+
+from backend.core import metrics
+from backend.core.config import settings
+from backend.db.base import SessionLocal
+from backend.models.events import Event
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+
+    `run` does one unit of work and returns how much it produced (documents,
+    events, labels, ...). A productive run makes every downstream stage due
+    at once; otherwise a stage runs every `interval` seconds. `min_interval`
+    spaces out runs triggered by upstream output. `backlog`, if given, counts
+    work still waiting; a stage that made progress and still has a backlog
+    runs again straight away.
+    """
+
+    name: str
+    run: Callable[[], int]
+    interval: float
+    upstream: tuple[str, ...] = ()
+    min_interval: float = 0.0
+    backlog: Callable[[], int] | None = None
+
+
+@dataclass
+class _StageState:
+    # New stages are due: every stage runs once on startup, in DAG order.
+    dirty: bool = True
+    running: bool = False
+    last_started: float | None = None
+    last_finished: float | None = None
+    retry_at: float = 0.0
+    consecutive_failures: int = 0
+    runs: int = 0
+    failures: int = 0
+    last_run_at: datetime | None = None
+    last_duration: float | None = None
+    total_duration: float = 0.0
+    last_output: int | None = None
+    last_error: str | None = None
+    backlog: int | None = None
+
+
+def _topological_order(stages: Sequence[Stage]) -> list[str]:
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique")
+    order: list[str] = []
+    visiting: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage dependencies form a cycle through {name!r}")
+        if name not in by_name:
+            raise ValueError(f"Unknown upstream stage {name!r}")
+        visiting.add(name)
+        for upstream in by_name[name].upstream:
+            visit(upstream)
+        visiting.discard(name)
+        order.append(name)
+
+    for stage in stages:
+        visit(stage.name)
+    return order
+
+
+class Scheduler:
+    """
+    Runs pipeline stages as a DAG in one resident process.
+
+    A stage never overlaps with itself, and does not start while one of its
+    ancestors is running or due (an overdue stage only waits for running ones),
+    so downstream work sees upstream output as soon as it is written. Failed runs are retried after an exponential
+    backoff with jitter. `stop` lets running stages finish and starts no new ones.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        *,
+        backoff_base: float = 30.0,
+        backoff_max: float = 1800.0,
+        tick: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.order = _topological_order(stages)
+        self.stages = {stage.name: stage for stage in stages}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tick = tick
+        self.clock = clock
+
+        children: dict[str, set[str]] = {name: set() for name in self.order}
+        for stage in stages:
+            for upstream in stage.upstream:
+                children[upstream].add(stage.name)
+        self._descendants = {name: self._reachable(name, children) for name in self.order}
+        self._ancestors = {
+            name: {other for other in self.order if name in self._descendants[other]}
+            for name in self.order
+        }
+
+        self._state = {name: _StageState() for name in self.order}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _reachable(name: str, children: dict[str, set[str]]) -> set[str]:
+        seen: set[str] = set()
+        pending = list(children[name])
+        while pending:
+            child = pending.pop()
+            if child not in seen:
+                seen.add(child)
+                pending.extend(children[child])
+        return seen
+
+    def _backoff(self, failures: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _overdue(self, name: str, now: float) -> bool:
+        state = self._state[name]
+        return (
+            not state.running
+            and now >= state.retry_at
+            and state.last_finished is not None
+            and now >= state.last_finished + self.stages[name].interval
+        )
+
+    def _ready(self, name: str, now: float) -> bool:
+        state = self._state[name]
+        stage = self.stages[name]
+        if state.running or now < state.retry_at:
+            return False
+        ancestor_running = any(self._state[ancestor].running for ancestor in self._ancestors[name])
+        # An overdue stage runs regardless of due ancestors, so a long upstream
+        # backlog cannot hold it back for more than its interval. It still waits
+        # for running ones: their output may be written but not yet committed,
+        # and a stage that resumes from a watermark (deduplication) would skip
+        # it for good.
+        if self._overdue(name, now):
+            return not ancestor_running
+        # Ancestors hold off while an overdue descendant waits for them to
+        # finish, so that they cannot keep it waiting by starting again.
+        if any(self._overdue(descendant, now) for descendant in self._descendants[name]):
+            return False
+        if ancestor_running:
+            return False
+        for ancestor in self._ancestors[name]:
+            upstream = self._state[ancestor]
+            if upstream.dirty and upstream.retry_at <= now:
+                return False
+        return state.dirty and (
+            state.last_started is None or now >= state.last_started + stage.min_interval
+        )
+
+    def _start_ready(self, now: float) -> list[str]:
+        """Mark every stage that is ready at `now` as started; the caller runs them."""
+        started = []
+        # Stages are visited in DAG order, so a stage started here holds back
+        # its descendants within the same pass.
+        for name in self.order:
+            if self._ready(name, now):
+                self._start(name, now)
+                started.append(name)
+        return started
+
+    def _measure_backlog(self, stage: Stage) -> int | None:
+        if stage.backlog is None:
+            return None
+        try:
+            backlog = stage.backlog()
+        except Exception as exc:
+            logger.warning("Backlog of stage %s could not be measured: %s", stage.name, exc)
+            return None
+        metrics.pipeline_backlog.set(backlog, stage=stage.name)
+        return backlog
+
+    def _execute(self, name: str) -> int | None:
+        stage = self.stages[name]
+        state = self._state[name]
+        started = self.clock()
+        output: int | None = None
+        error: Exception | None = None
+        try:
+            output = stage.run()
+        except Exception as exc:  # a failing stage is retried, never fatal to the daemon
+            logger.exception("Stage %s failed", name)
+            error = exc
+        finished = self.clock()
+        backlog = self._measure_backlog(stage)
+
+        with self._lock:
+            previous_backlog = state.backlog
+            state.running = False
+            state.last_finished = finished
+            state.last_duration = finished - started
+            state.total_duration += finished - started
+            state.runs += 1
+            state.backlog = backlog
+            if error is not None:
+                state.failures += 1
+                state.consecutive_failures += 1
+                state.last_error = f"{type(error).__name__}: {error}"
+                state.retry_at = finished + self._backoff(state.consecutive_failures)
+                state.dirty = True
+            else:
+                state.consecutive_failures = 0
+                state.retry_at = 0.0
+                state.last_error = None
+                state.last_output = output
+                if output:
+                    for descendant in self._descendants[name]:
+                        self._state[descendant].dirty = True
+                progressed = output or previous_backlog is None or (backlog or 0) < previous_backlog
+                if backlog and progressed:
+                    state.dirty = True
+        logger.info(
+            "Stage %s %s in %.2fs (output=%s, backlog=%s)",
+            name,
+            "failed" if error is not None else "finished",
+            finished - started,
+            output,
+            backlog,
+        )
+        self._wake.set()
+        return output
+
+    def _start(self, name: str, now: float) -> None:
+        state = self._state[name]
+        state.running = True
+        state.dirty = False
+        state.last_started = now
+        state.last_run_at = datetime.utcnow()
+
+    def run_once(self) -> dict[str, int | None]:
+        """Run every stage once, in DAG order, on the calling thread."""
+        outputs: dict[str, int | None] = {}
+        for name in self.order:
+            with self._lock:
+                self._start(name, self.clock())
+            outputs[name] = self._execute(name)
+        return outputs
+
+    def run_forever(self) -> None:
+        """Schedule stages until `stop` is called, then wait for running stages."""
+        for name in self.order:
+            self._state[name].backlog = self._measure_backlog(self.stages[name])
+        with ThreadPoolExecutor(
+            max_workers=len(self.order), thread_name_prefix="stage"
+        ) as pool:
+            while not self._stop.is_set():
+                with self._lock:
+                    for name in self._start_ready(self.clock()):
+                        pool.submit(self._execute, name)
+                self._wake.wait(self.tick)
+                self._wake.clear()
+            running = [name for name, state in self._state.items() if state.running]
+            if running:
+                logger.info("Waiting for running stages to finish: %s", ", ".join(running))
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def snapshot(self) -> dict[str, Any]:
+        now = self.clock()
+        with self._lock:
+            stages = {}
+            for name in self.order:
+                state = self._state[name]
+                stages[name] = {
+                    "upstream": list(self.stages[name].upstream),
+                    "running": state.running,
+                    "due": state.dirty,
+                    "runs": state.runs,
+                    "failures": state.failures,
+                    "consecutive_failures": state.consecutive_failures,
+                    "last_run_at": state.last_run_at.isoformat() if state.last_run_at else None,
+                    "last_duration_seconds": state.last_duration,
+                    "mean_duration_seconds": state.total_duration / state.runs if state.runs else None,
+                    "last_output": state.last_output,
+                    "last_error": state.last_error,
+                    "backlog": state.backlog,
+                    "retry_in_seconds": max(0.0, state.retry_at - now) if state.retry_at else None,
+                }
+        return {"stopping": self._stop.is_set(), "stages": stages}
+
+
+def _counted(fn: Callable[[Any], int]) -> Callable[[], int]:
+    def count() -> int:
+        with SessionLocal() as session:
+            return fn(session)
+
+    return count
+
+
+def pipeline_stages() -> list[Stage]:
+    """
+    The ingestion pipeline: feeds -> extraction -> deduplication -> novelty,
+    with the briefing downstream of deduplication. Model clients are created
+    on first use and kept for the life of the process.
+    """
+    from backend.ingestion.fetcher import fetch_rss_documents
+    from backend.llm.bedrock_client import BedrockClient
+    from backend.llm.event_extractor import EventExtractor
+    from backend.models.pipeline_state import DEDUPLICATION, load_watermark, save_watermark
+    from backend.pipeline import document_queue
+    from backend.pipeline.change_detection import (
+        label_novelty_for_recent_events,
+        unlabelled_event_count,
+    )
+    from backend.pipeline.daily_briefing import generate_daily_briefing, pending_event_count
+    from backend.pipeline.deduplication import deduplicate_events
+    from backend.pipeline.extract_events import run_extraction_for_unprocessed_documents
+
+    clients: dict[str, Any] = {}
+
+    def bedrock() -> BedrockClient:
+        if "bedrock" not in clients:
+            clients["bedrock"] = BedrockClient()
+        return clients["bedrock"]
+
+    def extract() -> int:
+        if "extractor" not in clients:
+            clients["extractor"] = EventExtractor(bedrock())
+        return run_extraction_for_unprocessed_documents(
+            limit=settings.scheduler_extraction_batch, extractor=clients["extractor"]
+        )
+
+    # Each deduplication run compares events recorded since the previous run
+    # started. The watermark is committed with the merges, so a restart
+    # resumes from it; only the very first run compares the whole ledger. The
+    # scheduler never starts this stage while extraction is running, so every
+    # event recorded before `started` has been committed by then, and
+    # extraction runs started later record their events after it.
+    def deduplicate() -> int:
+        started = datetime.utcnow()
+        with SessionLocal() as session:
+            merged = deduplicate_events(session, since=load_watermark(session, DEDUPLICATION))
+            save_watermark(session, DEDUPLICATION, started)
+            session.commit()
+        return merged
+
+    def dedup_backlog(session) -> int:
+        query = session.query(func.count(Event.id))
+        since = load_watermark(session, DEDUPLICATION)
+        if since is not None:
+            query = query.filter(Event.recorded_at >= since)
+        return query.scalar() or 0
+
+    def brief() -> int:
+        # Nothing recorded since the latest briefing: it is still current.
+        with SessionLocal() as session:
+            if not pending_event_count(session):
+                return 0
+        return 1 if generate_daily_briefing(hours=24, client=bedrock()) else 0
+
+    return [
+        Stage("feeds", fetch_rss_documents, settings.scheduler_feeds_interval_seconds),
+        Stage(
+            "extraction",
+            extract,
+            settings.scheduler_extraction_interval_seconds,
+            upstream=("feeds",),
+            backlog=_counted(document_queue.backlog_size),
+        ),
+        Stage(
+            "deduplication",
+            deduplicate,
+            settings.scheduler_deduplication_interval_seconds,
+            upstream=("extraction",),
+            backlog=_counted(dedup_backlog),
+        ),
+        Stage(
+            "novelty",
+            lambda: label_novelty_for_recent_events(limit=settings.scheduler_novelty_batch),
+            settings.scheduler_novelty_interval_seconds,
+            upstream=("deduplication",),
+            backlog=_counted(unlabelled_event_count),
+        ),
+        Stage(
+            "briefing",
+            brief,
+            settings.scheduler_briefing_interval_seconds,
+            upstream=("deduplication",),
+            min_interval=settings.scheduler_briefing_min_interval_seconds,
+            backlog=_counted(pending_event_count),
+        ),
+    ]
+
+
+def start_status_server(scheduler: Scheduler, host: str, port: int) -> ThreadingHTTPServer:
+    """
+    Serve `GET /status` (the scheduler snapshot and conditional GET stats as
+    JSON) and `GET /metrics` (this process's metrics, Prometheus format) on a
+    daemon thread.
+    """
+    from backend.ingestion.fetcher import conditional_get_stats
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            path = self.path.split("?")[0]
+            if path == "/status":
+                status = {**scheduler.snapshot(), "conditional_get": conditional_get_stats.snapshot()}
+                body = json.dumps(status).encode("utf-8")
+                content_type = "application/json"
+            elif path == "/metrics" and settings.metrics_enabled:
+                body = metrics.registry.render().encode("utf-8")
+                content_type = metrics.PROMETHEUS_CONTENT_TYPE
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("status: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="scheduler-status", daemon=True).start()
+    return server
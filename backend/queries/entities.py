@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole
+from backend.queries.events import IS_CANONICAL_EVENT
+
+
+_INFRA_COMPANY_IDS = {"aws", "azure", "databricks", "snowflake", "huggingface", "scale", "coreweave", "deepinfra"}
+_CHIP_COMPANY_IDS = {"nvidia", "amd", "intel"}
+
+_ACQUIRED_ROLES = ("target", "acquired")
+_ACQUIRER_ROLES = ("acquirer", "acquired_by")
+
+PROFILE_EVENT_LIMIT = 5
+
+
+def frontend_entity_type(entity: Entity) -> str:
+    """Map a stored entity onto the category the frontend colours and filters by."""
+    ext_id = entity.external_id or ""
+    if ext_id in _INFRA_COMPANY_IDS:
+        return "ai_infra_company"
+    if ext_id in _CHIP_COMPANY_IDS:
+        return "chip_company"
+    if entity.type == "person":
+        return "individual"
+    return "ai_product_company"
+
+
+def build_entity_profile(db: Session, entity: Entity, limit: int = PROFILE_EVENT_LIMIT) -> dict[str, Any]:
+    """
+    Assemble the acquisitions and recent events shown for an entity.
+
+    Runs three set-based queries whatever the entity's history looks like: the
+    latest acquisitions of the entity, the acquirers of all of those events at
+    once, and its most recent events. Amounts and summaries come from the
+    promoted `events` columns, so no attribute JSON is parsed here.
+    """
+    acquisition_rows = (
+        db.query(Event)
+        .join(EventEntityRole, EventEntityRole.event_id == Event.id)
+        .filter(EventEntityRole.entity_id == entity.id)
+        .filter(Event.type == "acquisition")
+        .filter(IS_CANONICAL_EVENT)
+        .filter(EventEntityRole.role.in_(_ACQUIRED_ROLES))
+        .order_by(Event.occurred_at.desc().nullslast(), Event.id.desc())
+        .limit(limit)
+        .all()
+    )
+    recent_rows = (
+        db.query(Event)
+        .join(EventEntityRole, EventEntityRole.event_id == Event.id)
+        .filter(EventEntityRole.entity_id == entity.id)
+        .filter(IS_CANONICAL_EVENT)
+        .order_by(Event.occurred_at.desc().nullslast(), Event.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    acquirers_by_event: dict[int, list[str]] = defaultdict(list)
+    if acquisition_rows:
+        acquirer_rows = (
+            db.query(EventEntityRole.event_id, Entity.name)
+            .join(Entity, EventEntityRole.entity_id == Entity.id)
+            .filter(EventEntityRole.event_id.in_([ev.id for ev in acquisition_rows]))
+            .filter(EventEntityRole.role.in_(_ACQUIRER_ROLES))
+            .order_by(EventEntityRole.id)
+            .all()
+        )
+        for event_id, name in acquirer_rows:
+            acquirers_by_event[event_id].append(name)
+
+    acquisitions = [
+        {
+            "acquired_by": acquirer,
+            "date": ev.occurred_at.isoformat() if ev.occurred_at else None,
+            "amount_usd": ev.amount_usd,
+        }
+        for ev in acquisition_rows
+        for acquirer in acquirers_by_event.get(ev.id, [])
+    ]
+    related_events = [
+        {
+            "type": ev.type,
+            "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
+            "summary": ev.summary,
+            "amount_usd": ev.amount_usd,
+        }
+        for ev in recent_rows
+    ]
+
+    return {
+        "id": entity.external_id or f"db_{entity.id}",
+        "name": entity.name,
+        "type": frontend_entity_type(entity),
+        "description": None,
+        "founded": None,
+        "founders": None,
+        "acquisitions": acquisitions or None,
+        "related_events": related_events or None,
+    }
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import Row, exists, func, tuple_
+from sqlalchemy.orm import Session
+
+from backend.models.documents import Document
+from backend.models.entities import Entity
+from backend.models.events import Event, EventDuplicate, EventEntityRole, Mention
+
+
+# Columns the event payloads need; selecting them as plain rows skips ORM
+# identity-map bookkeeping for large pages.
+EVENT_COLUMNS = (
+    Event.id,
+    Event.type,
+    Event.occurred_at,
+    Event.recorded_at,
+    Event.attributes,
+    Event.confidence,
+)
+
+# Filter for read paths: events merged into a canonical event by deduplication
+# are left out (their mentions already point at the canonical event).
+IS_CANONICAL_EVENT = ~exists().where(EventDuplicate.event_id == Event.id)
+
+
+def load_event_payloads(db: Session, events: Sequence[Event | Row]) -> list[dict[str, Any]]:
+    """
+    Shape a page of events (ORM objects or `EVENT_COLUMNS` rows) into the
+    `/events` payload.
+
+    Entities and source URLs are fetched with one set-based query each, keyed by
+    event id, so the number of round-trips is fixed regardless of page size.
+    Datetimes are left as objects for the response serializer to format.
+    """
+    event_ids = [ev.id for ev in events]
+    entities_by_event: dict[int, list[dict]] = defaultdict(list)
+    source_url_by_event: dict[int, str] = {}
+
+    if event_ids:
+        role_rows = (
+            db.query(EventEntityRole.event_id, EventEntityRole.role, Entity.name, Entity.type)
+            .join(Entity, EventEntityRole.entity_id == Entity.id)
+            .filter(EventEntityRole.event_id.in_(event_ids))
+            .order_by(EventEntityRole.id)
+            .all()
+        )
+        for event_id, role, name, type_ in role_rows:
+            entities_by_event[event_id].append({"name": name, "type": type_, "role": role})
+
+        # The first mention recorded for each event decides its source document.
+        first_mentions = (
+            db.query(Mention.event_id, func.min(Mention.id).label("mention_id"))
+            .filter(Mention.event_id.in_(event_ids))
+            .group_by(Mention.event_id)
+            .subquery()
+        )
+        url_rows = (
+            db.query(first_mentions.c.event_id, Document.url)
+            .join(Mention, Mention.id == first_mentions.c.mention_id)
+            .join(Document, Document.id == Mention.document_id)
+            .all()
+        )
+        source_url_by_event = {event_id: url for event_id, url in url_rows}
+
+    result = []
+    for ev in events:
+        source_url = source_url_by_event.get(ev.id)
+        if not source_url and isinstance(ev.attributes, dict):
+            source_url = ev.attributes.get("source_url") or ev.attributes.get("url")
+
+        result.append(
+            {
+                "id": ev.id,
+                "type": ev.type,
+                "occurred_at": ev.occurred_at,
+                "recorded_at": ev.recorded_at,
+                "attributes": ev.attributes,
+                "confidence": ev.confidence,
+                "entities": entities_by_event.get(ev.id, []),
+                "source_url": source_url,
+            }
+        )
+    return result
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    # The ledger stores naive UTC timestamps; align aware query bounds with them.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def encode_cursor(ev: Event | Row) -> str:
+    payload = {"o": ev.occurred_at.isoformat() if ev.occurred_at else None, "i": ev.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        occurred_at = datetime.fromisoformat(payload["o"]) if payload["o"] else None
+        return occurred_at, int(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as exc:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}") from exc
+
+
+def query_event_page(
+    db: Session,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    types: Sequence[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    entity_id: int | None = None,
+    min_confidence: float | None = None,
+    min_amount_usd: float | None = None,
+) -> tuple[list[Row], str | None]:
+    """
+    Return one page of events ordered by `(occurred_at desc nulls last, id desc)`
+    plus the cursor for the next page (or None when exhausted).
+
+    Pagination is keyset-based: the cursor carries the last `(occurred_at, id)`
+    seen and each page seeks past it via the composite `(occurred_at, id)` index,
+    so deep pages cost the same as the first. Dated and undated events are read
+    as two index ranges so that undated events still sort last. Events come
+    back as `EVENT_COLUMNS` rows rather than ORM objects.
+    """
+    start, end = naive_utc(start), naive_utc(end)
+    base = db.query(*EVENT_COLUMNS).filter(IS_CANONICAL_EVENT)
+    if types:
+        base = base.filter(Event.type.in_(list(types)))
+    if start is not None:
+        base = base.filter(Event.occurred_at >= start)
+    if end is not None:
+        base = base.filter(Event.occurred_at <= end)
+    if min_confidence is not None:
+        base = base.filter(Event.confidence >= min_confidence)
+    if min_amount_usd is not None:
+        base = base.filter(Event.amount_usd >= min_amount_usd)
+    if entity_id is not None:
+        base = base.filter(
+            db.query(EventEntityRole.id)
+            .filter(EventEntityRole.event_id == Event.id)
+            .filter(EventEntityRole.entity_id == entity_id)
+            .exists()
+        )
+
+    after_dated, after_id = decode_cursor(cursor) if cursor else (None, None)
+    in_undated_range = cursor is not None and after_dated is None
+
+    # Fetch one extra row to learn whether another page exists.
+    wanted = limit + 1
+    page: list[Row] = []
+
+    if not in_undated_range:
+        dated = base.filter(Event.occurred_at.isnot(None))
+        if after_dated is not None:
+            dated = dated.filter(tuple_(Event.occurred_at, Event.id) < (after_dated, after_id))
+        page = dated.order_by(Event.occurred_at.desc(), Event.id.desc()).limit(wanted).all()
+
+    # A date range can never match undated events.
+    if len(page) < wanted and start is None and end is None:
+        undated = base.filter(Event.occurred_at.is_(None))
+        if in_undated_range:
+            undated = undated.filter(Event.id < after_id)
+        page += undated.order_by(Event.id.desc()).limit(wanted - len(page)).all()
+
+    if len(page) > limit:
+        page = page[:limit]
+        return page, encode_cursor(page[-1])
+    return page, None
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Iterator
+
+import orjson
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.orm import Session
+
+from backend.models.documents import Document
+from backend.models.events import Event, Mention
+from backend.queries.events import EVENT_COLUMNS, load_event_payloads, naive_utc
+
+
+EXPORT_BATCH_SIZE = 1000
+
+CSV_FIELDS = (
+    "id",
+    "type",
+    "occurred_at",
+    "recorded_at",
+    "confidence",
+    "amount_usd",
+    "round",
+    "summary",
+    "source_url",
+    "entities",
+    "mentions",
+    "attributes",
+)
+
+
+def _mentions_by_event(db: Session, event_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    rows = (
+        db.query(Mention.event_id, Mention.document_id, Mention.entity_id, Document.url)
+        .join(Document, Document.id == Mention.document_id)
+        .filter(Mention.event_id.in_(event_ids))
+        .order_by(Mention.id)
+        .all()
+    )
+    mentions: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for event_id, document_id, entity_id, url in rows:
+        mentions[event_id].append({"document_id": document_id, "entity_id": entity_id, "url": url})
+    return mentions
+
+
+def _export_batch(db: Session, rows: list[Row]) -> list[dict[str, Any]]:
+    payloads = load_event_payloads(db, rows)
+    mentions = _mentions_by_event(db, [r.id for r in rows])
+    for row, payload in zip(rows, payloads):
+        payload["amount_usd"] = row.amount_usd
+        payload["round"] = row.round
+        payload["summary"] = row.summary
+        payload["mentions"] = mentions.get(row.id, [])
+    return payloads
+
+
+def iter_event_export(
+    db: Session,
+    *,
+    since: datetime | None = None,
+    after_id: int | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream the whole ledger, ordered by `(recorded_at, id)`, one record per event
+    with its entity roles, mentions and source URL.
+
+    Events are read through a server-side cursor (`yield_per`), and roles and
+    mentions are loaded per batch of `batch_size` events, so memory does not grow
+    with the table. Pass the last exported `recorded_at` (and `id`, to break
+    ties) as `since` / `after_id` to resume from a watermark; `after_id` alone
+    is rejected rather than ignored.
+    """
+    if after_id is not None and since is None:
+        raise ValueError("after_id requires since")
+    stmt = select(*EVENT_COLUMNS, Event.amount_usd, Event.round, Event.summary)
+    since = naive_utc(since)
+    if since is not None:
+        if after_id is not None:
+            stmt = stmt.where(tuple_(Event.recorded_at, Event.id) > (since, after_id))
+        else:
+            stmt = stmt.where(Event.recorded_at > since)
+    result = db.execute(
+        stmt.order_by(Event.recorded_at, Event.id).execution_options(
+            stream_results=True, yield_per=batch_size
+        )
+    )
+    for partition in result.partitions():
+        yield from _export_batch(db, list(partition))
+
+
+def ndjson_lines(records: Iterator[dict[str, Any]]) -> Iterator[bytes]:
+    for record in records:
+        yield orjson.dumps(record) + b"\n"
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode("utf-8")
+    return value
+
+
+def csv_lines(records: Iterator[dict[str, Any]]) -> Iterator[str]:
+    """CSV with one row per event; nested fields (entities, mentions, attributes) as JSON."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow({field: _csv_value(record.get(field)) for field in CSV_FIELDS})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
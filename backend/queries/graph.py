@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from backend.models.entities import Entity
+from backend.models.events import Event
+from backend.models.graph import GraphEdge, GraphEventEdge
+from backend.queries.entities import frontend_entity_type
+from backend.queries.events import naive_utc
+
+
+def _aggregated_edges(
+    db: Session,
+    *,
+    start: datetime | None,
+    end: datetime | None,
+    types: Sequence[str] | None,
+    entity_ids: set[int] | None = None,
+    limit: int | None = None,
+    relationships_only: bool = False,
+):
+    query = db.query(
+        GraphEdge.source_entity_id,
+        GraphEdge.target_entity_id,
+        func.count(GraphEdge.id).label("count"),
+        func.sum(GraphEdge.weight).label("weight"),
+        func.max(GraphEdge.occurred_at).label("last_at"),
+    )
+    if start is not None:
+        query = query.filter(GraphEdge.occurred_at >= naive_utc(start))
+    if end is not None:
+        query = query.filter(GraphEdge.occurred_at <= naive_utc(end))
+    if types:
+        query = query.filter(GraphEdge.edge_type.in_(types))
+    if relationships_only:
+        query = query.filter(GraphEdge.relationship_id.isnot(None))
+    if entity_ids is not None:
+        query = query.filter(
+            or_(
+                GraphEdge.source_entity_id.in_(entity_ids),
+                GraphEdge.target_entity_id.in_(entity_ids),
+            )
+        )
+    query = query.group_by(GraphEdge.source_entity_id, GraphEdge.target_entity_id)
+    if limit is not None:
+        query = query.order_by(
+            func.sum(GraphEdge.weight).desc(),
+            GraphEdge.source_entity_id,
+            GraphEdge.target_entity_id,
+        ).limit(limit)
+    return query.all()
+
+
+def _event_edges(
+    db: Session,
+    node_ids: set[int],
+    *,
+    start: datetime | None,
+    end: datetime | None,
+    types: Sequence[str] | None,
+    limit: int,
+) -> list[GraphEventEdge]:
+    """Entity–event edges of the `limit` latest events linking two or more of `node_ids`."""
+    events = db.query(GraphEventEdge.event_id).filter(GraphEventEdge.entity_id.in_(node_ids))
+    if start is not None:
+        events = events.filter(GraphEventEdge.occurred_at >= naive_utc(start))
+    if end is not None:
+        events = events.filter(GraphEventEdge.occurred_at <= naive_utc(end))
+    if types:
+        events = events.filter(GraphEventEdge.edge_type.in_(types))
+    events = (
+        events.group_by(GraphEventEdge.event_id)
+        .having(func.count(GraphEventEdge.entity_id) >= 2)
+        .order_by(func.max(GraphEventEdge.occurred_at).desc(), GraphEventEdge.event_id.desc())
+        .limit(limit)
+    )
+    return (
+        db.query(GraphEventEdge)
+        .filter(GraphEventEdge.event_id.in_(events.subquery().select()))
+        .filter(GraphEventEdge.entity_id.in_(node_ids))
+        .order_by(GraphEventEdge.event_id, GraphEventEdge.entity_id)
+        .all()
+    )
+
+
+def _event_label(event_type: str, attributes: dict[str, Any] | None) -> str:
+    summary = (attributes or {}).get("summary")
+    if not summary:
+        return event_type
+    return summary if len(summary) <= 80 else summary[:77].rstrip() + "..."
+
+
+def query_graph(
+    db: Session,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    types: Sequence[str] | None = None,
+    entity_id: int | None = None,
+    hops: int = 1,
+    max_edges: int = 2000,
+    include_events: bool = False,
+) -> dict[str, Any]:
+    """
+    Build the `/graph` payload from the materialized `graph_edges` and
+    `graph_event_edges` tables.
+
+    Without `entity_id`, returns the `max_edges` heaviest entity pairs in the
+    window. With it, expands a `hops`-deep neighbourhood around the entity,
+    one aggregated query per hop. Either way the payload holds only node ids,
+    labels and aggregated edges (event count, summed weight, latest date).
+
+    With `include_events`, the same entities are linked through event nodes
+    instead: entity↔event↔entity paths for the `max_edges` latest events
+    joining two of them, plus entity–entity edges for recorded relationships
+    only.
+    """
+    filters = {"start": start, "end": end, "types": types}
+    edges: dict[tuple[int, int], Any] = {}
+
+    if entity_id is None:
+        for row in _aggregated_edges(db, limit=max_edges, **filters):
+            edges[(row.source_entity_id, row.target_entity_id)] = row
+        node_ids = {n for pair in edges for n in pair}
+    else:
+        node_ids = {entity_id}
+        frontier = {entity_id}
+        for _ in range(hops):
+            if not frontier or len(edges) >= max_edges:
+                break
+            found: set[int] = set()
+            for row in _aggregated_edges(db, entity_ids=frontier, **filters):
+                key = (row.source_entity_id, row.target_entity_id)
+                if key in edges or len(edges) >= max_edges:
+                    continue
+                edges[key] = row
+                found.update(key)
+            frontier = found - node_ids
+            node_ids |= found
+
+    event_nodes: list[dict[str, Any]] = []
+    event_edges: list[GraphEventEdge] = []
+    if include_events and node_ids:
+        edges = {
+            (row.source_entity_id, row.target_entity_id): row
+            for row in _aggregated_edges(
+                db, entity_ids=node_ids, relationships_only=True, **filters
+            )
+            if row.source_entity_id in node_ids and row.target_entity_id in node_ids
+        }
+        event_edges = _event_edges(db, node_ids, limit=max_edges, **filters)
+        event_ids = sorted({e.event_id for e in event_edges})
+        if event_ids:
+            rows = (
+                db.query(Event.id, Event.type, Event.attributes, Event.occurred_at)
+                .filter(Event.id.in_(event_ids))
+                .order_by(Event.id)
+            )
+            event_nodes = [
+                {
+                    "id": f"event_{event_id}",
+                    "label": _event_label(event_type, attributes),
+                    "type": "event",
+                    "event_type": event_type,
+                    "occurred_at": occurred_at.isoformat() if occurred_at else None,
+                }
+                for event_id, event_type, attributes, occurred_at in rows
+            ]
+
+    entities = (
+        db.query(Entity).filter(Entity.id.in_(node_ids)).all() if node_ids else []
+    )
+    graph_id = {e.id: e.external_id or f"db_{e.id}" for e in entities}
+    return {
+        "nodes": [
+            {"id": graph_id[e.id], "label": e.name, "type": frontend_entity_type(e)}
+            for e in sorted(entities, key=lambda e: e.id)
+        ]
+        + event_nodes,
+        "edges": [
+            {
+                "source": graph_id[source],
+                "target": graph_id[target],
+                "count": row.count,
+                "weight": round(float(row.weight or 0.0), 4),
+                "last_at": row.last_at.isoformat() if row.last_at else None,
+            }
+            for (source, target), row in edges.items()
+            if source in graph_id and target in graph_id
+        ]
+        + [
+            {
+                "source": graph_id[edge.entity_id],
+                "target": f"event_{edge.event_id}",
+                "role": edge.role,
+                "count": 1,
+                "weight": round(float(edge.weight or 0.0), 4),
+                "last_at": edge.occurred_at.isoformat() if edge.occurred_at else None,
+            }
+            for edge in event_edges
+            if edge.entity_id in graph_id
+        ],
+    }
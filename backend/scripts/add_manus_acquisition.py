@@ -8,13 +8,14 @@ Usage (from project root, with .venv activated):
     python -m backend.scripts.add_manus_acquisition
 """
 
-import json
 from datetime import datetime
 
 from backend.db.base import SessionLocal, init_db
+from backend.models.data_versions import DOCUMENTS, ENTITIES, EVENTS, bump_data_version
 from backend.models.documents import Document
 from backend.models.entities import Entity
 from backend.models.events import Event, EventEntityRole, Mention
+from backend.pipeline.graph_edges import refresh_event_edges
 
 
 def _get_or_create_entity(session, name: str, type_: str, external_id: str | None = None) -> Entity:
@@ -77,10 +78,10 @@ def main() -> None:
         ev = Event(
             type="acquisition",
             occurred_at=acquisition_date,
-            attributes=json.dumps({
+            attributes={
                 "amount_usd": 2_000_000_000,
                 "summary": "Meta acquired Manus AI for over $2B in December 2025. Manus builds AI agents for autonomous task execution and was originally founded in China in 2022 before relocating to Singapore.",
-            }),
+            },
             confidence=0.95,
         )
         session.add(ev)
@@ -115,6 +116,9 @@ def main() -> None:
             )
         )
 
+        session.flush()
+        refresh_event_edges(session, [ev.id])
+        bump_data_version(session, EVENTS, ENTITIES, DOCUMENTS)
         session.commit()
         print("Added Manus acquisition event: Meta acquired Manus for $2B in December 2025.")
     finally:
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+"""
+Benchmark daily briefing generation with a local stub of BedrockClient.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_briefing --events 20 200 2000 20000 --latency 0.5
+    python -m backend.scripts.bench_briefing --hourly 2000 --runs 24 --batches 6
+
+Seeds a throwaway SQLite database and generates briefings with a stub client
+whose latency grows with prompt size and which rejects prompts over
+`--context-tokens`, like a real model.
+
+With `--events`, each size is a day's worth of events and one cold briefing
+(no stored fragments); it reports the estimated size of the original single
+prompt (`json.dumps(indent=2)` of every event) next to the model calls,
+largest prompt, total prompt tokens and wall time.
+
+With `--hourly N`, `--runs` briefings are generated while N events arrive in
+`--batches` equal batches spread over them (by default one before each
+briefing), once reusing stored fragments and briefings and once regenerating
+every briefing from scratch; it reports total calls and prompt tokens of each.
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_TMP_DIR = tempfile.TemporaryDirectory()
+# Must be set before backend settings are imported.
+os.environ["AISCOPE_DATABASE_URL"] = f"sqlite:///{Path(_TMP_DIR.name) / 'bench.db'}"
+
+from backend.core.config import settings  # noqa: E402
+from backend.db.base import SessionLocal, engine, init_db  # noqa: E402
+from backend.llm.rate_limit import bedrock_limiter  # noqa: E402
+from backend.models.briefings import Briefing, BriefingFragment  # noqa: E402
+from backend.models.entities import Entity  # noqa: E402
+from backend.models.events import Event, EventEntityRole  # noqa: E402
+from backend.pipeline.daily_briefing import estimate_tokens, generate_daily_briefing  # noqa: E402
+
+
+class StubBriefingClient:
+    """Stands in for BedrockClient: size-dependent latency, canned summaries."""
+
+    model_id = "stub-model"
+
+    def __init__(self, latency: float, seconds_per_1k_tokens: float, context_tokens: int) -> None:
+        self.latency = latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.context_tokens = context_tokens
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.max_prompt_tokens = 0
+        self._lock = threading.Lock()
+
+    def invoke_json(self, prompt: str, max_tokens: int = 2048) -> dict:
+        bedrock_limiter().acquire()  # as BedrockClient does
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += tokens
+            self.max_prompt_tokens = max(self.max_prompt_tokens, tokens)
+        if tokens + max_tokens > self.context_tokens:
+            raise RuntimeError(f"prompt of {tokens} tokens exceeds the model context")
+        time.sleep(self.latency + self.seconds_per_1k_tokens * tokens / 1000)
+        ids = re.findall(r"^\[(\d+)\]", prompt, flags=re.MULTILINE)
+        if '"fragments"' in prompt:
+            return {"fragments": {event_id: f"Event {event_id} matters." for event_id in ids}}
+        return {"briefing_markdown": "\n".join(f"- Event {event_id} matters." for event_id in ids[:10])}
+
+
+def _reset() -> None:
+    with SessionLocal() as session:
+        session.query(Briefing).delete()
+        session.query(BriefingFragment).delete()
+        session.query(EventEntityRole).delete()
+        session.query(Event).delete()
+        session.query(Entity).delete()
+        session.commit()
+
+
+def _seed(n_events: int, offset: int = 0, n_companies: int | None = None) -> None:
+    """Add events `offset`..`offset + n_events` recorded over the last ten hours."""
+    now = datetime.utcnow()
+    with SessionLocal() as session:
+        companies = session.query(Entity).order_by(Entity.id).all()
+        if not companies:
+            n_companies = n_companies or max(10, n_events // 4)
+            companies = [Entity(name=f"Company {i}", type="company") for i in range(n_companies)]
+            session.add_all(companies)
+            session.flush()
+        for i in range(offset, offset + n_events):
+            ev = Event(
+                type=("funding", "acquisition", "product_launch", "partnership")[i % 4],
+                occurred_at=now - timedelta(hours=i % 24),
+                attributes={
+                    "amount_usd": 1_000_000 * (i % 500 + 1),
+                    "round": "Series A",
+                    "summary": f"Company {i % len(companies)} announced development number {i} "
+                    "with details about the product, the investors and the market it targets.",
+                },
+                confidence=0.5 + (i % 50) / 100,
+            )
+            ev.recorded_at = now - timedelta(minutes=i % 600)
+            session.add(ev)
+            session.flush()
+            session.add(
+                EventEntityRole(event_id=ev.id, entity_id=companies[i % len(companies)].id, role="company")
+            )
+        session.commit()
+
+
+def _legacy_prompt_tokens() -> int:
+    """Size of the previous single prompt: every event in the window, indented JSON."""
+    with SessionLocal() as session:
+        events = session.query(Event).all()
+        serializable = [
+            {
+                "id": ev.id,
+                "type": ev.type,
+                "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
+                "attributes": ev.attributes,
+                "confidence": ev.confidence,
+            }
+            for ev in events
+        ]
+    return estimate_tokens(json.dumps(serializable, indent=2))
+
+
+def _hourly(args) -> None:
+    """Briefing after each batch of arriving events, incremental vs. from scratch."""
+    print(f"{'mode':>12} {'runs':>5} {'events':>7} {'calls':>6} {'total tok':>10} {'seconds':>8}")
+    batches = min(args.batches or args.runs, args.runs)
+    per_batch = args.hourly // batches
+    every = args.runs // batches
+    for mode in ("incremental", "scratch"):
+        _reset()
+        client = StubBriefingClient(args.latency, args.seconds_per_1k_tokens, args.context_tokens)
+        start = time.perf_counter()
+        for run in range(args.runs):
+            if run % every == 0 and run // every < batches:
+                batch = run // every
+                _seed(per_batch, offset=batch * per_batch, n_companies=max(10, args.hourly // 4))
+            if mode == "scratch":
+                with SessionLocal() as session:
+                    session.query(BriefingFragment).delete()
+                    session.query(Briefing).delete()
+                    session.commit()
+            briefing = generate_daily_briefing(hours=24, client=client)
+            assert briefing is not None and briefing.content_markdown
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:>12} {args.runs:>5} {per_batch * batches:>7} {client.calls:>6} "
+            f"{client.prompt_tokens:>10} {elapsed:>8.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, nargs="+", default=[20, 200, 2_000, 20_000])
+    parser.add_argument("--hourly", type=int, default=0, help="events arriving over --runs briefings")
+    parser.add_argument("--runs", type=int, default=24)
+    parser.add_argument("--batches", type=int, default=0, help="default: one batch per run")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.1)
+    parser.add_argument("--context-tokens", type=int, default=32_000)
+    parser.add_argument("--rps", type=float, default=20.0)
+    args = parser.parse_args()
+
+    settings.bedrock_requests_per_second = args.rps
+    settings.bedrock_burst = settings.briefing_workers
+
+    init_db()
+    if args.hourly:
+        _hourly(args)
+        engine.dispose()
+        return
+
+    print(
+        f"{'events':>7} {'legacy tok':>11} {'calls':>6} {'max tok':>8} "
+        f"{'total tok':>10} {'seconds':>8}"
+    )
+    for n_events in args.events:
+        _reset()
+        _seed(n_events)
+        client = StubBriefingClient(args.latency, args.seconds_per_1k_tokens, args.context_tokens)
+        start = time.perf_counter()
+        briefing = generate_daily_briefing(hours=24, client=client)
+        elapsed = time.perf_counter() - start
+        assert briefing is not None and briefing.content_markdown
+        print(
+            f"{n_events:>7} {_legacy_prompt_tokens():>11} {client.calls:>6} "
+            f"{client.max_prompt_tokens:>8} {client.prompt_tokens:>10} {elapsed:>8.2f}"
+        )
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+"""
+Benchmark API reads while the pipeline writes, on SQLite.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_db_concurrency --readers 16 --seconds 30 --repeats 3
+
+Runs N reader processes paging `/events` (query + payload assembly) against one
+writer process committing events in small transactions, as the extraction
+pipeline does. It compares `make_engine` with the default `sqlite_*` settings
+(SQLite's own: rollback journal, FULL sync) against WAL with NORMAL sync and a
+larger page cache and mmap, reporting reader p50/p99 latency, reader errors
+(e.g. "database is locked") and writer commits per second. Both engines come
+from `make_engine`, so they carry the same query instrumentation, and each
+repeat alternates which engine runs first so neither always gets the warmer
+page cache.
+"""
+
+import argparse
+import multiprocessing as mp
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.config import Settings
+from backend.db.base import Base, make_engine
+from backend.models import briefings, data_versions, documents, entities, events, extraction_cache, graph, pipeline_state  # noqa: F401
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole
+from backend.queries.events import load_event_payloads, query_event_page
+
+
+def _seed(Session, n_events: int) -> list[int]:
+    now = datetime.utcnow()
+    with Session() as session:
+        companies = [Entity(name=f"Company {i}", type="company") for i in range(100)]
+        session.add_all(companies)
+        session.flush()
+        for i in range(n_events):
+            ev = Event(
+                type="funding",
+                occurred_at=now - timedelta(hours=i),
+                attributes={"amount_usd": 1_000_000 * i, "summary": f"Event {i}"},
+                confidence=0.9,
+            )
+            session.add(ev)
+            session.flush()
+            session.add(EventEntityRole(event_id=ev.id, entity_id=companies[i % 100].id, role="company"))
+        session.commit()
+        return [c.id for c in companies]
+
+
+# The settings under test against the defaults.
+_WAL_SETTINGS = {
+    "sqlite_journal_mode": "wal",
+    "sqlite_synchronous": "normal",
+    "sqlite_cache_size_kib": 64 * 1024,
+    "sqlite_mmap_size_bytes": 256 * 1024 * 1024,
+}
+
+
+def _engine(path: Path, wal: bool):
+    return make_engine(f"sqlite:///{path}", Settings(**_WAL_SETTINGS) if wal else Settings())
+
+
+def _reader(path: Path, wal: bool, deadline: float, out: mp.Queue) -> None:
+    Session = sessionmaker(bind=_engine(path, wal), autoflush=False, future=True)
+    latencies, errors = [], 0
+    while time.time() < deadline:
+        t0 = time.perf_counter()
+        try:
+            with Session() as db:
+                page, _ = query_event_page(db, limit=200)
+                load_event_payloads(db, page)
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - t0) * 1000)
+    out.put(("reader", latencies, errors))
+
+
+def _writer(
+    path: Path, wal: bool, deadline: float, company_ids: list[int], batch: int, out: mp.Queue
+) -> None:
+    Session = sessionmaker(bind=_engine(path, wal), autoflush=False, future=True)
+    commits, errors, i = 0, 0, 0
+    while time.time() < deadline:
+        try:
+            with Session() as db:
+                # One document's (or feed's) worth of pipeline output per commit.
+                for _ in range(batch):
+                    ev = Event(type="launch", occurred_at=datetime.utcnow(), attributes={"summary": f"w{i}"})
+                    db.add(ev)
+                    db.flush()
+                    db.add(EventEntityRole(event_id=ev.id, entity_id=company_ids[i % len(company_ids)]))
+                    i += 1
+                db.commit()
+                commits += 1
+        except OperationalError:
+            errors += 1
+    out.put(("writer", commits, errors))
+
+
+def _run(label: str, path: Path, wal: bool, args: argparse.Namespace) -> tuple[float, float]:
+    engine = _engine(path, wal)
+    Base.metadata.create_all(bind=engine)
+    company_ids = _seed(sessionmaker(bind=engine, future=True), args.seed_events)
+    engine.dispose()
+
+    out: mp.Queue = mp.Queue()
+    deadline = time.time() + args.seconds
+    procs = [mp.Process(target=_reader, args=(path, wal, deadline, out)) for _ in range(args.readers)]
+    procs.append(
+        mp.Process(target=_writer, args=(path, wal, deadline, company_ids, args.write_batch, out))
+    )
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    latencies = sorted(x for kind, lat, _ in results if kind == "reader" for x in lat)
+    errors = sum(err for _, _, err in results)
+    commits = next(c for kind, c, _ in results if kind == "writer")
+    p50 = statistics.median(latencies) if latencies else float("nan")
+    p99 = latencies[int(0.99 * (len(latencies) - 1))] if latencies else float("nan")
+    reads, commits_per_second = len(latencies) / args.seconds, commits / args.seconds
+    print(
+        f"{label:>8} {reads:>9.1f} {p50:>9.2f} {p99:>9.2f} "
+        f"{errors:>7} {commits_per_second:>10.1f}"
+    )
+    return reads, commits_per_second
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed-events", type=int, default=2000)
+    parser.add_argument("--write-batch", type=int, default=20, help="Events per writer commit")
+    args = parser.parse_args()
+
+    print(f"{'engine':>8} {'reads/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'commits/s':>10}")
+    results: dict[str, list[tuple[float, float]]] = {"default": [], "wal": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for repeat in range(args.repeats):
+            order = [("default", False), ("wal", True)]
+            for label, wal in order if repeat % 2 == 0 else reversed(order):
+                path = Path(tmp) / f"{label}-{repeat}.db"
+                results[label].append(_run(label, path, wal, args))
+    print("\nmedian over repeats")
+    for label, runs in results.items():
+        reads = statistics.median(r for r, _ in runs)
+        commits = statistics.median(c for _, c in runs)
+        print(f"{label:>8} {reads:>9.1f} reads/s {commits:>10.1f} commits/s")
+
+
+if __name__ == "__main__":
+    main()
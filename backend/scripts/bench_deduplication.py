@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+"""
+Benchmark near-duplicate event clustering: recall vs. time.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_deduplication --events 5000 100000 300000
+
+Generates a synthetic ledger in memory: stories (type, 1-3 entities, amount,
+date, summary) each reported by one to five outlets, with reworded summaries,
+jittered dates, rounded or missing amounts and occasionally a dropped entity.
+For each size it runs `find_duplicate_clusters` with several MinHash / LSH
+shapes and, for small sizes, an exact all-pairs Jaccard baseline, reporting
+wall time, candidate pairs, and pair recall / precision against the stories.
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import combinations
+
+import numpy as np
+
+from backend.pipeline.deduplication import (
+    BANDS,
+    MIN_SIMILARITY,
+    NUM_PERM,
+    WINDOW,
+    DedupItem,
+    MinHashLSH,
+    _compatible,
+    event_features,
+    find_duplicate_clusters,
+)
+
+
+_TYPES = ("funding", "acquisition", "product_launch", "partnership")
+_ROUNDS = ("Seed", "Series A", "Series B", "Series C", None)
+
+
+def _synthetic_ledger(n_events: int, seed: int = 11) -> tuple[list[DedupItem], dict[int, int]]:
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(20_000)]
+    n_entities = max(100, n_events // 5)
+    now = datetime(2025, 1, 1)
+    items: list[DedupItem] = []
+    story_of: dict[int, int] = {}
+    story = 0
+    while len(items) < n_events:
+        story += 1
+        event_type = rng.choice(_TYPES)
+        entities = rng.sample(range(1, n_entities), rng.randint(1, 3))
+        amount = 10 ** rng.uniform(6, 10) if rng.random() < 0.7 else None
+        round_ = rng.choice(_ROUNDS) if event_type == "funding" else None
+        occurred = now - timedelta(minutes=rng.randrange(60 * 24 * 365 * 2))
+        words = [rng.choice(vocab) for _ in range(14)]
+        for _ in range(min(rng.choice((1, 1, 1, 2, 2, 3, 4, 5)), n_events - len(items))):
+            summary = [w if rng.random() > 0.25 else rng.choice(vocab) for w in words]
+            rng.shuffle(summary)
+            reported_entities = list(entities)
+            if len(reported_entities) > 1 and rng.random() < 0.2:
+                reported_entities.pop()
+            reported_amount = amount
+            if amount is not None:
+                reported_amount = None if rng.random() < 0.15 else amount * rng.uniform(0.98, 1.02)
+            event_id = len(items) + 1
+            items.append(
+                DedupItem(
+                    id=event_id,
+                    type=event_type,
+                    occurred_at=occurred + timedelta(hours=rng.uniform(-48, 48)),
+                    recorded_at=now + timedelta(seconds=event_id),
+                    amount_usd=reported_amount,
+                    round=round_,
+                    summary=" ".join(summary),
+                    entity_ids=tuple(sorted(reported_entities)),
+                )
+            )
+            story_of[event_id] = story
+    return items, story_of
+
+
+def _true_pairs(story_of: dict[int, int]) -> set[tuple[int, int]]:
+    by_story: dict[int, list[int]] = defaultdict(list)
+    for event_id, story in story_of.items():
+        by_story[story].append(event_id)
+    return {pair for ids in by_story.values() for pair in combinations(sorted(ids), 2)}
+
+
+def _cluster_pairs(clusters: list[list[int]]) -> set[tuple[int, int]]:
+    return {pair for ids in clusters for pair in combinations(sorted(ids), 2)}
+
+
+def _exact_clusters(items: list[DedupItem]) -> list[list[int]]:
+    """All-pairs exact Jaccard within each type, with the same guards."""
+    features = [event_features(it) for it in items]
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    by_type: dict[str, list[int]] = defaultdict(list)
+    for i, item in enumerate(items):
+        by_type[item.type].append(i)
+    for members in by_type.values():
+        for i, j in combinations(members, 2):
+            a, b = features[i], features[j]
+            if len(a & b) / len(a | b) >= MIN_SIMILARITY and _compatible(items[i], items[j], WINDOW):
+                parent[find(j)] = find(i)
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i, item in enumerate(items):
+        groups[find(i)].append(item.id)
+    return [ids for ids in groups.values() if len(ids) > 1]
+
+
+def _report(n_events, label, seconds, candidates, predicted, truth) -> None:
+    hits = len(predicted & truth)
+    recall = hits / len(truth) if truth else 1.0
+    precision = hits / len(predicted) if predicted else 1.0
+    print(
+        f"{n_events:>7} {label:>14} {seconds:>8.2f} {candidates:>11} "
+        f"{recall:>7.3f} {precision:>9.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, nargs="+", default=[5_000, 100_000, 300_000])
+    parser.add_argument("--exact-up-to", type=int, default=5_000)
+    parser.add_argument("--shapes-up-to", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'events':>7} {'method':>14} {'seconds':>8} {'candidates':>11} {'recall':>7} {'precision':>9}")
+    for n_events in args.events:
+        items, story_of = _synthetic_ledger(n_events)
+        truth = _true_pairs(story_of)
+
+        if n_events <= args.exact_up_to:
+            t0 = time.perf_counter()
+            clusters = _exact_clusters(items)
+            elapsed = time.perf_counter() - t0
+            _report(n_events, "exact", elapsed, "all", _cluster_pairs(clusters), truth)
+
+        shapes = [(NUM_PERM, BANDS)]
+        if n_events <= args.shapes_up_to:
+            shapes = [(32, 16), (64, 16), (64, 32), (128, 64)]
+        for num_perm, bands in shapes:
+            lsh = MinHashLSH(num_perm=num_perm, bands=bands)
+            t0 = time.perf_counter()
+            clusters = find_duplicate_clusters(items, lsh=lsh)
+            elapsed = time.perf_counter() - t0
+            # Candidate count is measured separately so it does not skew the timing.
+            signatures = lsh.signatures([event_features(it) for it in items])
+            codes = {t: c for c, t in enumerate(_TYPES)}
+            blocks = np.array([codes[it.type] for it in items], dtype=np.uint64)
+            candidates = len(lsh.candidate_pairs(signatures, blocks)[0])
+            predicted = _cluster_pairs([[event_id for event_id, _ in c] for c in clusters])
+            _report(n_events, f"lsh {num_perm}/{bands}", elapsed, candidates, predicted, truth)
+
+
+if __name__ == "__main__":
+    main()
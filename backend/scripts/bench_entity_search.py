@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""
+Benchmark entity search: in-process name/alias index vs. ILIKE '%query%'.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_entity_search --entities 100000 --queries 500
+
+Synthetic entities (with aliases) are written to a throwaway SQLite database.
+The script reports index build time and p50/p99 latency for typeahead-style
+prefix queries and misspelled queries, next to the old ILIKE scan.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.base import Base
+from backend.models import briefings, documents, entities, events  # noqa: F401
+from backend.models.entities import Entity
+from backend.search.entity_index import EntitySearchIndex
+
+_SYLLABLES = ["neo", "deep", "mind", "ai", "lab", "quant", "tensor", "graph", "vision", "scale",
+              "cloud", "data", "bio", "robo", "gen", "sense", "logic", "core", "flux", "nova"]
+_SUFFIXES = ["", " AI", " Labs", " Inc", " Systems", " Technologies", " Research"]
+
+
+def _name(rng: random.Random) -> str:
+    stem = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    return f"{stem}{rng.randint(0, 999)}{rng.choice(_SUFFIXES)}"
+
+
+def _typo(rng: random.Random, s: str) -> str:
+    i = rng.randrange(len(s))
+    return s[:i] + rng.choice(string.ascii_lowercase) + s[i + 1 :]
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    samples = sorted(samples)
+    return statistics.median(samples), samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--ilike-queries", type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", future=True)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, future=True)
+
+        names = [_name(rng) for _ in range(args.entities)]
+        with Session() as session:
+            session.add_all(
+                Entity(
+                    name=name,
+                    type="company",
+                    aliases=json.dumps([name.replace(" ", "")]) if i % 5 == 0 else None,
+                )
+                for i, name in enumerate(names)
+            )
+            session.commit()
+
+            start = time.perf_counter()
+            rows = session.query(
+                Entity.id, Entity.name, Entity.type, Entity.external_id, Entity.aliases
+            ).all()
+            index = EntitySearchIndex(rows)
+            print(f"{len(index)} entities, index built in {time.perf_counter() - start:.2f}s\n")
+
+            targets = [rng.choice(names) for _ in range(args.queries)]
+            workloads = {
+                "prefix": [t[: rng.randint(2, 6)] for t in targets],
+                "typo": [_typo(rng, t.split()[0]) for t in targets],
+            }
+            print(f"{'workload':>12} {'p50 ms':>9} {'p99 ms':>9}")
+            for label, queries in workloads.items():
+                timings = []
+                for q in queries:
+                    t0 = time.perf_counter()
+                    index.search(q, limit=10)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                p50, p99 = _percentiles(timings)
+                print(f"{label:>12} {p50:>9.3f} {p99:>9.3f}")
+
+            timings = []
+            for q in workloads["prefix"][: args.ilike_queries]:
+                t0 = time.perf_counter()
+                session.query(Entity).filter(Entity.name.ilike(f"%{q}%")).first()
+                timings.append((time.perf_counter() - t0) * 1000)
+            p50, p99 = _percentiles(timings)
+            print(f"{'ilike scan':>12} {p50:>9.3f} {p99:>9.3f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+"""
+Benchmark the `/events` payload assembly against a throwaway SQLite database.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_events_endpoint --events 3000 --runs 50
+
+It seeds a few thousand events (each with two entity roles and a source document),
+then compares the legacy per-event loading (three queries per event) with the
+batched `load_event_payloads`, reporting query count and p50/p99 latency per page.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.base import Base
+from backend.models import briefings, documents, entities, events  # noqa: F401
+from backend.models.documents import Document
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole, Mention
+from backend.queries.events import load_event_payloads
+
+
+def _seed(session, n_events: int) -> None:
+    now = datetime.utcnow()
+    companies = [Entity(name=f"Company {i}", type="company") for i in range(200)]
+    session.add_all(companies)
+    session.flush()
+
+    for i in range(n_events):
+        doc = Document(
+            url=f"https://example.com/articles/{i}",
+            title=f"Article {i}",
+            source_name="Bench",
+            published_at=now - timedelta(hours=i),
+            content=f"Article body {i}",
+            content_hash=f"bench-{i}",
+        )
+        ev = Event(
+            type="funding",
+            occurred_at=now - timedelta(hours=i),
+            attributes={"amount_usd": 1_000_000 * i, "summary": f"Event {i}"},
+            confidence=0.9,
+        )
+        session.add_all([doc, ev])
+        session.flush()
+        a = companies[i % len(companies)]
+        b = companies[(i * 7 + 3) % len(companies)]
+        session.add_all(
+            [
+                EventEntityRole(event_id=ev.id, entity_id=a.id, role="company"),
+                EventEntityRole(event_id=ev.id, entity_id=b.id, role="investor"),
+                Mention(document_id=doc.id, entity_id=a.id, event_id=ev.id),
+            ]
+        )
+    session.commit()
+
+
+def _legacy_payloads(db, events_page) -> list[dict]:
+    """The original `/events` loop: one roles, one mention and one document query per event."""
+    result = []
+    for ev in events_page:
+        entity_roles = (
+            db.query(EventEntityRole, Entity)
+            .join(Entity, EventEntityRole.entity_id == Entity.id)
+            .filter(EventEntityRole.event_id == ev.id)
+            .all()
+        )
+        entities_ = [
+            {"name": entity.name, "type": entity.type, "role": role.role}
+            for role, entity in entity_roles
+        ]
+        mention = db.query(Mention).filter(Mention.event_id == ev.id).first()
+        source_url = None
+        if mention:
+            doc = db.query(Document).filter(Document.id == mention.document_id).first()
+            if doc:
+                source_url = doc.url
+        result.append(
+            {
+                "id": ev.id,
+                "type": ev.type,
+                "occurred_at": ev.occurred_at.isoformat() if ev.occurred_at else None,
+                "recorded_at": ev.recorded_at.isoformat() if ev.recorded_at else None,
+                "attributes": ev.attributes,
+                "confidence": ev.confidence,
+                "entities": entities_,
+                "source_url": source_url,
+            }
+        )
+    return result
+
+
+def _measure(Session, loader, page_size: int, runs: int) -> tuple[int, float, float]:
+    timings: list[float] = []
+    queries = 0
+    for _ in range(runs):
+        with Session() as db:
+            counter = {"n": 0}
+
+            def _count(*_args, **_kwargs) -> None:
+                counter["n"] += 1
+
+            conn = db.connection()
+            event.listen(conn, "before_cursor_execute", _count)
+            start = time.perf_counter()
+            page = (
+                db.query(Event)
+                .order_by(Event.occurred_at.desc().nullslast())
+                .limit(page_size)
+                .all()
+            )
+            loader(db, page)
+            timings.append((time.perf_counter() - start) * 1000)
+            event.remove(conn, "before_cursor_execute", _count)
+            queries = counter["n"]
+
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(round(0.99 * (len(timings) - 1))))]
+    return queries, p50, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", future=True)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False, future=True)
+
+        with Session() as session:
+            _seed(session, args.events)
+        print(f"Seeded {args.events} events\n")
+
+        print(f"{'page':>6} {'impl':>8} {'queries':>8} {'p50 ms':>9} {'p99 ms':>9}")
+        for page_size in args.page_sizes:
+            for label, loader in (("legacy", _legacy_payloads), ("batched", load_event_payloads)):
+                queries, p50, p99 = _measure(Session, loader, page_size, args.runs)
+                print(f"{page_size:>6} {label:>8} {queries:>8} {p50:>9.2f} {p99:>9.2f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
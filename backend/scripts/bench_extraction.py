@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+"""
+Benchmark concurrent event extraction with a local stub of BedrockClient.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_extraction --docs 40 --latency 0.25 --workers 1 2 4 8
+
+Each stub call sleeps for `--latency` seconds and returns one funding event, so
+no AWS credentials are needed. Documents live in a throwaway SQLite database
+and are reset between runs. Throughput should grow roughly linearly with the
+worker count until it reaches `--rps` (the token-bucket rate limit). A final
+rerun over the same content shows the extraction cache absorbing every call.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+_TMP_DIR = tempfile.TemporaryDirectory()
+# Must be set before backend settings are imported.
+os.environ["AISCOPE_DATABASE_URL"] = f"sqlite:///{Path(_TMP_DIR.name) / 'bench.db'}"
+
+from backend.core.config import settings  # noqa: E402
+from backend.db.base import SessionLocal, engine, init_db  # noqa: E402
+from backend.llm.event_extractor import EventExtractor  # noqa: E402
+from backend.models.documents import Document, DocumentProcessingState  # noqa: E402
+from backend.models.entities import Entity  # noqa: E402
+from backend.models.events import Event, EventEntityRole, Mention  # noqa: E402
+from backend.models.extraction_cache import ExtractionCacheEntry  # noqa: E402
+from backend.pipeline.extract_events import run_extraction_for_unprocessed_documents  # noqa: E402
+
+
+class StubBedrockClient:
+    """Stands in for BedrockClient: fixed latency, canned extraction output."""
+
+    model_id = "stub-model"
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke_json(self, prompt: str, max_tokens: int = 2048) -> dict:
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+        return {
+            "events": [
+                {
+                    "type": "funding",
+                    "occurred_at": "2025-01-06T00:00:00",
+                    "entities": [
+                        {"name": "OpenAI", "type": "company", "role": "company"},
+                        {"name": "Thrive Capital", "type": "investor", "role": "investor"},
+                    ],
+                    "attributes": {"amount_usd": 1_000_000, "summary": prompt[-40:]},
+                    "confidence": 0.9,
+                }
+            ]
+        }
+
+
+def _seed(n_docs: int) -> None:
+    with SessionLocal() as session:
+        session.add_all(
+            Document(
+                url=f"https://example.com/bench/{i}",
+                title=f"Story {i}",
+                content=f"Story {i}: OpenAI raises money.",
+                content_hash=f"bench-extract-{i}",
+            )
+            for i in range(n_docs)
+        )
+        session.commit()
+
+
+def _reset_extractions(clear_cache: bool = True) -> None:
+    with SessionLocal() as session:
+        models = [DocumentProcessingState, Mention, EventEntityRole, Event, Entity]
+        if clear_cache:
+            models.append(ExtractionCacheEntry)
+        for model in models:
+            session.query(model).delete()
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rps", type=float, default=20.0)
+    args = parser.parse_args()
+
+    settings.bedrock_requests_per_second = args.rps
+    settings.bedrock_burst = 1
+
+    init_db()
+    _seed(args.docs)
+    print(f"{args.docs} documents, {args.latency:.2f}s per call, limit {args.rps:.1f} req/s\n")
+    print(f"{'workers':>8} {'seconds':>9} {'docs/s':>8} {'events':>7}")
+
+    for workers in args.workers:
+        _reset_extractions()
+        client = StubBedrockClient(args.latency)
+        start = time.perf_counter()
+        created = run_extraction_for_unprocessed_documents(
+            limit=args.docs, workers=workers, extractor=EventExtractor(client=client)
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>9.2f} {client.calls / elapsed:>8.2f} {created:>7}")
+
+    # Re-extract the same content: every document should be served from the cache.
+    _reset_extractions(clear_cache=False)
+    client = StubBedrockClient(args.latency)
+    start = time.perf_counter()
+    created = run_extraction_for_unprocessed_documents(
+        limit=args.docs, extractor=EventExtractor(client=client)
+    )
+    elapsed = time.perf_counter() - start
+    print(f"\ncached rerun: {elapsed:.2f}s, {client.calls} model calls, {created} events")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+"""
+Benchmark RSS ingestion against a local stand-in HTTP server.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_ingestion --feeds 12 --entries 50 --max-delay 1.0
+
+The script serves synthetic RSS feeds from a local HTTP server, each with its
+own response delay, and ingests them into a throwaway SQLite database twice:
+once with the legacy sequential loop and once with `fetch_rss_documents`,
+then re-polls with the stored ETags to show the conditional-GET path.
+Each feed is addressed through its own loopback IP (127.0.0.N) so that the
+per-host concurrency cap applies the same way it would for distinct sites.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_TMP_DIR = tempfile.TemporaryDirectory()
+# Must be set before backend settings are imported.
+os.environ["AISCOPE_DATABASE_URL"] = f"sqlite:///{Path(_TMP_DIR.name) / 'bench.db'}"
+
+import feedparser  # noqa: E402
+
+from backend.db.base import Base, SessionLocal, engine, init_db  # noqa: E402
+from backend.ingestion import fetcher  # noqa: E402
+from backend.models.documents import Document  # noqa: E402
+
+
+def _rss(feed_no: int, n_entries: int) -> bytes:
+    items = "".join(
+        f"<item><title>Feed {feed_no} story {i}</title>"
+        f"<link>https://example.com/{feed_no}/{i}</link>"
+        f"<description>Summary of story {i} from feed {feed_no}.</description>"
+        f"<pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item>"
+        for i in range(n_entries)
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel>'
+        f"<title>Feed {feed_no}</title>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def _serve(delays: dict[int, float], n_entries: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            feed_no = int(self.path.strip("/").split("/")[-1])
+            time.sleep(delays.get(feed_no, 0.0))
+            etag = f'"feed-{feed_no}-{n_entries}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = _rss(feed_no, n_entries)
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _legacy_ingest(feeds: list[dict]) -> int:
+    """The original loop: feedparser.parse(url) on each feed, one after another."""
+    session = SessionLocal()
+    new_count = 0
+    try:
+        for feed_cfg in feeds:
+            parsed = feedparser.parse(feed_cfg["url"])
+            new_count += fetcher._store_feed_entries(session, feed_cfg, parsed.entries)
+        session.commit()
+        return new_count
+    finally:
+        session.close()
+
+
+def _reset_documents() -> None:
+    with SessionLocal() as session:
+        session.query(Document).delete()
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=12)
+    parser.add_argument("--entries", type=int, default=50)
+    parser.add_argument("--max-delay", type=float, default=1.0)
+    args = parser.parse_args()
+
+    delays = {i: args.max_delay * (i + 1) / args.feeds for i in range(args.feeds)}
+    server = _serve(delays, args.entries)
+    port = server.server_address[1]
+    feeds = [
+        {"name": f"Feed {i}", "url": f"http://127.0.0.{i % 250 + 1}:{port}/feed/{i}"}
+        for i in range(args.feeds)
+    ]
+
+    init_db()
+    slowest, total = max(delays.values()), sum(delays.values())
+    print(f"{args.feeds} feeds, slowest {slowest:.2f}s, sum {total:.2f}s\n")
+
+    runs = (("sequential", _legacy_ingest), ("concurrent", fetcher.fetch_rss_documents))
+    for label, ingest in runs:
+        _reset_documents()
+        start = time.perf_counter()
+        added = ingest(feeds)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>11}: {elapsed:6.2f}s  ({added} documents)")
+
+    start = time.perf_counter()
+    fetcher.fetch_rss_documents(feeds)
+    elapsed = time.perf_counter() - start
+    stats = fetcher.conditional_get_stats.snapshot()
+    print(f"{'re-poll':>11}: {elapsed:6.2f}s  (304 hits {stats['hits']}, misses {stats['misses']})")
+
+    server.shutdown()
+    engine.dispose()
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+"""
+Benchmark `/events` response serialization: FastAPI's default path vs orjson.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_json_responses --sizes 200 2000 20000 --runs 20
+
+For each payload size it compares:
+  - row loading: ORM `Event` objects vs `EVENT_COLUMNS` Core rows;
+  - serialization: `jsonable_encoder` + `json.dumps` on pre-formatted ISO
+    strings (the previous path) vs a single `orjson.dumps` with native datetimes;
+  - bytes on the wire for a full 200 response and for a 304 revalidation.
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.responses import FastJSONResponse, json_response
+from backend.db.base import Base
+from backend.models import briefings, data_versions, documents, entities, events, extraction_cache, graph, pipeline_state  # noqa: F401
+from backend.models.events import Event
+from backend.queries.events import EVENT_COLUMNS
+
+
+def _payload(rows, iso: bool) -> list[dict]:
+    def fmt(value: datetime | None):
+        return value.isoformat() if iso and value else value
+
+    return [
+        {
+            "id": r.id,
+            "type": r.type,
+            "occurred_at": fmt(r.occurred_at),
+            "recorded_at": fmt(r.recorded_at),
+            "attributes": r.attributes,
+            "confidence": r.confidence,
+            "entities": [
+                {"name": "Company A", "type": "company", "role": "company"},
+                {"name": "Company B", "type": "company", "role": "investor"},
+            ],
+            "source_url": f"https://example.com/articles/{r.id}",
+        }
+        for r in rows
+    ]
+
+
+def _time(fn, runs: int) -> tuple[float, object]:
+    samples, result = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+def _default_render(payload) -> bytes:
+    # What FastAPI does for a handler returning a list of dicts.
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2_000, 20_000])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", future=True)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, future=True)
+        now = datetime.utcnow()
+        with Session() as session:
+            session.add_all(
+                Event(
+                    type="funding",
+                    occurred_at=now - timedelta(hours=i),
+                    attributes={"amount_usd": 1_000_000 * i, "round": "Series A", "summary": f"Event {i}"},
+                    confidence=0.9,
+                )
+                for i in range(max(args.sizes))
+            )
+            session.commit()
+
+        print(
+            f"{'events':>7} {'orm ms':>8} {'core ms':>8} {'default ms':>11} {'orjson ms':>10} "
+            f"{'bytes':>10} {'304 bytes':>10}"
+        )
+        for size in args.sizes:
+            with Session() as session:
+                orm_ms, _ = _time(lambda: session.query(Event).limit(size).all(), args.runs)
+                session.expunge_all()
+                core_ms, rows = _time(
+                    lambda: session.query(*EVENT_COLUMNS).limit(size).all(), args.runs
+                )
+
+            legacy_payload = _payload(rows, iso=True)
+            fast_payload = _payload(rows, iso=False)
+            default_ms, default_body = _time(lambda: _default_render(legacy_payload), args.runs)
+            fast_ms, fast_body = _time(lambda: FastJSONResponse(fast_payload).body, args.runs)
+            assert json.loads(default_body) == json.loads(fast_body)
+
+            print(
+                f"{size:>7} {orm_ms:>8.2f} {core_ms:>8.2f} {default_ms:>11.2f} {fast_ms:>10.2f} "
+                f"{len(fast_body):>10} {_revalidated_bytes(fast_payload):>10}"
+            )
+        engine.dispose()
+
+
+def _revalidated_bytes(payload) -> int:
+    """Wire size of the 304 answer to a client that already holds `payload`."""
+    etag = json_response(_request(), payload).headers["etag"]
+    response = json_response(_request({"if-none-match": etag}), payload)
+    assert response.status_code == 304
+    return len(response.body) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/events", "headers": raw})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+"""
+Benchmark novelty labelling against a throwaway SQLite database.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.bench_novelty --events 1000 5000 20000
+
+For each ledger size it labels every event twice: with the original per-event
+heuristic (one ±7 day window query per event) and with `label_novelty`
+(one query for the targets, one for the surrounding span, then a sweep).
+Reports query counts, wall time and the label distribution of each method.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.base import Base
+from backend.models import briefings, documents, entities, events  # noqa: F401
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole, EventNoveltyLabel
+from backend.pipeline.change_detection import label_novelty
+
+
+_TYPES = ("funding", "acquisition", "product_launch", "partnership")
+
+
+def _seed(session, n_events: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    companies = [
+        Entity(name=f"Company {i}", type="company") for i in range(max(50, n_events // 10))
+    ]
+    session.add_all(companies)
+    session.flush()
+
+    span_hours = n_events * 2
+    for _ in range(n_events):
+        ev = Event(
+            type=rng.choice(_TYPES),
+            occurred_at=now - timedelta(hours=rng.randrange(span_hours)),
+            attributes={},
+            confidence=0.9,
+        )
+        session.add(ev)
+        session.flush()
+        for entity in rng.sample(companies, rng.randint(1, 3)):
+            session.add(EventEntityRole(event_id=ev.id, entity_id=entity.id, role="company"))
+    session.commit()
+
+
+def _legacy_labels(session, window_days: int = 7) -> Counter:
+    """The original loop: one window query per event, type-only comparison."""
+    labels: Counter = Counter()
+    for ev in session.query(Event).order_by(Event.recorded_at.desc()).all():
+        if not ev.occurred_at:
+            labels["new"] += 1
+            continue
+        similars = (
+            session.query(Event)
+            .filter(Event.id != ev.id)
+            .filter(Event.type == ev.type)
+            .filter(Event.occurred_at >= ev.occurred_at - timedelta(days=window_days))
+            .filter(Event.occurred_at <= ev.occurred_at + timedelta(days=window_days))
+            .all()
+        )
+        if not similars:
+            labels["new"] += 1
+        elif any(s.recorded_at < ev.recorded_at for s in similars):
+            labels["repeat"] += 1
+        else:
+            labels["update"] += 1
+    return labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--skip-legacy-above", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'events':>7} {'method':>7} {'queries':>8} {'seconds':>8}  labels")
+    for n_events in args.events:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", future=True)
+            Base.metadata.create_all(bind=engine)
+            Session = sessionmaker(bind=engine, future=True)
+            with Session() as session:
+                _seed(session, n_events)
+
+            queries = [0]
+            event.listen(
+                engine, "before_cursor_execute", lambda *a, **kw: queries.__setitem__(0, queries[0] + 1)
+            )
+
+            if n_events <= args.skip_legacy_above:
+                with Session() as session:
+                    queries[0] = 0
+                    t0 = time.perf_counter()
+                    legacy = _legacy_labels(session)
+                    elapsed = time.perf_counter() - t0
+                print(f"{n_events:>7} {'legacy':>7} {queries[0]:>8} {elapsed:>8.2f}  {dict(legacy)}")
+
+            with Session() as session:
+                queries[0] = 0
+                t0 = time.perf_counter()
+                created = label_novelty(session, limit=n_events)
+                session.flush()
+                elapsed = time.perf_counter() - t0
+                labels = Counter(label for (label,) in session.query(EventNoveltyLabel.label))
+                assert created == n_events
+                assert label_novelty(session, limit=n_events) == 0
+            print(f"{n_events:>7} {'sweep':>7} {queries[0]:>8} {elapsed:>8.2f}  {dict(labels)}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
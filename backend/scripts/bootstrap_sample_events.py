@@ -9,28 +9,14 @@ Usage (from project root, with .venv activated):
     python -m backend.scripts.bootstrap_sample_events
 """
 
-import json
 from datetime import datetime, timedelta
 
 from backend.db.base import SessionLocal, init_db
+from backend.models.data_versions import DOCUMENTS, ENTITIES, EVENTS, bump_data_version
 from backend.models.documents import Document
-from backend.models.entities import Entity
 from backend.models.events import Event, EventEntityRole
-
-
-def _get_or_create_entity(session, name: str, type_: str) -> Entity:
-    existing = (
-        session.query(Entity)
-        .filter(Entity.name == name)
-        .filter(Entity.type == type_)
-        .first()
-    )
-    if existing:
-        return existing
-    ent = Entity(name=name, type=type_)
-    session.add(ent)
-    session.flush()
-    return ent
+from backend.pipeline.entity_resolution import EntityResolver
+from backend.pipeline.graph_edges import refresh_event_edges
 
 
 def main() -> None:
@@ -53,9 +39,10 @@ def main() -> None:
         now = datetime.utcnow()
 
         # Core companies
-        openai = _get_or_create_entity(session, "OpenAI", "company")
-        anthropic = _get_or_create_entity(session, "Anthropic", "company")
-        xai = _get_or_create_entity(session, "xAI", "company")
+        resolver = EntityResolver.from_session(session)
+        openai, anthropic, xai = resolver.resolve_many(
+            session, [("OpenAI", "company"), ("Anthropic", "company"), ("xAI", "company")]
+        )
 
         # Create synthetic documents for each event
         docs = [
@@ -121,25 +108,27 @@ def main() -> None:
 
         from backend.models.events import Mention
         
-        for idx, (ev_type, occurred_at, company, amount, summary, round_type) in enumerate(events_data):
+        event_ids = []
+        for idx, (ev_type, occurred_at, company_id, amount, summary, round_type) in enumerate(events_data):
             ev = Event(
                 type=ev_type,
                 occurred_at=occurred_at,
-                attributes=json.dumps({
+                attributes={
                     "amount_usd": amount,
                     "summary": summary,
                     "round": round_type,
-                }),
+                },
                 confidence=0.9,
             )
             session.add(ev)
             session.flush()
+            event_ids.append(ev.id)
 
             # Link event to entity
             session.add(
                 EventEntityRole(
                     event_id=ev.id,
-                    entity_id=company.id,
+                    entity_id=company_id,
                     role="company",
                 )
             )
@@ -149,12 +138,15 @@ def main() -> None:
                 session.add(
                     Mention(
                         document_id=docs[idx].id,
-                        entity_id=company.id,
+                        entity_id=company_id,
                         event_id=ev.id,
                         snippet=None,
                     )
                 )
 
+        session.flush()
+        refresh_event_edges(session, event_ids)
+        bump_data_version(session, EVENTS, ENTITIES, DOCUMENTS)
         session.commit()
         print("Bootstrapped sample entities and events.")
     finally:
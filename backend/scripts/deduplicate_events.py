@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+"""
+Merge near-duplicate events (the same story reported by several outlets).
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.deduplicate_events
+    python -m backend.scripts.deduplicate_events --since 2025-01-01T00:00:00
+
+Without `--since` the whole ledger is compared; with it, only events recorded
+after that time are compared against their surrounding time span.
+"""
+
+import argparse
+from datetime import datetime
+
+from backend.db.base import SessionLocal, init_db
+from backend.pipeline.deduplication import deduplicate_events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    init_db()
+    session = SessionLocal()
+    try:
+        merged = deduplicate_events(session, since=args.since)
+        session.commit()
+        print(f"Marked {merged} events as duplicates")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
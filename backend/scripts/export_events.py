@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+"""
+Export the event ledger as NDJSON or CSV.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.export_events --format ndjson --output events.ndjson
+    python -m backend.scripts.export_events --state-file .export_state.json >> events.ndjson
+
+With `--state-file`, the `(recorded_at, id)` of the last exported event is saved
+after the run and used as the starting watermark of the next, so repeated runs
+only emit events recorded since.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from backend.db.base import SessionLocal, init_db
+from backend.queries.export import csv_lines, iter_event_export, ndjson_lines
+
+
+def _load_state(path: Path | None) -> tuple[datetime | None, int | None]:
+    if path is None or not path.exists():
+        return None, None
+    state = json.loads(path.read_text())
+    return datetime.fromisoformat(state["recorded_at"]), int(state["id"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--output", type=Path, help="Write here instead of stdout")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only events recorded after this")
+    parser.add_argument("--after-id", type=int, help="Tie-breaker for --since (last exported id)")
+    parser.add_argument("--state-file", type=Path, help="Read/write the resume watermark here")
+    args = parser.parse_args()
+    if args.after_id is not None and args.since is None:
+        parser.error("--after-id requires --since")
+
+    since, after_id = args.since, args.after_id
+    if since is None:
+        since, after_id = _load_state(args.state_file)
+
+    init_db()
+    last: dict | None = None
+    count = 0
+
+    def tracked(records):
+        nonlocal last, count
+        for record in records:
+            last = record
+            count += 1
+            yield record
+
+    with SessionLocal() as db:
+        records = tracked(iter_event_export(db, since=since, after_id=after_id))
+        if args.format == "csv":
+            out = args.output.open("w", newline="") if args.output else sys.stdout
+            try:
+                for chunk in csv_lines(records):
+                    out.write(chunk)
+            finally:
+                if args.output:
+                    out.close()
+        else:
+            out = args.output.open("wb") if args.output else sys.stdout.buffer
+            try:
+                for line in ndjson_lines(records):
+                    out.write(line)
+            finally:
+                if args.output:
+                    out.close()
+
+    if args.state_file and last is not None:
+        args.state_file.write_text(
+            json.dumps({"recorded_at": last["recorded_at"].isoformat(), "id": last["id"]})
+        )
+    print(f"Exported {count} events", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
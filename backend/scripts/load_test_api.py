@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+"""
+Load-test the read API with the threadpool DB path vs the async engine.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.load_test_api --concurrency 50 100 250 500 --seconds 10
+
+Seeds a throwaway SQLite database, then for each mode (`AISCOPE_API_ASYNC_DB`
+off/on) starts uvicorn on it and drives `/events` and `/companies` with N
+concurrent keep-alive clients, reporting requests/sec, p50/p99 latency and
+errors per concurrency level.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.config import Settings
+from backend.db.base import Base, make_engine
+from backend.models import briefings, data_versions, documents, entities, events, extraction_cache, graph, pipeline_state  # noqa: F401
+from backend.models.documents import Document
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole, Mention
+
+
+def _seed(database_url: str, n_events: int) -> None:
+    engine = make_engine(database_url, Settings())
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with sessionmaker(bind=engine, future=True)() as session:
+        companies = [Entity(name=f"Company {i}", type="company") for i in range(200)]
+        session.add_all(companies)
+        session.flush()
+        for i in range(n_events):
+            doc = Document(
+                url=f"https://example.com/articles/{i}",
+                title=f"Article {i}",
+                source_name="Load test",
+                content=f"Article body {i}",
+                content_hash=f"load-{i}",
+            )
+            ev = Event(
+                type="funding",
+                occurred_at=now - timedelta(hours=i),
+                attributes={"amount_usd": 1_000_000 * i, "summary": f"Event {i}"},
+                confidence=0.9,
+            )
+            session.add_all([doc, ev])
+            session.flush()
+            session.add_all(
+                [
+                    EventEntityRole(event_id=ev.id, entity_id=companies[i % 200].id, role="company"),
+                    Mention(document_id=doc.id, entity_id=companies[i % 200].id, event_id=ev.id),
+                ]
+            )
+        session.commit()
+    engine.dispose()
+
+
+async def _drive(base_url: str, path: str, concurrency: int, seconds: float) -> tuple[float, float, float, int]:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    latencies.sort()
+    if not latencies:
+        return 0.0, float("nan"), float("nan"), errors
+    p99 = latencies[int(0.99 * (len(latencies) - 1))]
+    return len(latencies) / seconds, statistics.median(latencies), p99, errors
+
+
+def _wait_until_up(base_url: str, proc: subprocess.Popen) -> None:
+    for _ in range(100):
+        if proc.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(f"{base_url}/health", timeout=1).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn did not come up")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--paths", nargs="+", default=["/events?limit=50", "/companies"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'load.db'}"
+        _seed(database_url, args.events)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+        print(f"{'mode':>10} {'path':>18} {'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for mode, async_db in (("threadpool", "0"), ("async", "1")):
+            env = {**os.environ, "AISCOPE_DATABASE_URL": database_url, "AISCOPE_API_ASYNC_DB": async_db}
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(args.port), "--log-level", "warning"],
+                env=env,
+            )
+            try:
+                _wait_until_up(base_url, proc)
+                for path in args.paths:
+                    for concurrency in args.concurrency:
+                        rps, p50, p99, errors = asyncio.run(
+                            _drive(base_url, path, concurrency, args.seconds)
+                        )
+                        print(
+                            f"{mode:>10} {path:>18} {concurrency:>8} {rps:>9.1f} "
+                            f"{p50:>9.1f} {p99:>9.1f} {errors:>7}"
+                        )
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+"""
+Recompute the materialized `graph_edges` and `graph_event_edges` tables from
+the event ledger.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.rebuild_graph_edges
+
+Edges are kept current as events are persisted; run this after bulk edits to
+`event_entity_roles` or `relationships` made outside the pipeline.
+"""
+
+from backend.db.base import SessionLocal, init_db
+from backend.pipeline.graph_edges import rebuild_graph_edges
+
+
+def main() -> None:
+    init_db()
+    session = SessionLocal()
+    try:
+        count = rebuild_graph_edges(session)
+        session.commit()
+        print(f"Rebuilt graph_edges: {count} edges")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
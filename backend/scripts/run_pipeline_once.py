@@ -7,23 +7,38 @@ Usage (from project root, with .venv activated):
 
     python -m backend.scripts.run_pipeline_once
 
-Steps:
+Runs every scheduler stage once, in dependency order:
   1. Fetch RSS documents according to backend/ingestion/sources.yaml.
   2. Run LLM-based event extraction for new documents.
+  3. Merge near-duplicate events.
+  4. Label novelty of new events.
+  5. Generate the daily briefing.
+
+For continuous operation use `python -m backend.scripts.run_scheduler`.
 """
 
-from backend.ingestion.fetcher import fetch_rss_documents
-from backend.pipeline.extract_events import run_extraction_for_unprocessed_documents
+from backend.db.base import init_db
+from backend.ingestion.fetcher import conditional_get_stats
+from backend.pipeline.scheduler import Scheduler, pipeline_stages
 
 
 def main() -> None:
-  new_docs = fetch_rss_documents()
-  print(f"Fetched {new_docs} new documents")
-
-  new_events = run_extraction_for_unprocessed_documents()
-  print(f"Created {new_events} events from new documents")
+  init_db()
+  scheduler = Scheduler(pipeline_stages())
+  outputs = scheduler.run_once()
+  stages = scheduler.snapshot()["stages"]
+
+  print(f"Fetched {outputs['feeds'] or 0} new documents")
+  stats = conditional_get_stats.snapshot()
+  print(f"Conditional GET: {stats['hits']} not modified, {stats['misses']} downloaded")
+  print(f"Created {outputs['extraction'] or 0} events from new documents")
+  print(f"Marked {outputs['deduplication'] or 0} events as duplicates")
+  print(f"Added {outputs['novelty'] or 0} novelty labels")
+  print(f"Generated {outputs['briefing'] or 0} briefing(s)")
+  for name, stage in stages.items():
+    if stage["last_error"]:
+      print(f"Stage {name} failed: {stage['last_error']}")
 
 
 if __name__ == "__main__":
   main()
-
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+"""
+Resident pipeline scheduler: feeds, extraction, deduplication, novelty and
+briefing in one long-running process.
+
+Usage (from project root, with .venv activated):
+
+    python -m backend.scripts.run_scheduler
+
+Every stage runs once on startup, in dependency order. After that a stage
+runs as soon as an upstream stage produces output, or on its own interval
+(`AISCOPE_SCHEDULER_*_INTERVAL_SECONDS`) otherwise. Failed stages back off
+with jitter. Per-stage durations and backlogs are served as JSON on
+`http://AISCOPE_SCHEDULER_STATUS_HOST:AISCOPE_SCHEDULER_STATUS_PORT/status`,
+and the pipeline metrics (stage latency, Bedrock calls and tokens, queries,
+backlogs) in the Prometheus format on `/metrics` of the same port.
+SIGINT / SIGTERM let running stages finish, then exit; a second signal exits at once.
+"""
+
+import logging
+import signal
+
+from backend.core.config import settings
+from backend.db.base import init_db
+from backend.pipeline.scheduler import Scheduler, pipeline_stages, start_status_server
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    init_db()
+    scheduler = Scheduler(
+        pipeline_stages(),
+        backoff_base=settings.scheduler_backoff_base_seconds,
+        backoff_max=settings.scheduler_backoff_max_seconds,
+    )
+
+    def shutdown(signum, frame) -> None:
+        logging.getLogger(__name__).info("Received %s, shutting down", signal.Signals(signum).name)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    server = None
+    if settings.scheduler_status_port:
+        server = start_status_server(
+            scheduler, settings.scheduler_status_host, settings.scheduler_status_port
+        )
+    try:
+        scheduler.run_forever()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
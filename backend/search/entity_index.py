@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import func
+
+from backend.core.registry import decode_aliases, match_key, normalize_name
+from backend.models.entities import Entity
+
+
+@dataclass(frozen=True)
+class EntityHit:
+    id: int
+    name: str
+    type: str
+    external_id: str | None
+    matched: str
+    score: float
+
+
+@dataclass(frozen=True)
+class _Doc:
+    id: int
+    name: str
+    type: str
+    external_id: str | None
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class EntitySearchIndex:
+    """
+    In-process search index over entity names and aliases.
+
+    Two structures back it:
+      - sorted lists of full-name keys and of per-word keys, for O(log n)
+        prefix lookups (what typeahead needs);
+      - a trigram inverted index for fuzzy/substring matches ("hugging" ->
+        "Hugging Face", "antropic" -> "Anthropic").
+
+    Results are ranked: exact name > name prefix > word prefix > trigram similarity.
+    """
+
+    # Trigrams shared by more than this fraction of entities carry little signal
+    # and are skipped unless the query has nothing rarer.
+    _COMMON_TRIGRAM_FRACTION = 0.1
+
+    def __init__(self, rows: Iterable[tuple[int, str, str, str | None, str | None]]) -> None:
+        self._docs: dict[int, _Doc] = {}
+        self._name_keys: list[tuple[str, int, str]] = []
+        self._word_keys: list[tuple[str, int, str]] = []
+        # Each indexed name (canonical or alias) gets a dense integer id so that
+        # postings are plain int lists that Counter can tally in C.
+        self._name_entity: list[int] = []
+        self._name_text: list[str] = []
+        self._name_gram_counts: list[int] = []
+        self._postings: dict[str, list[int]] = defaultdict(list)
+
+        for entity_id, name, type_, external_id, aliases in rows:
+            self._docs[entity_id] = _Doc(entity_id, name, type_, external_id)
+            for candidate in [name, *decode_aliases(aliases)]:
+                key = match_key(candidate)
+                if not key:
+                    continue
+                self._name_keys.append((key, entity_id, candidate))
+                for word in normalize_name(candidate).split():
+                    word_key = match_key(word)
+                    if word_key:
+                        self._word_keys.append((word_key, entity_id, candidate))
+                grams = _trigrams(key)
+                name_id = len(self._name_entity)
+                self._name_entity.append(entity_id)
+                self._name_text.append(candidate)
+                self._name_gram_counts.append(len(grams))
+                for gram in grams:
+                    self._postings[gram].append(name_id)
+
+        self._name_keys.sort()
+        self._word_keys.sort()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _prefix_scan(keys: list[tuple[str, int, str]], prefix: str, limit: int):
+        i = bisect.bisect_left(keys, (prefix,))
+        while i < len(keys) and keys[i][0].startswith(prefix) and limit > 0:
+            yield keys[i]
+            i += 1
+            limit -= 1
+
+    def search(self, query: str, limit: int = 10) -> list[EntityHit]:
+        key = match_key(query)
+        if not key:
+            return []
+
+        best: dict[int, tuple[float, str]] = {}
+
+        def offer(entity_id: int, score: float, matched: str) -> None:
+            if score > best.get(entity_id, (0.0, ""))[0]:
+                best[entity_id] = (score, matched)
+
+        # Scan a bounded window past the prefix so shorter (closer) names can win.
+        window = max(limit * 20, 50)
+        for name_key, entity_id, matched in self._prefix_scan(self._name_keys, key, window):
+            if name_key == key:
+                offer(entity_id, 1.0, matched)
+            else:
+                offer(entity_id, 0.8 + 0.1 * len(key) / len(name_key), matched)
+        for word_key, entity_id, matched in self._prefix_scan(self._word_keys, key, window):
+            offer(entity_id, 0.6 + 0.1 * len(key) / len(word_key), matched)
+
+        if len(best) < limit and len(key) >= 3:
+            query_grams = _trigrams(key)
+            cutoff = max(50, int(len(self._docs) * self._COMMON_TRIGRAM_FRACTION))
+            grams = sorted(query_grams, key=lambda g: len(self._postings.get(g, ())))
+            selective = [g for g in grams if len(self._postings.get(g, ())) <= cutoff]
+            shared: Counter[int] = Counter()
+            for gram in selective or grams[:1]:
+                shared.update(self._postings.get(gram, ()))
+            # Jaccard >= 0.3 needs at least this many shared trigrams.
+            min_overlap = max(1, int(0.3 * len(query_grams)))
+            for name_id, overlap in shared.items():
+                if overlap < min_overlap:
+                    continue
+                union = len(query_grams) + self._name_gram_counts[name_id] - overlap
+                similarity = overlap / union if union else 0.0
+                if similarity >= 0.3:
+                    offer(self._name_entity[name_id], 0.6 * similarity, self._name_text[name_id])
+
+        ranked = sorted(
+            best.items(), key=lambda item: (-item[1][0], len(self._docs[item[0]].name), item[0])
+        )
+        hits = []
+        for entity_id, (score, matched) in ranked[:limit]:
+            doc = self._docs[entity_id]
+            hits.append(
+                EntityHit(
+                    id=doc.id,
+                    name=doc.name,
+                    type=doc.type,
+                    external_id=doc.external_id,
+                    matched=matched,
+                    score=round(score, 4),
+                )
+            )
+        return hits
+
+
+_INDEX: EntitySearchIndex | None = None
+_INDEX_SIGNATURE: tuple | None = None
+_INDEX_CHECKED_AT = 0.0
+_INDEX_LOCK = threading.Lock()
+
+
+def _signature(db) -> tuple:
+    return db.query(
+        func.count(Entity.id), func.max(Entity.id), func.max(Entity.updated_at)
+    ).one()
+
+
+def get_entity_index(db, refresh_seconds: float) -> EntitySearchIndex:
+    """
+    Return the process-wide index, rebuilding it when the entities table changed.
+
+    The change check (count / max id / max updated_at) runs at most once every
+    `refresh_seconds`; call `invalidate_entity_index` after writing entities to
+    make the next lookup see them immediately.
+    """
+    global _INDEX, _INDEX_SIGNATURE, _INDEX_CHECKED_AT
+    with _INDEX_LOCK:
+        now = time.monotonic()
+        if _INDEX is not None and now - _INDEX_CHECKED_AT < refresh_seconds:
+            return _INDEX
+        signature = tuple(_signature(db))
+        if _INDEX is None or signature != _INDEX_SIGNATURE:
+            rows = db.query(
+                Entity.id, Entity.name, Entity.type, Entity.external_id, Entity.aliases
+            ).all()
+            _INDEX = EntitySearchIndex(rows)
+            _INDEX_SIGNATURE = signature
+        _INDEX_CHECKED_AT = now
+        return _INDEX
+
+
+def invalidate_entity_index() -> None:
+    global _INDEX_CHECKED_AT
+    with _INDEX_LOCK:
+        _INDEX_CHECKED_AT = 0.0
@@ -1,7 +1,9 @@
-import React, { useState } from "react";
+import React, { useEffect, useMemo, useState } from "react";
 import {
   AppBar,
   Box,
+  FormControlLabel,
+  Switch,
   Toolbar,
   Typography,
   useMediaQuery,
@@ -13,7 +15,8 @@ import EntityModal from "./EntityModal";
 import EventModal from "./EventModal";
 import EdgeModal from "./EdgeModal";
 import EntitySearchBox from "./EntitySearchBox";
-import { EntityNode, EntityLink, NODES } from "./graphData";
+import { EntityNode, EntityLink, GraphElements, toGraphElements } from "./graphData";
+import { fetchGraph } from "./api";
 import type { EventDto, EntitySearchResult } from "./types";
 
 const App: React.FC = () => {
@@ -26,6 +29,24 @@ const App: React.FC = () => {
   const [dynamicLinks, setDynamicLinks] = useState<EntityLink[]>([]);
   const [highlightNodeId, setHighlightNodeId] = useState<string | null>(null);
   const [zoomToNodeId, setZoomToNodeId] = useState<string | null>(null);
+  const [graph, setGraph] = useState<GraphElements>({ nodes: [], links: [] });
+  const [showEvents, setShowEvents] = useState(false);
+
+  // The graph is aggregated by the server; entities added from search are drawn on top.
+  useEffect(() => {
+    let cancelled = false;
+    fetchGraph({ events: showEvents })
+      .then((dto) => {
+        if (!cancelled) setGraph(toGraphElements(dto));
+      })
+      .catch((e) => console.error("Graph load error:", e));
+    return () => {
+      cancelled = true;
+    };
+  }, [showEvents]);
+
+  const nodes = useMemo(() => [...graph.nodes, ...dynamicNodes], [graph.nodes, dynamicNodes]);
+  const links = useMemo(() => [...graph.links, ...dynamicLinks], [graph.links, dynamicLinks]);
 
   return (
     <Box sx={{ height: "100vh", display: "flex", flexDirection: "column" }}>
@@ -56,7 +77,7 @@ const App: React.FC = () => {
                 };
                 
                 // Check if node already exists
-                const existingNode = [...NODES, ...dynamicNodes].find(n => n.id === newNode.id);
+                const existingNode = nodes.find(n => n.id === newNode.id);
                 if (existingNode) {
                   // Node already exists, just zoom to it
                   setHighlightNodeId(newNode.id);
@@ -76,7 +97,7 @@ const App: React.FC = () => {
                 
                 // AI Product Companies -> NVIDIA (GPU provider)
                 if (newNode.type === "ai_product_company") {
-                  const nvidiaExists = [...NODES, ...dynamicNodes].find(n => n.id === "nvidia");
+                  const nvidiaExists = nodes.find(n => n.id === "nvidia");
                   if (nvidiaExists) {
                     newLinks.push({
                       source: "nvidia",
@@ -90,7 +111,7 @@ const App: React.FC = () => {
                 
                 // Infrastructure companies -> AI Product Companies (if they're known partners)
                 if (newNode.type === "ai_infra_company") {
-                  const openaiExists = [...NODES, ...dynamicNodes].find(n => n.id === "openai");
+                  const openaiExists = nodes.find(n => n.id === "openai");
                   if (openaiExists && (newNode.id.includes("aws") || newNode.id.includes("azure"))) {
                     newLinks.push({
                       source: newNode.id,
@@ -104,7 +125,7 @@ const App: React.FC = () => {
                 
                 // Microsoft -> OpenAI (if Microsoft is added)
                 if (newNode.id === "microsoft") {
-                  const openaiExists = [...NODES, ...dynamicNodes].find(n => n.id === "openai");
+                  const openaiExists = nodes.find(n => n.id === "openai");
                   if (openaiExists) {
                     newLinks.push({
                       source: "microsoft",
@@ -118,7 +139,7 @@ const App: React.FC = () => {
                 
                 // AWS -> Anthropic (if AWS is added)
                 if (newNode.id === "aws") {
-                  const anthropicExists = [...NODES, ...dynamicNodes].find(n => n.id === "anthropic");
+                  const anthropicExists = nodes.find(n => n.id === "anthropic");
                   if (anthropicExists) {
                     newLinks.push({
                       source: "aws",
@@ -178,6 +199,17 @@ const App: React.FC = () => {
             >
               Core AI ecosystem graph
             </Typography>
+            <FormControlLabel
+              control={
+                <Switch
+                  size="small"
+                  checked={showEvents}
+                  onChange={(e) => setShowEvents(e.target.checked)}
+                />
+              }
+              label="Show events"
+              sx={{ ml: "auto", mr: 1, color: "text.secondary" }}
+            />
             <Box sx={{ display: { xs: "block", md: "none" } }}>
               <EntitySearchBox
                 onEntityAdded={(entity) => {
@@ -187,7 +219,7 @@ const App: React.FC = () => {
                     type: entity.type as EntityNode["type"]
                   };
                   
-                  const existingNode = [...NODES, ...dynamicNodes].find(n => n.id === newNode.id);
+                  const existingNode = nodes.find(n => n.id === newNode.id);
                   if (existingNode) {
                     setHighlightNodeId(newNode.id);
                     setTimeout(() => {
@@ -217,12 +249,12 @@ const App: React.FC = () => {
           >
             <GraphView
               onNodeClick={(node) => {
-                setSelectedEntity(node);
                 setHighlightNodeId(node.id);
+                if (node.type !== "event") setSelectedEntity(node);
               }}
               onEdgeClick={setSelectedEdge}
-              dynamicNodes={dynamicNodes}
-              dynamicLinks={dynamicLinks}
+              nodes={nodes}
+              links={links}
               highlightNodeId={highlightNodeId}
               zoomToNodeId={zoomToNodeId}
             />
@@ -261,6 +293,7 @@ const App: React.FC = () => {
       <EdgeModal
         open={selectedEdge !== null}
         edge={selectedEdge}
+        nodes={nodes}
         onClose={() => setSelectedEdge(null)}
       />
     </Box>
@@ -10,11 +10,12 @@ import {
   Chip,
   Divider
 } from "@mui/material";
-import { EntityLink, NODES } from "./graphData";
+import { EntityLink, EntityNode } from "./graphData";
 
 interface EdgeModalProps {
   open: boolean;
   edge: EntityLink | null;
+  nodes: EntityNode[];
   onClose: () => void;
 }
 
@@ -54,16 +55,16 @@ const getChipColor = (
   }
 };
 
-const getNodeLabel = (id: string): string => {
-  const node = NODES.find((n) => n.id === id);
+const getNodeLabel = (id: string, nodes: EntityNode[]): string => {
+  const node = nodes.find((n) => n.id === id);
   return node?.label || id;
 };
 
-export const EdgeModal: React.FC<EdgeModalProps> = ({ open, edge, onClose }) => {
+export const EdgeModal: React.FC<EdgeModalProps> = ({ open, edge, nodes, onClose }) => {
   if (!edge) return null;
 
-  const sourceLabel = getNodeLabel(edge.source);
-  const targetLabel = getNodeLabel(edge.target);
+  const sourceLabel = getNodeLabel(edge.source, nodes);
+  const targetLabel = getNodeLabel(edge.target, nodes);
 
   return (
     <Dialog
@@ -1,4 +1,4 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import {
   Box,
   TextField,
@@ -8,7 +8,20 @@ import {
   Chip
 } from "@mui/material";
 import SearchIcon from "@mui/icons-material/Search";
-import { searchAndAddEntity, EntitySearchResult } from "./api";
+import {
+  fetchEntitySuggestions,
+  searchAndAddEntity,
+  EntitySearchResult,
+  EntitySuggestion
+} from "./api";
+
+/** Typeahead suggestions carry numeric DB ids; resolved search results carry string ids. */
+type SearchOption = EntitySearchResult | EntitySuggestion;
+
+const isSuggestion = (option: SearchOption): option is EntitySuggestion =>
+  typeof option.id === "number";
+
+const SUGGEST_DEBOUNCE_MS = 150;
 
 interface EntitySearchBoxProps {
   onEntityAdded?: (entity: EntitySearchResult) => void;
@@ -19,9 +32,30 @@ export const EntitySearchBox: React.FC<EntitySearchBoxProps> = ({
 }) => {
   const [inputValue, setInputValue] = useState("");
   const [loading, setLoading] = useState(false);
-  const [options, setOptions] = useState<EntitySearchResult[]>([]);
+  const [options, setOptions] = useState<SearchOption[]>([]);
   const [error, setError] = useState<string | null>(null);
 
+  useEffect(() => {
+    const term = inputValue.trim();
+    if (term.length < 2) {
+      return;
+    }
+    const controller = new AbortController();
+    const timer = window.setTimeout(async () => {
+      try {
+        setOptions(await fetchEntitySuggestions(term, 8, controller.signal));
+      } catch (e: any) {
+        if (e.name !== "AbortError") {
+          console.error("Suggestion error:", e);
+        }
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      window.clearTimeout(timer);
+      controller.abort();
+    };
+  }, [inputValue]);
+
   const handleSearch = async (searchTerm: string) => {
     if (!searchTerm.trim() || searchTerm.length < 2) {
       setOptions([]);
@@ -65,9 +99,12 @@ export const EntitySearchBox: React.FC<EntitySearchBoxProps> = ({
         }}
         onChange={(_, value) => {
           if (value && typeof value !== "string") {
-            // Entity was selected
+            // Entity was selected; suggestions still need to be resolved/added.
             setInputValue("");
             setOptions([]);
+            if (isSuggestion(value)) {
+              handleSearch(value.name);
+            }
           }
         }}
         onKeyDown={(e) => {
@@ -105,9 +142,10 @@ export const EntitySearchBox: React.FC<EntitySearchBoxProps> = ({
           />
         )}
         renderOption={(props, option) => {
-          const entity = option as EntitySearchResult;
+          const entity = option as SearchOption;
+          const description = isSuggestion(entity) ? undefined : entity.description;
           return (
-            <Box component="li" {...props} key={entity.id}>
+            <Box component="li" {...props} key={String(entity.id)}>
               <Box sx={{ display: "flex", flexDirection: "column", width: "100%" }}>
                 <Box sx={{ display: "flex", alignItems: "center", gap: 1 }}>
                   <Typography variant="body2" sx={{ fontWeight: 500 }}>
@@ -125,13 +163,13 @@ export const EntitySearchBox: React.FC<EntitySearchBoxProps> = ({
                     }
                   />
                 </Box>
-                {entity.description && (
+                {description && (
                   <Typography
                     variant="caption"
                     sx={{ color: "text.secondary", mt: 0.5 }}
                   >
-                    {entity.description.substring(0, 100)}
-                    {entity.description.length > 100 ? "..." : ""}
+                    {description.substring(0, 100)}
+                    {description.length > 100 ? "..." : ""}
                   </Typography>
                 )}
               </Box>
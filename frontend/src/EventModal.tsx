@@ -54,18 +54,18 @@ export const EventModal: React.FC<EventModalProps> = ({
 
   if (event.attributes != null) {
     if (typeof event.attributes === "string") {
-      console.log("attributes 1", event.attributes);
       try {
         attributes = JSON.parse(event.attributes.replace(/'/g, '"'));
-        summary = attributes.summary as string | undefined;
-        amountUsd = attributes.amount_usd as number | undefined;
-        round = attributes.round as string | undefined;
-        productName = attributes.product_name as string | undefined;
       } catch (e) {
-        console.log("attributes 2", e);
         attributes = {} as Record<string, unknown>;
       }
+    } else {
+      attributes = event.attributes;
     }
+    summary = attributes.summary as string | undefined;
+    amountUsd = attributes.amount_usd as number | undefined;
+    round = attributes.round as string | undefined;
+    productName = attributes.product_name as string | undefined;
   }
 
   const sourceUrl =
@@ -5,7 +5,7 @@ import ForceGraph2D, {
   LinkObject,
   NodeObject
 } from "react-force-graph-2d";
-import { NODES, LINKS, EntityNode, EntityLink } from "./graphData";
+import { EntityNode, EntityLink } from "./graphData";
 
 interface GraphNode extends NodeObject, EntityNode {}
 
@@ -20,16 +20,13 @@ interface GraphLink extends LinkObject {
 interface GraphViewProps {
   onNodeClick?: (node: EntityNode) => void;
   onEdgeClick?: (edge: EntityLink) => void;
-  dynamicNodes?: EntityNode[];
-  dynamicLinks?: EntityLink[];
+  nodes: EntityNode[];
+  links: EntityLink[];
   highlightNodeId?: string | null;
   zoomToNodeId?: string | null;
 }
 
-const getNodeLabel = (
-  node: string | GraphNode,
-  allNodes: EntityNode[] = NODES
-): string => {
+const getNodeLabel = (node: string | GraphNode, allNodes: EntityNode[]): string => {
   if (typeof node === "string") {
     const found = allNodes.find((n) => n.id === node);
     return found?.label || node;
@@ -40,8 +37,8 @@ const getNodeLabel = (
 export const GraphView: React.FC<GraphViewProps> = ({
   onNodeClick,
   onEdgeClick,
-  dynamicNodes = [],
-  dynamicLinks = [],
+  nodes,
+  links,
   highlightNodeId = null,
   zoomToNodeId = null
 }) => {
@@ -51,27 +48,22 @@ export const GraphView: React.FC<GraphViewProps> = ({
 
   const data = useMemo(
     () => {
-      // Combine static nodes with dynamic nodes, avoiding duplicates
-      const allNodes = [...NODES];
-      const existingIds = new Set(NODES.map((n) => n.id));
-
-      for (const dynNode of dynamicNodes) {
-        if (!existingIds.has(dynNode.id)) {
-          allNodes.push(dynNode);
-          existingIds.add(dynNode.id);
+      // Drop duplicate nodes and links (search results may repeat served ones)
+      const allNodes: EntityNode[] = [];
+      const existingIds = new Set<string>();
+      for (const node of nodes) {
+        if (!existingIds.has(node.id)) {
+          allNodes.push(node);
+          existingIds.add(node.id);
         }
       }
 
-      // Combine static links with dynamic links, avoiding duplicates
-      const allLinks: EntityLink[] = [...LINKS];
-      const linkKeys = new Set(
-        LINKS.map((l) => `${l.source}-${l.target}`)
-      );
-
-      for (const dynLink of dynamicLinks) {
-        const key = `${dynLink.source}-${dynLink.target}`;
+      const allLinks: EntityLink[] = [];
+      const linkKeys = new Set<string>();
+      for (const link of links) {
+        const key = `${link.source}-${link.target}`;
         if (!linkKeys.has(key)) {
-          allLinks.push(dynLink);
+          allLinks.push(link);
           linkKeys.add(key);
         }
       }
@@ -90,7 +82,7 @@ export const GraphView: React.FC<GraphViewProps> = ({
         )
       };
     },
-    [dynamicNodes, dynamicLinks]
+    [nodes, links]
   );
 
   // Track if we need to zoom
@@ -151,6 +143,8 @@ export const GraphView: React.FC<GraphViewProps> = ({
         return "#ba68c8"; // Purple
       case "individual":
         return "#f48fb1"; // Pink
+      case "event":
+        return "#b0bec5"; // Grey
       default:
         return "#90caf9";
     }
@@ -179,7 +173,8 @@ export const GraphView: React.FC<GraphViewProps> = ({
     const label = node.label;
     const fontSize = 12 / globalScale;
     const isHighlighted = highlightedNode && node.id === highlightedNode.id;
-    const radius = isHighlighted ? 7 : 6; // Slightly larger when highlighted
+    const baseRadius = node.type === "event" ? 4 : 6; // Events are drawn smaller
+    const radius = isHighlighted ? baseRadius + 1 : baseRadius; // Slightly larger when highlighted
 
     // Draw subtle highlight ring for highlighted node
     if (isHighlighted) {
@@ -280,14 +275,14 @@ export const GraphView: React.FC<GraphViewProps> = ({
             ai_infra_company: "AI Infrastructure",
             chip_company: "Chip Company",
             ai_scholar: "AI Scholar",
-            individual: "Individual"
+            individual: "Individual",
+            event: "Event"
           };
           return `${n.label} - ${typeLabels[n.type] || n.type}`;
         }}
         linkLabel={(link: LinkObject) => {
           const l = link as GraphLink;
-          const allNodes = [...NODES, ...dynamicNodes];
-          return l.label || `${getNodeLabel(l.source, allNodes)} → ${getNodeLabel(l.target, allNodes)}`;
+          return l.label || `${getNodeLabel(l.source, nodes)} → ${getNodeLabel(l.target, nodes)}`;
         }}
         linkColor={linkColor}
         linkWidth={linkWidth}
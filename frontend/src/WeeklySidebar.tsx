@@ -33,15 +33,8 @@ export const WeeklySidebar: React.FC<WeeklySidebarProps> = ({
   useEffect(() => {
     (async () => {
       try {
-        const all = await fetchEvents();
-        const now = Date.now();
-        const recent = all.filter((ev) => {
-          if (!ev.occurred_at) return false;
-          const t = Date.parse(ev.occurred_at);
-          if (Number.isNaN(t)) return false;
-          return now - t <= RECENT_DAYS_MS;
-        });
-        setEvents(recent);
+        const start = new Date(Date.now() - RECENT_DAYS_MS).toISOString();
+        setEvents(await fetchEvents({ start }));
       } catch (e) {
         console.error(e);
         setError("Failed to load weekly events");
@@ -131,7 +124,9 @@ export const WeeklySidebar: React.FC<WeeklySidebarProps> = ({
                     day: "numeric"
                   });
                 let summary: string | undefined;
-                if (ev.attributes) {
+                if (ev.attributes && typeof ev.attributes === "object") {
+                  summary = (ev.attributes.summary as string | undefined) ?? undefined;
+                } else if (ev.attributes) {
                   try {
                     const attrs = JSON.parse(ev.attributes);
                     summary = attrs.summary ?? undefined;
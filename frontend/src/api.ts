@@ -3,35 +3,69 @@ import type {
   EventEntity,
   AcquisitionInfo,
   RelatedEvent,
-  EntitySearchResult
+  EntitySearchResult,
+  EntitySuggestion,
+  GraphDto
 } from "./types";
 
-export type { EventDto, EventEntity, AcquisitionInfo, RelatedEvent, EntitySearchResult };
+export type {
+  EventDto,
+  EventEntity,
+  AcquisitionInfo,
+  RelatedEvent,
+  EntitySearchResult,
+  EntitySuggestion,
+  GraphDto
+};
 
 const API_BASE_URL =
   import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
 
-export async function fetchEvents(): Promise<EventDto[]> {
-  const res = await fetch(`${API_BASE_URL}/events`);
+export interface EventQuery {
+  limit?: number;
+  cursor?: string;
+  types?: string[];
+  start?: string;
+  end?: string;
+  entityId?: number;
+  minConfidence?: number;
+  minAmountUsd?: number;
+}
+
+function eventQueryString(query: EventQuery): string {
+  const params = new URLSearchParams();
+  if (query.limit != null) params.set("limit", String(query.limit));
+  if (query.cursor) params.set("cursor", query.cursor);
+  for (const t of query.types ?? []) params.append("type", t);
+  if (query.start) params.set("start", query.start);
+  if (query.end) params.set("end", query.end);
+  if (query.entityId != null) params.set("entity_id", String(query.entityId));
+  if (query.minConfidence != null) params.set("min_confidence", String(query.minConfidence));
+  if (query.minAmountUsd != null) params.set("min_amount_usd", String(query.minAmountUsd));
+  const qs = params.toString();
+  return qs ? `?${qs}` : "";
+}
+
+export interface EventPage {
+  events: EventDto[];
+  nextCursor: string | null;
+}
+
+/** Fetch one keyset-paginated page of events; pass `nextCursor` back as `cursor` for the next. */
+export async function fetchEventPage(query: EventQuery = {}): Promise<EventPage> {
+  const res = await fetch(`${API_BASE_URL}/events${eventQueryString(query)}`);
   if (!res.ok) {
     throw new Error(`Failed to fetch events: ${res.status}`);
   }
-  const data = await res.json();
-  const first = Array.isArray(data) && data.length > 0 ? data[0] : null;
-  if (first) {
-    fetch("http://127.0.0.1:7243/ingest/cc63c749-2879-44b3-a692-dea83a3ad204", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        location: "api:fetchEvents",
-        message: "first event from API",
-        data: { id: first.id, keys: Object.keys(first), hasAttributes: "attributes" in first, hasSourceUrl: "source_url" in first, sourceUrl: first.source_url },
-        timestamp: Date.now(),
-        sessionId: "debug-session"
-      })
-    }).catch(() => {});
+  return { events: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
+export async function fetchEvents(query: EventQuery = {}): Promise<EventDto[]> {
+  const res = await fetch(`${API_BASE_URL}/events${eventQueryString(query)}`);
+  if (!res.ok) {
+    throw new Error(`Failed to fetch events: ${res.status}`);
   }
-  return data;
+  return res.json();
 }
 
 export async function searchAndAddEntity(
@@ -53,3 +87,53 @@ export async function searchAndAddEntity(
   return res.json();
 }
 
+
+export async function fetchEntitySuggestions(
+  query: string,
+  limit = 8,
+  signal?: AbortSignal
+): Promise<EntitySuggestion[]> {
+  const params = new URLSearchParams({ q: query, limit: String(limit) });
+  const res = await fetch(`${API_BASE_URL}/entities/typeahead?${params}`, { signal });
+  if (!res.ok) {
+    throw new Error(`Failed to fetch suggestions: ${res.status}`);
+  }
+  return res.json();
+}
+
+export async function fetchEntityProfile(entityId: number): Promise<EntitySearchResult> {
+  const res = await fetch(`${API_BASE_URL}/entities/${entityId}/profile`);
+  if (!res.ok) {
+    throw new Error(`Failed to fetch entity profile: ${res.status}`);
+  }
+  return res.json();
+}
+
+export interface GraphQuery {
+  start?: string;
+  end?: string;
+  types?: string[];
+  entityId?: number;
+  hops?: number;
+  maxEdges?: number;
+  /** Link entities through event nodes (entity↔event↔entity) */
+  events?: boolean;
+}
+
+/** Fetch the server-aggregated graph (node ids/labels plus weighted edges). */
+export async function fetchGraph(query: GraphQuery = {}): Promise<GraphDto> {
+  const params = new URLSearchParams();
+  if (query.start) params.set("start", query.start);
+  if (query.end) params.set("end", query.end);
+  for (const t of query.types ?? []) params.append("type", t);
+  if (query.entityId != null) params.set("entity_id", String(query.entityId));
+  if (query.hops != null) params.set("hops", String(query.hops));
+  if (query.maxEdges != null) params.set("max_edges", String(query.maxEdges));
+  if (query.events) params.set("events", "true");
+  const qs = params.toString();
+  const res = await fetch(`${API_BASE_URL}/graph${qs ? `?${qs}` : ""}`);
+  if (!res.ok) {
+    throw new Error(`Failed to fetch graph: ${res.status}`);
+  }
+  return res.json();
+}
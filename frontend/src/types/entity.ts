@@ -21,3 +21,12 @@ export interface EntitySearchResult {
   acquisitions?: AcquisitionInfo[];
   related_events?: RelatedEvent[];
 }
+
+export interface EntitySuggestion {
+  id: number;
+  name: string;
+  type: string;
+  external_id: string | null;
+  matched: string;
+  score: number;
+}
@@ -9,7 +9,7 @@ export interface EventDto {
   type: string;
   occurred_at: string | null;
   recorded_at: string;
-  /** JSON string from API, or pre-parsed object in some responses */
+  /** Structured attributes object (older API versions sent a JSON string) */
   attributes: string | Record<string, unknown> | null;
   confidence: number | null;
   entities?: EventEntity[];
@@ -0,0 +1,25 @@
+export interface GraphNodeDto {
+  id: string;
+  label: string;
+  /** Entity type, or "event" for event nodes (`/graph?events=true`) */
+  type: string;
+  event_type?: string;
+  occurred_at?: string | null;
+}
+
+export interface GraphEdgeDto {
+  source: string;
+  target: string;
+  /** Number of events (and relationships) linking the pair */
+  count: number;
+  /** Sum of event confidences */
+  weight: number;
+  last_at: string | null;
+  /** Entity's role in the event, on entity–event edges */
+  role?: string | null;
+}
+
+export interface GraphDto {
+  nodes: GraphNodeDto[];
+  edges: GraphEdgeDto[];
+}
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time: point the backend at a throwaway database
+# before anything from it is imported.
+_TMP_DIR = tempfile.TemporaryDirectory(prefix="aiscope-tests-")
+os.environ["AISCOPE_DATABASE_URL"] = f"sqlite:///{Path(_TMP_DIR.name) / 'test.db'}"
+os.environ["AISCOPE_API_CACHE_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+
+from backend.db.base import Base, SessionLocal, engine, init_db  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    init_db()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables():
+    """Every test starts from empty tables."""
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture
+def session():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def fresh_limiter(monkeypatch):
+    """A new process-wide Bedrock token bucket, built from the settings the test sets."""
+    from backend.llm import rate_limit
+
+    monkeypatch.setattr(rate_limit, "_bedrock_limiter", None)
+    yield
+    rate_limit._bedrock_limiter = None
+
+
+@pytest.fixture
+def assert_max_queries():
+    """`with assert_max_queries(n): ...` fails the test if the block runs more than n statements."""
+    from backend.db.instrumentation import assert_max_queries
+
+    return assert_max_queries
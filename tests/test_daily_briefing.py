@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import re
+import threading
+from datetime import datetime, timedelta
+
+from backend.core.config import settings
+from backend.models.briefings import Briefing
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole
+from backend.pipeline.daily_briefing import (
+    COMPOSE_PROMPT_TEMPLATE,
+    FRAGMENT_PROMPT_TEMPLATE,
+    estimate_tokens,
+    generate_daily_briefing,
+)
+
+
+class StubBriefingClient:
+    """Stands in for BedrockClient: records every prompt, answers with canned JSON."""
+
+    model_id = "stub-model"
+
+    def __init__(self, fail_first_fragment_call: bool = False) -> None:
+        self.fragment_calls: list[tuple[str, int]] = []
+        self.compose_calls: list[tuple[str, int]] = []
+        self.fail_first_fragment_call = fail_first_fragment_call
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return len(self.fragment_calls) + len(self.compose_calls)
+
+    def invoke_json(self, prompt: str, max_tokens: int = 2048) -> dict:
+        ids = re.findall(r"^\[(\d+)\]", prompt, flags=re.MULTILINE)
+        if '"fragments"' in prompt:
+            with self._lock:
+                self.fragment_calls.append((prompt, max_tokens))
+                fail = self.fail_first_fragment_call and len(self.fragment_calls) == 1
+            if fail:
+                raise RuntimeError("throttled")
+            return {"fragments": {event_id: f"Event {event_id} matters." for event_id in ids}}
+        with self._lock:
+            self.compose_calls.append((prompt, max_tokens))
+        return {"briefing_markdown": briefing_markdown(ids)}
+
+
+def briefing_markdown(ids: list[str]) -> str:
+    return "\n".join(f"- Event {event_id} matters." for event_id in ids[:10])
+
+
+def seed_events(session, n_events: int, n_companies: int = 20, offset: int = 0) -> list[int]:
+    """`n_events` events recorded over the last few hours, spread over `n_companies`."""
+    companies = session.query(Entity).order_by(Entity.id).all()
+    if not companies:
+        companies = [Entity(name=f"Company {i}", type="company") for i in range(n_companies)]
+        session.add_all(companies)
+        session.flush()
+    now = datetime.utcnow()
+    ids = []
+    for i in range(offset, offset + n_events):
+        ev = Event(
+            type=("funding", "acquisition", "launch", "partnership")[i % 4],
+            occurred_at=now - timedelta(hours=i % 24),
+            attributes={
+                "amount_usd": 1_000_000 * (i % 500 + 1),
+                "round": "Series A",
+                "summary": f"Company {i % n_companies} announced development number {i} "
+                "with details about the product, the investors and the market it targets.",
+            },
+            confidence=0.5 + (i % 50) / 100,
+        )
+        ev.recorded_at = now - timedelta(minutes=1 + i % 300)
+        session.add(ev)
+        session.flush()
+        session.add(
+            EventEntityRole(
+                event_id=ev.id, entity_id=companies[i % len(companies)].id, role="company"
+            )
+        )
+        ids.append(ev.id)
+    session.commit()
+    return ids
+
+
+def _event_ids(prompt: str) -> list[int]:
+    return [int(i) for i in re.findall(r"^\[(\d+)\]", prompt, flags=re.MULTILINE)]
+
+
+def test_prompts_stay_within_token_budget(session, monkeypatch):
+    monkeypatch.setattr(settings, "briefing_max_events", 300)
+    monkeypatch.setattr(settings, "briefing_chunk_tokens", 1000)
+    monkeypatch.setattr(settings, "briefing_compose_tokens", 1500)
+    seed_events(session, 400)
+    client = StubBriefingClient()
+
+    briefing = generate_daily_briefing(hours=24, client=client)
+
+    assert briefing is not None
+    # Map: the ranked events are split over several bounded prompts, each
+    # event summarized once, with an output budget sized to its chunk.
+    fragment_template = estimate_tokens(FRAGMENT_PROMPT_TEMPLATE)
+    assert len(client.fragment_calls) > 1
+    summarized: list[int] = []
+    for prompt, max_tokens in client.fragment_calls:
+        ids = _event_ids(prompt)
+        assert estimate_tokens(prompt) <= fragment_template + settings.briefing_chunk_tokens
+        assert max_tokens == settings.briefing_fragment_max_tokens * len(ids)
+        summarized.extend(ids)
+    assert len(summarized) == len(set(summarized)) == settings.briefing_max_events
+
+    # Reduce: one compose call, bounded too, which says what was left out.
+    ((prompt, max_tokens),) = client.compose_calls
+    assert estimate_tokens(prompt) <= (
+        estimate_tokens(COMPOSE_PROMPT_TEMPLATE) + settings.briefing_compose_tokens + 20
+    )
+    assert max_tokens == settings.briefing_max_tokens
+    assert "lower-ranked events were left out" in prompt
+
+
+def test_briefing_shape(session, client):
+    seed_events(session, 5)
+    stub = StubBriefingClient()
+
+    briefing = generate_daily_briefing(hours=24, client=stub)
+
+    ((prompt, _),) = stub.compose_calls
+    expected = briefing_markdown([str(i) for i in _event_ids(prompt)])
+    assert briefing.content_markdown == expected
+    assert briefing.time_window_end - briefing.time_window_start == timedelta(hours=24)
+    assert briefing.generated_at == briefing.time_window_end
+
+    response = client.get("/briefings/latest")
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"id", "generated_at", "content_markdown"}
+    assert body["id"] == briefing.id
+    assert body["content_markdown"] == expected
+
+
+def test_failed_chunk_does_not_sink_the_briefing(session, monkeypatch):
+    monkeypatch.setattr(settings, "briefing_chunk_tokens", 300)
+    monkeypatch.setattr(settings, "briefing_workers", 1)
+    seed_events(session, 40)
+    stub = StubBriefingClient(fail_first_fragment_call=True)
+
+    briefing = generate_daily_briefing(hours=24, client=stub)
+
+    assert briefing is not None and briefing.content_markdown
+    assert len(stub.fragment_calls) > 1
+    failed = set(_event_ids(stub.fragment_calls[0][0]))
+    ((prompt, _),) = stub.compose_calls
+    assert failed and not failed & set(_event_ids(prompt))
+    assert session.query(Briefing).count() == 1
+
+
+def test_rerun_without_new_events_makes_no_model_calls(session):
+    seed_events(session, 30)
+    first = generate_daily_briefing(hours=24, client=StubBriefingClient())
+
+    stub = StubBriefingClient()
+    second = generate_daily_briefing(hours=24, client=stub)
+
+    assert stub.calls == 0
+    assert second.id != first.id
+    assert second.content_markdown == first.content_markdown
+
+    new_ids = seed_events(session, 2, offset=30)
+    stub = StubBriefingClient()
+    generate_daily_briefing(hours=24, client=stub)
+
+    ((prompt, _),) = stub.fragment_calls
+    assert sorted(_event_ids(prompt)) == sorted(new_ids)
+    assert len(stub.compose_calls) == 1
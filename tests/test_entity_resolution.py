@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+
+from backend.models.documents import Document
+from backend.models.entities import Entity
+from backend.models.events import EventEntityRole, Mention
+from backend.pipeline.entity_resolution import EntityResolver
+from backend.pipeline.extract_events import persist_extracted_event
+from backend.schemas.events import ExtractedEvent
+
+
+def test_names_without_a_match_key_get_no_entity(session):
+    resolver = EntityResolver.from_session(session)
+
+    ids = resolver.resolve_many(session, [("???", "company"), ("Acme", "company"), ("—", "person")])
+
+    acme = session.query(Entity).filter(Entity.name == "Acme").one()
+    assert ids == [None, acme.id, None]
+    assert session.query(Entity).count() == 1
+
+
+def test_names_resolve_across_spellings_and_runs(session):
+    resolver = EntityResolver.from_session(session)
+    (first,) = resolver.resolve_many(session, [("Acme AI", "company")])
+    session.commit()
+
+    again = EntityResolver.from_session(session).resolve_many(
+        session, [("acme-ai", "company"), ("Acme AI", "person")]
+    )
+
+    assert again[0] == first
+    assert again[1] != first  # same name, different type
+    assert session.query(Entity).count() == 2
+
+
+def test_unnamed_references_are_dropped_from_persisted_events(session):
+    content = "Acme AI launches a model."
+    doc = Document(
+        url="http://example.com/a",
+        title="a",
+        content=content,
+        content_hash=hashlib.sha256(content.encode()).hexdigest(),
+    )
+    session.add(doc)
+    session.flush()
+    extracted = ExtractedEvent.model_validate(
+        {
+            "type": "launch",
+            "entities": [
+                {"name": "???", "type": "company", "role": "company"},
+                {"name": "Acme AI", "type": "company", "role": "company"},
+            ],
+        }
+    )
+
+    for _ in range(2):
+        persist_extracted_event(session, doc, extracted)
+        session.commit()
+
+    (acme,) = session.query(Entity).all()
+    assert {m.entity_id for m in session.query(Mention)} == {acme.id}
+    assert {r.entity_id for r in session.query(EventEntityRole)} == {acme.id}
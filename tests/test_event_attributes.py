@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from backend.models.events import Event
+from backend.queries.events import query_event_page
+
+
+def _funding(session, attributes: dict) -> Event:
+    ev = Event(type="funding", occurred_at=datetime(2026, 3, 1), attributes=attributes, confidence=0.8)
+    session.add(ev)
+    session.commit()
+    return ev
+
+
+def test_promoted_columns_follow_assignment(session):
+    ev = _funding(session, {"amount_usd": 5_000_000, "round": "Series A", "summary": "Acme raises"})
+    assert (ev.amount_usd, ev.round, ev.summary) == (5_000_000.0, "Series A", "Acme raises")
+
+    ev.attributes = {"amount_usd": True, "round": "x" * 100}
+    session.commit()
+    assert (ev.amount_usd, ev.round, ev.summary) == (None, "x" * 64, None)
+
+
+def test_in_place_edits_are_promoted_on_flush(session):
+    ev = _funding(session, {"amount_usd": 1_000_000, "summary": "Acme raises"})
+
+    ev.attributes["amount_usd"] = 50_000_000
+    ev.attributes["round"] = "Series B"
+    del ev.attributes["summary"]
+    session.commit()
+
+    session.expire_all()
+    assert (ev.amount_usd, ev.round, ev.summary) == (50_000_000.0, "Series B", None)
+    page, _ = query_event_page(session, limit=10, min_amount_usd=10_000_000)
+    assert [row.id for row in page] == [ev.id]
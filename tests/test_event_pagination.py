@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from backend.models.events import Event, EventDuplicate
+from backend.queries.events import InvalidCursor, decode_cursor, encode_cursor, query_event_page
+
+
+@pytest.fixture
+def ledger(session) -> list[int]:
+    """
+    Event ids in page order: newest first, ties on `occurred_at` by id
+    descending, undated events last. Includes a merged duplicate, which no
+    page may return.
+    """
+    dates = [
+        datetime(2026, 3, 1),
+        datetime(2026, 3, 2),
+        datetime(2026, 3, 2),
+        datetime(2026, 3, 2),
+        None,
+        datetime(2026, 2, 1),
+        None,
+        datetime(2026, 3, 2),
+        datetime(2026, 1, 15),
+        None,
+        datetime(2026, 3, 1),
+    ]
+    events = [
+        Event(type="launch", occurred_at=occurred_at, attributes={}, confidence=0.8)
+        for occurred_at in dates
+    ]
+    session.add_all(events)
+    session.flush()
+    duplicate = Event(type="launch", occurred_at=datetime(2026, 3, 2), attributes={}, confidence=0.8)
+    session.add(duplicate)
+    session.flush()
+    session.add(
+        EventDuplicate(
+            event_id=duplicate.id, canonical_event_id=events[1].id, similarity=0.95, method="test"
+        )
+    )
+    session.commit()
+    dated = sorted((ev for ev in events if ev.occurred_at), key=lambda ev: (ev.occurred_at, ev.id))
+    undated = sorted((ev for ev in events if ev.occurred_at is None), key=lambda ev: ev.id)
+    return [ev.id for ev in reversed(dated)] + [ev.id for ev in reversed(undated)]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 11, 12])
+def test_pages_return_every_event_once_in_order(session, ledger, limit):
+    seen: list[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        page, cursor = query_event_page(session, limit=limit, cursor=cursor)
+        assert 0 < len(page) <= limit
+        seen.extend(row.id for row in page)
+        pages += 1
+        if cursor is None:
+            break
+    assert seen == ledger
+    # The limit+1 probe ends on a full last page without an empty extra page.
+    assert pages == -(-len(ledger) // limit)
+
+
+def test_cursor_round_trip(session, ledger):
+    (row,), _ = query_event_page(session, limit=1)
+    assert decode_cursor(encode_cursor(row)) == (row.occurred_at, row.id)
+
+
+def test_date_range_skips_undated_events(session, ledger):
+    page, cursor = query_event_page(
+        session, limit=20, start=datetime(2026, 2, 1), end=datetime(2026, 3, 1)
+    )
+    assert cursor is None
+    assert [row.occurred_at for row in page] == [
+        datetime(2026, 3, 1),
+        datetime(2026, 3, 1),
+        datetime(2026, 2, 1),
+    ]
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "eyJvIjoieCIsImkiOjF9", "!!"])
+def test_malformed_cursor(session, client, cursor):
+    with pytest.raises(InvalidCursor):
+        query_event_page(session, limit=5, cursor=cursor)
+
+    response = client.get("/events", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_endpoint_pages_with_next_cursor_header(client, ledger):
+    seen: list[int] = []
+    params = {"limit": 4}
+    while True:
+        response = client.get("/events", params=params)
+        assert response.status_code == 200
+        seen.extend(ev["id"] for ev in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    assert seen == ledger
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models.events import Event
+from backend.queries.export import iter_event_export
+
+
+@pytest.fixture
+def ledger(session) -> list[int]:
+    """Ids in export order; several events share a `recorded_at`, as a batch commit does."""
+    base = datetime(2026, 3, 1, 12)
+    events = []
+    for i, minute in enumerate([0, 0, 0, 1, 1, 2, 3, 3, 3, 3]):
+        ev = Event(type="launch", attributes={"summary": f"Event {i}"}, confidence=0.8)
+        ev.recorded_at = base + timedelta(minutes=minute)
+        events.append(ev)
+    session.add_all(events)
+    session.commit()
+    return [ev.id for ev in sorted(events, key=lambda ev: (ev.recorded_at, ev.id))]
+
+
+@pytest.mark.parametrize("stop", range(1, 10))
+def test_resume_from_watermark_exports_each_event_once(session, ledger, stop):
+    first = list(iter_event_export(session, batch_size=3))[:stop]
+    last = first[-1]
+
+    rest = list(iter_event_export(session, since=last["recorded_at"], after_id=last["id"]))
+
+    # Resuming in the middle of a run of equal recorded_at values must neither
+    # repeat the exported ones nor skip the others.
+    assert [r["id"] for r in first + rest] == ledger
+
+
+def test_after_id_requires_since(session, client, ledger):
+    with pytest.raises(ValueError):
+        list(iter_event_export(session, after_id=ledger[3]))
+
+    assert client.get("/events/export", params={"after_id": ledger[3]}).status_code == 422
+
+
+def test_endpoint_resumes_from_watermark(client, ledger):
+    records = [json.loads(line) for line in client.get("/events/export").text.splitlines()]
+    assert [r["id"] for r in records] == ledger
+    last = records[4]
+
+    response = client.get(
+        "/events/export", params={"since": last["recorded_at"], "after_id": last["id"]}
+    )
+
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ledger[5:]
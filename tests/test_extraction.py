@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import threading
+import time
+
+import pytest
+from tenacity import wait_none
+
+from backend.core.config import settings
+from backend.llm import rate_limit
+from backend.llm.bedrock_client import BedrockClient
+from backend.llm.event_extractor import EventExtractor
+from backend.models.documents import Document
+from backend.models.extraction_cache import ExtractionCacheEntry
+from backend.pipeline import extract_events
+from backend.pipeline.extract_events import run_extraction_for_unprocessed_documents
+from backend.schemas.events import ExtractionResult
+
+
+class _StubClient:
+    model_id = "stub-model"
+
+
+class StubExtractor:
+    """Records when, and for which URL, each model call was made."""
+
+    def __init__(self) -> None:
+        self.client = _StubClient()
+        self.calls: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def extract(self, content: str, url: str | None = None) -> ExtractionResult:
+        with self._lock:
+            self.calls.append((time.monotonic(), url))
+        return ExtractionResult.model_validate(
+            {
+                "events": [
+                    {
+                        "type": "launch",
+                        "entities": [{"name": "Acme AI", "type": "company"}],
+                        "attributes": {"summary": content[:40]},
+                        "source_urls": [url] if url else [],
+                    }
+                ]
+            }
+        )
+
+
+class _StubRuntime:
+    """Stands in for the boto3 bedrock-runtime client; fails the first `failures` calls."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls: list[float] = []
+
+    def invoke_model(self, **kwargs) -> dict:
+        self.calls.append(time.monotonic())
+        if len(self.calls) <= self.failures:
+            raise RuntimeError("ThrottlingException")
+        output = {"events": [{"type": "launch", "entities": [], "attributes": {}}]}
+        return {"body": io.BytesIO(json.dumps({"outputText": json.dumps(output)}).encode())}
+
+
+@pytest.fixture
+def bedrock(monkeypatch, fresh_limiter) -> BedrockClient:
+    """A real BedrockClient whose transport is a `_StubRuntime`, with retries that do not wait."""
+    monkeypatch.setattr(settings, "aws_region", "us-east-1")
+    monkeypatch.setattr(settings, "bedrock_model_id", "stub-model")
+    monkeypatch.setattr(BedrockClient.invoke_json.retry, "wait", wait_none())
+    client = BedrockClient()
+    client.client = _StubRuntime()
+    return client
+
+
+def _add_document(session, url: str, content: str) -> Document:
+    doc = Document(
+        url=url,
+        title=url,
+        content=content,
+        content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+    )
+    session.add(doc)
+    session.commit()
+    return doc
+
+
+def test_runs_share_one_rate_limiter(session, monkeypatch, bedrock):
+    monkeypatch.setattr(settings, "bedrock_requests_per_second", 2.0)
+    monkeypatch.setattr(settings, "bedrock_burst", 1)
+    extractor = EventExtractor(bedrock)
+
+    _add_document(session, "http://example.com/1", "Acme AI launches a model.")
+    run_extraction_for_unprocessed_documents(extractor=extractor)
+    _add_document(session, "http://example.com/2", "Acme AI launches another model.")
+    run_extraction_for_unprocessed_documents(extractor=extractor)
+
+    first, second = bedrock.client.calls
+    # A bucket per run would hand the second run a fresh burst straight away.
+    assert second - first >= 0.4
+    assert rate_limit.bedrock_limiter() is rate_limit.bedrock_limiter()
+
+
+def test_every_attempt_takes_a_token(monkeypatch, bedrock):
+    monkeypatch.setattr(settings, "bedrock_requests_per_second", 1000.0)
+    bedrock.client = _StubRuntime(failures=2)
+    limiter = rate_limit.bedrock_limiter()
+    acquired = []
+    acquire = limiter.acquire
+    monkeypatch.setattr(limiter, "acquire", lambda *args: acquired.append(1) or acquire(*args))
+
+    assert bedrock.invoke_json("prompt")["events"]
+    # Two throttled attempts and the successful one each went through the bucket.
+    assert len(bedrock.client.calls) == len(acquired) == 3
+    # botocore does not retry behind the bucket's back.
+    assert BedrockClient().client.meta.config.retries["total_max_attempts"] == 1
+
+
+@pytest.fixture
+def persisted(monkeypatch):
+    """(document URL, source URLs) of every event persisted."""
+    persisted: list[tuple[str, list[str]]] = []
+    persist = extract_events.persist_extracted_event
+
+    def recording_persist(session, doc, extracted, resolver=None):
+        persisted.append((doc.url, list(extracted.source_urls)))
+        return persist(session, doc, extracted, resolver)
+
+    monkeypatch.setattr(extract_events, "persist_extracted_event", recording_persist)
+    return persisted
+
+
+def test_cached_result_is_credited_to_the_reading_document(
+    session, monkeypatch, fresh_limiter, persisted
+):
+    monkeypatch.setattr(settings, "extraction_cache_enabled", True)
+    extractor = StubExtractor()
+    content = "Acme AI launches a model."
+
+    _add_document(session, "http://example.com/first", content)
+    run_extraction_for_unprocessed_documents(extractor=extractor)
+    (entry,) = session.query(ExtractionCacheEntry).all()
+    assert "http://example.com/first" not in entry.result_json
+
+    _add_document(session, "http://example.com/second", content)
+    run_extraction_for_unprocessed_documents(extractor=extractor)
+
+    assert len(extractor.calls) == 1  # the second document was served from the cache
+    assert persisted == [
+        ("http://example.com/first", ["http://example.com/first"]),
+        ("http://example.com/second", ["http://example.com/second"]),
+    ]
+
+
+def test_documents_sharing_content_get_their_own_url(session, fresh_limiter, persisted):
+    extractor = StubExtractor()
+    _add_document(session, "http://example.com/a", "Same wire story.")
+    _add_document(session, "http://example.com/b", "Same wire story.")
+
+    run_extraction_for_unprocessed_documents(extractor=extractor)
+
+    assert len(extractor.calls) == 1
+    assert sorted(persisted) == [
+        ("http://example.com/a", ["http://example.com/a"]),
+        ("http://example.com/b", ["http://example.com/b"]),
+    ]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.core import metrics
+from backend.core.config import settings
+from backend.ingestion import fetcher
+from backend.models.documents import Document
+
+
+def _rss(name: str) -> bytes:
+    items = "".join(
+        f"<item><title>{name} story {i}</title><link>http://example.com/{name}/{i}</link>"
+        f"<description>{name} body {i}</description></item>"
+        for i in range(3)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+class _FeedServer:
+    """Local stand-in for feed hosts: records in-flight requests overall and per Host header."""
+
+    def __init__(self, delay: float = 0.2, slow_delay: float = 3.0) -> None:
+        self.delay = delay
+        self.slow_delay = slow_delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.per_host: dict[str, int] = defaultdict(int)
+        self.max_per_host: dict[str, int] = defaultdict(int)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                host = self.headers["Host"].split(":")[0]
+                with server.lock:
+                    server.in_flight += 1
+                    server.per_host[host] += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    server.max_per_host[host] = max(server.max_per_host[host], server.per_host[host])
+                try:
+                    if self.path.startswith("/slow"):
+                        time.sleep(server.slow_delay)
+                    else:
+                        time.sleep(server.delay)
+                    if self.path.startswith("/fail"):
+                        self.send_response(500)
+                        self.end_headers()
+                        return
+                    if self.path.startswith("/etag") and self.headers.get("If-None-Match") == '"v1"':
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    body = _rss(self.path.strip("/").replace("/", "-"))
+                    self.send_response(200)
+                    self.send_header("ETag", '"v1"')
+                    self.send_header("Content-Type", "application/rss+xml")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up (timeout test)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+                        server.per_host[host] -= 1
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, host: str, path: str) -> str:
+        return f"http://{host}:{self.port}{path}"
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    # A fresh pooled HTTP session sized by the settings under test.
+    monkeypatch.setattr(fetcher, "_HTTP_SESSION", None)
+    server = _FeedServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+    fetcher._HTTP_SESSION = None
+
+
+def _feeds(server: _FeedServer, paths_by_host: dict[str, list[str]]) -> list[dict]:
+    return [
+        {"name": f"{host}{path}", "url": server.url(host, path)}
+        for host, paths in paths_by_host.items()
+        for path in paths
+    ]
+
+
+def test_fetch_is_concurrent_and_bounded(feed_server, monkeypatch, session):
+    monkeypatch.setattr(settings, "ingestion_max_workers", 3)
+    monkeypatch.setattr(settings, "ingestion_per_host_limit", 3)
+    feeds = _feeds(feed_server, {"127.0.0.1": [f"/a{i}" for i in range(9)]})
+
+    started = time.perf_counter()
+    new_docs = fetcher.fetch_rss_documents(feeds)
+    elapsed = time.perf_counter() - started
+
+    assert new_docs == 27
+    assert session.query(Document).count() == 27
+    assert feed_server.max_in_flight == 3
+    # Nine 0.2 s feeds, three at a time: about 0.6 s, far from the 1.8 s sequential.
+    assert elapsed < 1.5
+
+
+def test_per_host_limit(feed_server, monkeypatch):
+    monkeypatch.setattr(settings, "ingestion_max_workers", 8)
+    monkeypatch.setattr(settings, "ingestion_per_host_limit", 2)
+    feeds = _feeds(
+        feed_server,
+        {"127.0.0.1": [f"/a{i}" for i in range(6)], "localhost": [f"/b{i}" for i in range(6)]},
+    )
+
+    assert fetcher.fetch_rss_documents(feeds) == 36
+    assert feed_server.max_per_host["127.0.0.1"] == 2
+    assert feed_server.max_per_host["localhost"] == 2
+    assert feed_server.max_in_flight == 4
+
+
+def test_timed_out_feed_does_not_hold_up_the_run(feed_server, monkeypatch, session):
+    monkeypatch.setattr(settings, "ingestion_max_workers", 4)
+    monkeypatch.setattr(settings, "ingestion_feed_timeout_seconds", 0.5)
+    feeds = _feeds(feed_server, {"127.0.0.1": ["/slow", "/a1", "/a2"]})
+
+    started = time.perf_counter()
+    new_docs = fetcher.fetch_rss_documents(feeds)
+    elapsed = time.perf_counter() - started
+
+    assert new_docs == 6
+    assert elapsed < feed_server.slow_delay
+    urls = {url for (url,) in session.query(Document.url)}
+    assert not any("/slow/" in url for url in urls)
+
+
+def test_failing_feed_does_not_abort_the_others(feed_server, monkeypatch, session):
+    monkeypatch.setattr(settings, "ingestion_max_workers", 4)
+    feeds = _feeds(feed_server, {"127.0.0.1": ["/fail", "/a1", "/a2", "/a3"]})
+    feeds.append({"name": "unreachable", "url": "http://127.0.0.1:1/feed"})
+
+    assert fetcher.fetch_rss_documents(feeds) == 9
+    sources = {name for (name,) in session.query(Document.source_name).distinct()}
+    assert sources == {"127.0.0.1/a1", "127.0.0.1/a2", "127.0.0.1/a3"}
+
+
+def _conditional_get_samples() -> dict[str, float]:
+    return {
+        key[0]: value for key, value in metrics.feed_conditional_gets._values.items()
+    }
+
+
+def test_conditional_get_hits_and_misses_are_counted(feed_server, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    feeds = _feeds(feed_server, {"127.0.0.1": ["/etag"]})
+    before = _conditional_get_samples()
+
+    assert fetcher.fetch_rss_documents(feeds) == 3
+    assert fetcher.fetch_rss_documents(feeds) == 0
+
+    after = _conditional_get_samples()
+    assert after["fetched"] - before.get("fetched", 0) == 1
+    assert after["not_modified"] - before.get("not_modified", 0) == 1
+    assert "aiscope_feed_conditional_gets_total" in metrics.registry.render()
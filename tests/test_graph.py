@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from backend.models.entities import Entity
+from backend.models.events import Event, EventDuplicate, EventEntityRole, Relationship
+from backend.models.graph import GraphEdge, GraphEventEdge
+from backend.pipeline.graph_edges import rebuild_graph_edges, refresh_event_edges
+
+
+def _merge(session, duplicate: Event, canonical: Event) -> None:
+    session.add(
+        EventDuplicate(
+            event_id=duplicate.id, canonical_event_id=canonical.id, similarity=0.95, method="test"
+        )
+    )
+    session.flush()
+
+
+@pytest.fixture
+def ledger(session):
+    """Three companies, a deal between two of them reported twice, and a launch."""
+    entities = {
+        key: Entity(name=name, type="company", external_id=key)
+        for key, name in [("acme", "Acme AI"), ("globex", "Globex"), ("initech", "Initech")]
+    }
+    session.add_all(entities.values())
+    session.flush()
+
+    def event(type_: str, day: int, summary: str, roles: dict[str, str]) -> Event:
+        ev = Event(
+            type=type_,
+            occurred_at=datetime(2026, 3, day),
+            attributes={"summary": summary},
+            confidence=0.8,
+        )
+        session.add(ev)
+        session.flush()
+        session.add_all(
+            EventEntityRole(event_id=ev.id, entity_id=entities[key].id, role=role)
+            for key, role in roles.items()
+        )
+        return ev
+
+    deal_roles = {"acme": "acquirer", "globex": "target"}
+    deal = event("acquisition", 2, "Acme AI acquires Globex", deal_roles)
+    duplicate = event("acquisition", 2, "Acme buys Globex", deal_roles)
+    launch = event(
+        "launch", 5, "Globex and Initech launch a chip", {"globex": "company", "initech": "company"}
+    )
+    _merge(session, duplicate, deal)
+    acme, globex, initech = entities["acme"], entities["globex"], entities["initech"]
+    session.add_all(
+        [
+            Relationship(type="partnership", from_entity_id=acme.id, to_entity_id=initech.id),
+            # Recorded on the merged duplicate: must not count twice.
+            Relationship(
+                type="acquisition",
+                from_entity_id=acme.id,
+                to_entity_id=globex.id,
+                event_id=duplicate.id,
+            ),
+        ]
+    )
+    session.flush()
+    rebuild_graph_edges(session)
+    session.commit()
+    return {**entities, "deal": deal, "duplicate": duplicate, "launch": launch}
+
+
+def test_event_edges_skip_duplicates(session, ledger):
+    incidences = {(e.entity_id, e.event_id, e.role) for e in session.query(GraphEventEdge)}
+    acme, globex, initech = ledger["acme"].id, ledger["globex"].id, ledger["initech"].id
+    deal, launch = ledger["deal"].id, ledger["launch"].id
+    assert incidences == {
+        (acme, deal, "acquirer"),
+        (globex, deal, "target"),
+        (globex, launch, "company"),
+        (initech, launch, "company"),
+    }
+    duplicate_edges = session.query(GraphEdge).filter(
+        GraphEdge.event_id == ledger["duplicate"].id
+    )
+    assert not duplicate_edges.count()
+    relationship_edges = session.query(GraphEdge).filter(GraphEdge.relationship_id.isnot(None))
+    assert [(e.edge_type, e.event_id) for e in relationship_edges] == [("partnership", None)]
+
+
+def test_refresh_drops_edges_of_newly_merged_event(session, ledger):
+    _merge(session, ledger["launch"], ledger["deal"])
+    refresh_event_edges(session, [ledger["launch"].id])
+    session.commit()
+
+    launch_id = ledger["launch"].id
+    assert not session.query(GraphEventEdge).filter(GraphEventEdge.event_id == launch_id).count()
+    assert not session.query(GraphEdge).filter(GraphEdge.event_id == launch_id).count()
+
+
+def test_graph_endpoint_links_entities_through_events(client, ledger):
+    graph = client.get("/graph", params={"events": "true"}).json()
+    deal, launch = f"event_{ledger['deal'].id}", f"event_{ledger['launch'].id}"
+
+    nodes = {n["id"]: n for n in graph["nodes"]}
+    assert set(nodes) == {"acme", "globex", "initech", deal, launch}
+    assert nodes[deal] == {
+        "id": deal,
+        "label": "Acme AI acquires Globex",
+        "type": "event",
+        "event_type": "acquisition",
+        "occurred_at": "2026-03-02T00:00:00",
+    }
+    edges = {(e["source"], e["target"]): e for e in graph["edges"]}
+    assert set(edges) == {
+        ("acme", deal),
+        ("globex", deal),
+        ("globex", launch),
+        ("initech", launch),
+        ("acme", "initech"),  # the recorded partnership
+    }
+    assert edges[("acme", deal)]["role"] == "acquirer"
+
+
+def test_graph_endpoint_entity_view(client, ledger):
+    graph = client.get("/graph").json()
+    pairs = {(e["source"], e["target"]): e["count"] for e in graph["edges"]}
+    assert pairs == {("acme", "globex"): 1, ("globex", "initech"): 1, ("acme", "initech"): 1}
+    assert all(n["type"] != "event" for n in graph["nodes"])
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from backend.models.entities import Entity
+from backend.models.events import Event, EventDuplicate, EventEntityRole, EventNoveltyLabel
+from backend.pipeline.change_detection import (
+    NOVELTY_METHOD,
+    NoveltyItem,
+    compute_novelty_labels,
+    label_novelty,
+    unlabelled_event_count,
+)
+
+
+WINDOW = timedelta(days=7)
+DAY0 = datetime(2026, 3, 1)
+
+
+def item(
+    id_: int,
+    entities: set[int],
+    day: float = 0,
+    recorded: float | None = None,
+    type_: str = "funding",
+) -> NoveltyItem:
+    """An event occurring on `day` and recorded on `recorded` (default: `id_`, in id order)."""
+    return NoveltyItem(
+        id_,
+        type_,
+        DAY0 + timedelta(days=day),
+        DAY0 + timedelta(hours=id_ if recorded is None else recorded),
+        frozenset(entities),
+    )
+
+
+def labels(items: list[NoveltyItem], targets: set[int] | None = None) -> dict[int, str]:
+    return compute_novelty_labels(items, targets or {it.id for it in items}, WINDOW)
+
+
+def test_overlap_thresholds():
+    result = labels(
+        [
+            item(1, {1, 2}),
+            item(2, {1, 2}),  # same entities: repeat
+            item(3, {1, 2, 3}),  # 2/3 overlap with 2: repeat
+            item(4, {1, 4, 5, 6}),  # shares only entity 1, 1/5 at best: update
+            item(5, {7}),  # no shared entity: new
+            item(6, set()),  # no entities: new
+        ]
+    )
+    assert result == {1: "new", 2: "repeat", 3: "repeat", 4: "update", 5: "new", 6: "new"}
+
+
+def test_overlap_of_exactly_half_is_a_repeat():
+    assert labels([item(1, {1, 2}), item(2, {1, 3, 2, 4})])[2] == "repeat"
+    assert labels([item(1, {1, 2}), item(2, {1, 3, 4})])[2] == "update"
+
+
+def test_window_edges_are_inclusive():
+    on_edge = labels([item(1, {1}, day=0), item(2, {1}, day=7)])
+    assert on_edge[2] == "repeat"
+    past_edge = labels([item(1, {1}, day=0), item(2, {1}, day=7.01)])
+    assert past_edge[2] == "new"
+    # The window reaches forward too: an earlier-recorded report of a later date counts.
+    ahead = labels([item(1, {1}, day=7, recorded=0), item(2, {1}, day=0, recorded=1)])
+    assert ahead == {1: "new", 2: "repeat"}
+
+
+def test_only_earlier_recorded_events_count():
+    # Recorded in the opposite order of occurrence: the later-recorded one is the repeat.
+    result = labels([item(1, {1}, day=0, recorded=5), item(2, {1}, day=1, recorded=2)])
+    assert result == {1: "repeat", 2: "new"}
+    # Equal recorded_at: the lower id counts as earlier.
+    tied = labels([item(1, {1}, recorded=3), item(2, {1}, recorded=3)])
+    assert tied == {1: "new", 2: "repeat"}
+
+
+def test_types_do_not_mix_and_non_targets_only_inform():
+    items = [item(1, {1}), item(2, {1}, type_="acquisition"), item(3, {1})]
+    assert labels(items) == {1: "new", 2: "new", 3: "repeat"}
+    assert labels(items, targets={3}) == {3: "repeat"}
+
+
+def test_merged_duplicates_are_neither_labelled_nor_counted(session):
+    acme = Entity(name="Acme AI", type="company")
+    session.add(acme)
+    session.flush()
+
+    def event(day: int) -> Event:
+        ev = Event(type="funding", occurred_at=DAY0 + timedelta(days=day), attributes={})
+        session.add(ev)
+        session.flush()
+        session.add(EventEntityRole(event_id=ev.id, entity_id=acme.id, role="company"))
+        return ev
+
+    duplicate = event(0)
+    canonical = event(1)
+    session.add(
+        EventDuplicate(
+            event_id=duplicate.id, canonical_event_id=canonical.id, similarity=0.95, method="test"
+        )
+    )
+    session.commit()
+    assert unlabelled_event_count(session) == 1
+
+    assert label_novelty(session) == 1
+    session.commit()
+
+    (label,) = session.query(EventNoveltyLabel).all()
+    # The earlier-recorded duplicate would otherwise make its own canonical a "repeat".
+    assert (label.event_id, label.label, label.method) == (canonical.id, "new", NOVELTY_METHOD)
+    assert unlabelled_event_count(session) == 0
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models.documents import Document
+from backend.models.entities import Entity
+from backend.models.events import Event, EventEntityRole, Mention
+
+
+N_COMPANIES = 10
+EVENTS_PER_COMPANY = 12
+
+
+@pytest.fixture
+def ledger(session):
+    """
+    OpenAI acquired by each of ten companies in turn, plus funding rounds of
+    those companies; every event has a source document. Big enough that a
+    query per event or per entity would blow every limit below.
+    """
+    openai = Entity(name="OpenAI", type="company", external_id="openai")
+    companies = [Entity(name=f"Company {i}", type="company") for i in range(N_COMPANIES)]
+    session.add_all([openai, *companies])
+    session.flush()
+    start = datetime(2026, 1, 1)
+    for i, company in enumerate(companies):
+        for j in range(EVENTS_PER_COMPANY):
+            acquisition = j % 3 == 0
+            ev = Event(
+                type="acquisition" if acquisition else "funding",
+                occurred_at=start + timedelta(days=i * EVENTS_PER_COMPANY + j),
+                attributes={"summary": f"Company {i} event {j}", "amount_usd": 1_000_000 * (j + 1)},
+                confidence=0.8,
+            )
+            session.add(ev)
+            session.flush()
+            if acquisition:
+                session.add_all(
+                    [
+                        EventEntityRole(event_id=ev.id, entity_id=company.id, role="acquirer"),
+                        EventEntityRole(event_id=ev.id, entity_id=openai.id, role="target"),
+                    ]
+                )
+            else:
+                session.add(EventEntityRole(event_id=ev.id, entity_id=company.id, role="company"))
+            doc = Document(
+                url=f"http://example.com/{i}/{j}", title=f"Story {j}", content="", content_hash=f"{i}-{j}"
+            )
+            session.add(doc)
+            session.flush()
+            session.add(Mention(document_id=doc.id, entity_id=company.id, event_id=ev.id))
+    session.commit()
+    return {"openai": openai, "companies": companies}
+
+
+def test_events_page(client, ledger, assert_max_queries):
+    with assert_max_queries(4):
+        response = client.get("/events", params={"limit": 50})
+
+    events = response.json()
+    assert len(events) == 50
+    assert all(ev["entities"] and ev["source_url"] for ev in events)
+
+
+def test_company_events(client, ledger, assert_max_queries):
+    company_id = ledger["companies"][3].id
+    with assert_max_queries(2):
+        response = client.get(f"/companies/{company_id}/events")
+
+    assert len(response.json()) == EVENTS_PER_COMPANY
+
+
+def test_entity_search(client, ledger, assert_max_queries):
+    with assert_max_queries(4):
+        response = client.post("/entities/search", json={"query": "OpenAI"})
+
+    profile = response.json()
+    assert profile["id"] == "openai"
+    assert len(profile["acquisitions"]) == 5 and len(profile["related_events"]) == 5
+
+
+def test_entity_profile(client, ledger, assert_max_queries):
+    entity_id = ledger["openai"].id
+    with assert_max_queries(4):
+        response = client.get(f"/entities/{entity_id}/profile")
+
+    profile = response.json()
+    # The five latest acquisitions: Company 9's four, then Company 8's last.
+    assert [a["acquired_by"] for a in profile["acquisitions"]] == ["Company 9"] * 4 + ["Company 8"]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from backend.models.events import Event
+from backend.models.pipeline_state import DEDUPLICATION, load_watermark
+from backend.pipeline import deduplication
+from backend.pipeline.scheduler import Scheduler, Stage, pipeline_stages
+
+
+def _add_event(session, summary: str, recorded_at: datetime) -> Event:
+    ev = Event(type="launch", occurred_at=recorded_at, attributes={"summary": summary}, confidence=0.8)
+    ev.recorded_at = recorded_at
+    session.add(ev)
+    session.commit()
+    return ev
+
+
+def _stage(name: str):
+    return next(stage for stage in pipeline_stages() if stage.name == name)
+
+
+def test_deduplication_resumes_from_the_stored_watermark(session, monkeypatch):
+    since_seen = []
+    dedup = deduplication.deduplicate_events
+
+    def recording_dedup(session, since=None, **kwargs):
+        since_seen.append(since)
+        return dedup(session, since=since, **kwargs)
+
+    monkeypatch.setattr(deduplication, "deduplicate_events", recording_dedup)
+    past = datetime.utcnow() - timedelta(hours=1)
+    _add_event(session, "Acme AI launches a model", past)
+    _add_event(session, "Globex opens an office", past)
+
+    stage = _stage("deduplication")
+    assert stage.backlog() == 2
+    stage.run()
+    watermark = load_watermark(session, DEDUPLICATION)
+    assert watermark is not None and watermark > past
+
+    _add_event(session, "Initech ships a chip", datetime.utcnow())
+    # A new scheduler process (fresh stages) picks up where the last run stopped.
+    restarted = _stage("deduplication")
+    assert restarted.backlog() == 1
+    restarted.run()
+    assert since_seen == [None, watermark]
+    assert load_watermark(session, DEDUPLICATION) > watermark
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pipeline(clock: _Clock) -> Scheduler:
+    return Scheduler(
+        [
+            Stage("extraction", lambda: 0, interval=60.0),
+            Stage("deduplication", lambda: 0, interval=300.0, upstream=("extraction",)),
+        ],
+        clock=clock,
+    )
+
+
+def _finish(scheduler: Scheduler, name: str, now: float, dirty: bool = False) -> None:
+    state = scheduler._state[name]
+    state.running = False
+    state.last_finished = now
+    state.dirty = dirty
+
+
+def test_overdue_stage_waits_for_a_running_ancestor():
+    clock = _Clock()
+    scheduler = _pipeline(clock)
+    assert scheduler._start_ready(clock.now) == ["extraction"]
+    _finish(scheduler, "extraction", 1.0)
+    assert scheduler._start_ready(1.0) == ["deduplication"]
+    _finish(scheduler, "deduplication", 2.0)
+
+    # Extraction keeps finding work and restarting straight away.
+    clock.now = 10.0
+    scheduler._state["extraction"].dirty = True
+    assert scheduler._start_ready(clock.now) == ["extraction"]
+
+    # Deduplication is overdue, but extraction may be holding uncommitted events.
+    clock.now = 400.0
+    assert scheduler._start_ready(clock.now) == []
+
+    # Once extraction finishes, deduplication starts before extraction may restart.
+    _finish(scheduler, "extraction", 401.0, dirty=True)
+    clock.now = 401.0
+    assert scheduler._start_ready(clock.now) == ["deduplication"]
+    assert scheduler._start_ready(clock.now) == ["extraction"]